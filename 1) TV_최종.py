@@ -2,14 +2,27 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import NoSuchElementException
 
 import pandas as pd
+import argparse
+import os
 import time
 import re
+from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from browser_pool import BROWSER_PROFILES, PROFILE_DEFAULT, BrowserPool
+from crawl_journal import CrawlJournal
+from dataset_io import TV_DATASET, TV_SCHEMA, kst_timestamps, read_dataset, write_dataset
+from enrichment_scheduler import COMPLETED_STATUSES, DEFAULT_WORKERS as DEFAULT_ENRICH_WORKERS, run_enrichment
+from kinolights import (
+    KINOLIGHTS_SEARCH_URL, open_known_detail_page, wait_for_detail_page, wait_for_synopsis_expanded
+)
+from kinolights_cache import KinolightsCache
+from rate_limiter import DEFAULT_LIMITER, configure_limits, throttle
+from tvguide_fetch import AutoPageFetcher, HttpPageFetcher, SeleniumPageFetcher
+from tvguide_parser import parse_all_days, parse_schedule, resolve_column_date
 
 # ===================================================================
 # 1. 기본 URL 및 타겟 채널 설정
@@ -23,9 +36,17 @@ TARGET_CHANNELS = {
     "DRAMAcube": "499"
 }
 
-today_date_info = "날짜 정보 없음"
-all_data = []
-driver = None
+DATE_UNKNOWN = "날짜 정보 없음"
+
+# 병렬 크롤링 시 동시에 여는 채널 수 (브라우저 수)
+DEFAULT_CHANNEL_WORKERS = 5
+
+# 주간 모드: 방송 날짜별 Parquet 저장 폴더 (tv_schedule/2025-11-17.parquet ...)
+PARTITION_DIR = 'tv_schedule'
+
+# 완성된 행을 바로바로 남기는 저널 (중단 후 --resume으로 이어서 실행)
+JOURNAL_FILE = 'tv_crawling.journal.jsonl'
+JOURNAL_KEYS = ('channel', 'broadcast_date', 'broadcast_time')
 
 
 # ===================================================================
@@ -48,40 +69,53 @@ def clean_title(title: str) -> str:
 # ===================================================================
 # 3. 키노라이츠 상세 정보 보강 함수 (줄거리 및 추가 정보 크롤링)
 # ===================================================================
-def fetch_kinolights_info(title: str):
-    kinolights_driver = None
-    info = {
-        'plot': '',
-        'genre': '',
-        'cast': '',
-        'director': '',
-        'age_rating': '정보 없음',  # 1. 연령층 (완성)
-        'poster_url': '포스터 URL 없음',  # 2. 포스터 (완성)
-        'runtime_or_episode': '정보 없음'  # 3. 러닝타임/회차 (완성)
-    }
+# 상세 정보 기본값 (아무것도 찾지 못한 경우 = 캐시의 '빈 결과')
+KINOLIGHTS_DEFAULT_INFO = {
+    'plot': '',
+    'genre': '',
+    'cast': '',
+    'director': '',
+    'age_rating': '정보 없음',  # 1. 연령층 (완성)
+    'poster_url': '포스터 URL 없음',  # 2. 포스터 (완성)
+    'runtime_or_episode': '정보 없음'  # 3. 러닝타임/회차 (완성)
+}
+
+
+def fetch_kinolights_info(title: str, pool: BrowserPool, url_index: KinolightsCache = None):
+    # 매번 Chrome을 새로 띄우지 않고 풀에서 세션을 빌려 사용
+    with pool.lease() as kinolights_driver:
+        return scrape_kinolights_info(kinolights_driver, title, url_index)
+
+
+def scrape_kinolights_info(kinolights_driver, title: str, url_index: KinolightsCache = None):
+    info = dict(KINOLIGHTS_DEFAULT_INFO)
 
     try:
-        kinolights_driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-        kinolights_driver.get("https://m.kinolights.com/search")
         wait = WebDriverWait(kinolights_driver, 10)
 
-        # 1. 검색어 입력 및 검색
-        search_input = wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input.search-form__input"))
-        )
-        search_input.clear()
-        search_input.send_keys(title)
-        search_input.send_keys(webdriver.common.keys.Keys.RETURN)
+        # 이미 아는 제목은 검색 없이 상세 페이지로 바로 이동
+        if not open_known_detail_page(kinolights_driver, title, url_index):
+            throttle(KINOLIGHTS_SEARCH_URL)
+            kinolights_driver.get(KINOLIGHTS_SEARCH_URL)
 
-        time.sleep(1)
+            # 1. 검색어 입력 및 검색
+            search_input = wait.until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "input.search-form__input"))
+            )
+            search_input.clear()
+            search_input.send_keys(title)
+            search_input.send_keys(webdriver.common.keys.Keys.RETURN)
 
-        # 2. 첫 번째 검색 결과 클릭 (상세 페이지로 이동)
-        first_result = wait.until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "a.content__body"))
-        )
-        first_result.click()
+            # 2. 첫 번째 검색 결과 클릭 (상세 페이지로 이동)
+            first_result = wait.until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "a.content__body"))
+            )
+            search_url = kinolights_driver.current_url
+            throttle(KINOLIGHTS_SEARCH_URL)
+            first_result.click()
 
-        time.sleep(2)  # 상세 페이지 로딩 대기
+            if wait_for_detail_page(kinolights_driver, wait, search_url) and url_index is not None:
+                url_index.put_url(title, kinolights_driver.current_url, source='search')
 
         # ----------------------------------------------------
         # ✨ 1. '연령층' 가져오기 (Age Rating) - 사용자 HTML 기반 XPath
@@ -139,7 +173,7 @@ def fetch_kinolights_info(title: str):
                 more_button = kinolights_driver.find_element(By.CSS_SELECTOR, "button.more")
                 if more_button.is_displayed():
                     more_button.click()
-                    time.sleep(0.5)  # 클릭 후 로딩 대기
+                    wait_for_synopsis_expanded(kinolights_driver, info["plot"])
                     # 클릭 후 전체 줄거리 다시 가져오기
                     full_synopsis_el = kinolights_driver.find_element(By.CSS_SELECTOR, "div.synopsis .text")
                     info["plot"] = full_synopsis_el.text.strip()
@@ -190,113 +224,279 @@ def fetch_kinolights_info(title: str):
         # 검색 실패 등의 큰 오류 발생 시
         # print(f"키노라이츠 정보 추출 오류: {e}")
         return info
-
-    finally:
-        if kinolights_driver:
-            kinolights_driver.quit()
 # ===================================================================
 # 4. TV 편성표 크롤링 (생략: 변경 없음)
 # ===================================================================
-def crawl_single_channel(channel_name, channel_code):
-    global today_date_info
-    channel_data = []
-    TARGET_URL = f"{BASE_URL}&c={channel_code}"
+def build_channel_rows(channel_name, date_info, programs):
+    """파서가 추출한 (시, 분, 제목) 목록을 데이터셋 행 형식으로 변환합니다."""
+    return [{
+        "channel": channel_name,
+        "broadcast_date": date_info,
+        "broadcast_time": f"{hour}:{minute}",
+        "title": title,
+        "plot": "",
+        "genre": "",
+        "cast": "",
+        "director": ""
+    } for hour, minute, title in programs]
+
+
+def build_week_rows(channel_name, html):
+    """
+    페이지의 모든 날짜 열을 행으로 변환합니다 (broadcast_date = 'YYYY-MM-DD').
+    반환값: (프로그램 목록, 오늘 열의 날짜 텍스트)
+    """
+    rows = []
+    today_text = ''
+    for _, date_text, is_today, programs in parse_all_days(html):
+        if is_today:
+            today_text = date_text
+        broadcast_date = resolve_column_date(date_text)
+        if not broadcast_date:
+            print(f"  -> {channel_name}: 날짜를 해석할 수 없는 열 건너뜀 ('{date_text}')")
+            continue
+        rows.extend(build_channel_rows(channel_name, broadcast_date, programs))
+    return rows, today_text
 
-    print(f"\n📡 {channel_name} 크롤링 시도: {TARGET_URL}")
 
-    try:
-        driver.get(TARGET_URL)
-        wait = WebDriverWait(driver, 15)
-
-        # '오늘' 날짜 열 찾기 (생략)
-        header_tr_xpath = "//table[@id='main_channel']/tbody/tr[1]"
-        header_row = wait.until(EC.presence_of_element_located((By.XPATH, header_tr_xpath)))
-        date_cols = header_row.find_elements(By.TAG_NAME, "td")
-
-        target_col_index = -1
-        for i, col in enumerate(date_cols):
-            if i == 0:
-                continue
-            try:
-                col.find_element(By.XPATH, ".//img[contains(@src, 'today.jpg')]")
-                target_col_index = i
-                if today_date_info == "날짜 정보 없음":
-                    date_text = col.text.strip().split('\n')[0].replace('오늘', '').strip()
-                    if date_text:
-                        today_date_info = date_text
-                break
-            except NoSuchElementException:
-                continue
+def crawl_single_channel(fetcher, channel_name, channel_code, base_url=BASE_URL, all_days=False):
+    """
+    채널 하나의 오늘 편성표를 크롤링합니다. 반환값: (프로그램 목록, 감지된 날짜)
+    fetcher는 tvguide_fetch의 페이지 백엔드(HTTP/Selenium/자동)입니다.
+    all_days=True이면 같은 페이지에 있는 모든 날짜 열(주간 편성표)을 함께 추출합니다.
+    """
+    TARGET_URL = f"{base_url}&c={channel_code}"
 
-        wait.until(EC.presence_of_element_located((By.ID, "result_tbl")))
+    print(f"\n📡 {channel_name} 크롤링 시도: {TARGET_URL}")
 
-        # 시간대별 프로그램 추출 (생략)
-        for row_index in range(1, 25):
-            try:
-                time_td_xpath = f"//table[@id='result_tbl']/tbody/tr[{row_index}]/td[1]"
-                time_td = wait.until(EC.presence_of_element_located((By.XPATH, time_td_xpath)))
-
-                hour_match = re.search(r'^\d+', time_td.text.strip())
-                if not hour_match:
-                    continue
-                hour = hour_match.group(0).zfill(2)
-
-                cell_xpath = f"//table[@id='result_tbl']/tbody/tr[{row_index}]/td[{target_col_index + 1}]"
-                cell = wait.until(EC.presence_of_element_located((By.XPATH, cell_xpath)))
-
-                program_rows = cell.find_elements(By.XPATH, ".//table//tr")
-                for pr in program_rows:
-                    tds = pr.find_elements(By.TAG_NAME, "td")
-                    if len(tds) < 2:
-                        continue
-
-                    minute = tds[0].text.strip().zfill(2)
-                    title = tds[1].text.strip()
-
-                    if minute and title and title not in ("프로그램 정보가 없습니다.", "광고", ""):
-                        channel_data.append({
-                            "channel": channel_name,
-                            "broadcast_date": today_date_info,
-                            "broadcast_time": f"{hour}:{minute}",
-                            "title": title,
-                            "plot": "",
-                            "genre": "",
-                            "cast": "",
-                            "director": ""
-                        })
-            except:
-                continue
+    try:
+        # 페이지 HTML을 한 번 받아 날짜 헤더와 편성표를 함께 파싱
+        html = fetcher.fetch(TARGET_URL)
+        if all_days:
+            channel_data, date_text = build_week_rows(channel_name, html)
+        else:
+            date_text, _, programs = parse_schedule(html)
+            channel_data = build_channel_rows(channel_name, date_text or DATE_UNKNOWN, programs)
+        today_date_info = date_text or DATE_UNKNOWN
 
         print(f"✅ {channel_name} {len(channel_data)}개 프로그램 추출 완료.")
-        return channel_data
+        return channel_data, today_date_info
 
     except Exception as e:
         print(f"❌ {channel_name} 크롤링 오류: {e}")
-        return []
+        return [], DATE_UNKNOWN
+
+
+def make_page_fetcher(backend: str, pool: BrowserPool, workers: int = 1):
+    """편성표 페이지 백엔드 생성: http(브라우저 없음) / selenium / auto(HTTP 우선, 필요 시 Selenium)"""
+    if backend == 'http':
+        return HttpPageFetcher(pool_size=workers)
+    if backend == 'selenium':
+        return SeleniumPageFetcher(pool)
+    return AutoPageFetcher(HttpPageFetcher(pool_size=workers), lambda: SeleniumPageFetcher(pool))
+
+
+def crawl_channels(channels: dict, fetcher, workers: int = 1, base_url=BASE_URL, all_days=False):
+    """
+    여러 채널을 최대 workers개씩 동시에 크롤링합니다.
+    반환값: (채널 순서대로 합친 프로그램 목록, 감지된 날짜)
+    """
+    items = list(channels.items())
+    if workers <= 1:
+        # 채널 사이 간격은 fetcher의 호스트별 속도 제한(rate_limiter)이 맡습니다.
+        results = [crawl_single_channel(fetcher, name, code, base_url, all_days) for name, code in items]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(crawl_single_channel, fetcher, name, code, base_url, all_days)
+                       for name, code in items]
+            results = [f.result() for f in futures]
+
+    # 날짜는 채널 순서상 처음 감지된 값을 사용 (감지하지 못한 채널도 같은 날짜로 채움)
+    date_info = next((d for _, d in results if d != DATE_UNKNOWN), DATE_UNKNOWN)
+    merged = []
+    for channel_data, _ in results:
+        for row in channel_data:
+            if row['broadcast_date'] == DATE_UNKNOWN:
+                row['broadcast_date'] = date_info
+            merged.append(row)
+    return merged, date_info
 
 
 # ===================================================================
 # 5. 전체 데이터 보강 (새 컬럼 추가)
 # ===================================================================
-def enrich_data(df: pd.DataFrame) -> pd.DataFrame:
-    df['search_title'] = df['title'].apply(clean_title)
-    unique_titles = df['search_title'].unique()
-    results_map = {}
+ENRICH_COLUMNS = ['plot', 'genre', 'cast', 'director', 'poster_url', 'age_rating', 'runtime_or_episode']
+AIRING_KEY = ['channel', 'broadcast_date', 'broadcast_time', 'title']
 
-    print(f"\n🚀 총 {len(unique_titles)}개의 고유 프로그램 상세 정보 보강 시작")
 
-    for i, title in enumerate(unique_titles):
-        if not title:
+def load_previous_schedule(path: str) -> pd.DataFrame:
+    """이전 실행 결과(tv_crawling.parquet, 예전 CSV 또는 스냅샷)를 읽습니다. 없으면 빈 DataFrame."""
+    if not path:
+        return pd.DataFrame()
+    try:
+        return read_dataset(path, TV_SCHEMA)
+    except Exception as e:
+        print(f"⚠️ 이전 결과 '{path}' 읽기 실패: {e}")
+        return pd.DataFrame()
+
+
+def diff_schedules(prev_df: pd.DataFrame, new_df: pd.DataFrame) -> dict:
+    """
+    이전/현재 편성표의 방영 건을 비교합니다.
+    - added / removed: (채널, 날짜, 시간, 제목)이 새로 생기거나 사라진 방영
+    - rescheduled: 같은 채널/날짜/제목인데 방영 시간만 바뀐 방영 (added/removed에서 제외)
+    """
+    def airings(df):
+        if df.empty or not set(AIRING_KEY) <= set(df.columns):
+            return set()
+        return set(df[AIRING_KEY].astype(str).itertuples(index=False, name=None))
+
+    prev_set, new_set = airings(prev_df), airings(new_df)
+    added = new_set - prev_set
+    removed = prev_set - new_set
+
+    def by_program(rows):
+        grouped = {}
+        for channel, broadcast_date, broadcast_time, title in rows:
+            grouped.setdefault((channel, broadcast_date, title), []).append(broadcast_time)
+        return grouped
+
+    added_by, removed_by = by_program(added), by_program(removed)
+    rescheduled = []
+    for key in sorted(set(added_by) & set(removed_by)):
+        old_times, new_times = sorted(removed_by[key]), sorted(added_by[key])
+        rescheduled.append((*key, old_times, new_times))
+        channel, broadcast_date, title = key
+        added -= {(channel, broadcast_date, t, title) for t in new_times}
+        removed -= {(channel, broadcast_date, t, title) for t in old_times}
+
+    return {'added': sorted(added), 'removed': sorted(removed), 'rescheduled': rescheduled}
+
+
+def print_schedule_diff(diff: dict):
+    print(f"\n🔎 편성 변경: 추가 {len(diff['added'])}건, 삭제 {len(diff['removed'])}건, "
+          f"시간 변경 {len(diff['rescheduled'])}건")
+    for channel, broadcast_date, broadcast_time, title in diff['added'][:20]:
+        print(f"  ➕ {channel} {broadcast_date} {broadcast_time} {title}")
+    for channel, broadcast_date, broadcast_time, title in diff['removed'][:20]:
+        print(f"  ➖ {channel} {broadcast_date} {broadcast_time} {title}")
+    for channel, broadcast_date, title, old_times, new_times in diff['rescheduled'][:20]:
+        print(f"  🔁 {channel} {broadcast_date} {title}: {', '.join(old_times)} → {', '.join(new_times)}")
+
+
+def reusable_enrichment(prev_df: pd.DataFrame) -> dict:
+    """이전 결과에서 상세 정보가 채워진 제목별 보강 값을 모읍니다 (빈 결과는 다시 조회)."""
+    if prev_df.empty or 'title' not in prev_df.columns:
+        return {}
+    reuse = {}
+    for record in prev_df.to_dict('records'):
+        search_title = clean_title(record.get('title', ''))
+        if not search_title or search_title in reuse:
             continue
+        info = {key: record.get(key, '') for key in ENRICH_COLUMNS}
+        if any(info[key] != KINOLIGHTS_DEFAULT_INFO[key] for key in ENRICH_COLUMNS):
+            reuse[search_title] = info
+    return reuse
+
 
-        info = fetch_kinolights_info(title)
-        results_map[title] = info
+def airing_priority(broadcast_date: str, broadcast_time: str, now: datetime = None) -> float:
+    """상세 정보 수집 순서: 방영 시각이 가까운 순 (이미 지난 방영은 예정된 방영 뒤로)"""
+    now = now or datetime.now()
+    try:
+        day = date.fromisoformat(str(broadcast_date))
+    except ValueError:
+        iso = resolve_column_date(str(broadcast_date))
+        day = date.fromisoformat(iso) if iso else now.date()
+    try:
+        hour, minute = str(broadcast_time).split(':')
+        airing = datetime.combine(day, datetime.min.time()).replace(hour=int(hour) % 24, minute=int(minute) % 60)
+    except ValueError:
+        return float('inf')
+    delta = (airing - now).total_seconds()
+    return delta if delta >= 0 else 10 ** 9 - delta
+
+
+def journal_writer(journal: CrawlJournal, df: pd.DataFrame):
+    """제목 하나가 끝날 때마다 그 제목의 행들을 저널에 남기는 on_result 콜백 (journal이 없으면 None)"""
+    if journal is None:
+        return None
+    rows_by_title = {}
+    for row in df.to_dict('records'):
+        rows_by_title.setdefault(clean_title(row['title']), []).append(row)
+
+    def on_result(title, info, status):
+        # 시간 초과/오류로 기본값만 남은 제목은 기록하지 않음 → --resume 때 다시 수집
+        if status not in COMPLETED_STATUSES:
+            return
+        journal.append([dict(row, **{key: info.get(key, "") for key in ENRICH_COLUMNS})
+                        for row in rows_by_title.get(title, [])])
+
+    return on_result
+
+
+def enrich_data(df: pd.DataFrame, cache: KinolightsCache = None, pool: BrowserPool = None,
+                previous: pd.DataFrame = None, workers: int = DEFAULT_ENRICH_WORKERS,
+                journal: CrawlJournal = None) -> pd.DataFrame:
+    """
+    제목별 키노라이츠 상세 정보를 채웁니다.
+    previous(이전 실행 결과)를 주면 그 안의 상세 정보를 재사용하고, 새로 생긴 제목만 조회합니다.
+    수집은 workers개의 브라우저로 동시에, 방영 시각이 가까운 제목부터 진행합니다.
+    journal을 주면 제목이 끝날 때마다 해당 행들을 바로 기록하고,
+    이미 기록된 (채널, 날짜, 시각, 제목) 행의 상세 정보는 다시 수집하지 않습니다.
+    """
+    df['search_title'] = df['title'].apply(clean_title)
+    results_map = reusable_enrichment(previous) if previous is not None else {}
+
+    if journal is not None:
+        resumed = 0
+        for row in df.to_dict('records'):
+            saved = journal.get(row)
+            if saved is not None and saved.get('title') == row['title']:
+                resumed += 1
+                if row['search_title'] not in results_map:
+                    results_map[row['search_title']] = {key: saved.get(key, "") for key in ENRICH_COLUMNS}
+        if resumed:
+            print(f"\n⏩ 저널에서 {resumed}건 재사용")
+    on_result = journal_writer(journal, df.drop(columns=['search_title']))
+
+    all_titles = df['search_title'].unique()
+    unique_titles = [t for t in all_titles if t not in results_map]
+    if previous is not None:
+        print(f"\n♻️ 이전 결과 재사용 {len(all_titles) - len(unique_titles)}개, 신규/변경 {len(unique_titles)}개")
+
+    jobs = [
+        (airing_priority(d, t), title)
+        for title, d, t in zip(df['search_title'], df['broadcast_date'], df['broadcast_time'])
+        if title and title not in results_map
+    ]
+
+    own_cache = cache is None
+    if own_cache:
+        cache = KinolightsCache()
+    own_pool = pool is None
+    if own_pool:
+        pool = BrowserPool(size=workers)
 
-        print(f"[{i + 1}/{len(unique_titles)}] '{title}' 처리 완료")
-        time.sleep(1)
+    print(f"\n🚀 총 {len(unique_titles)}개의 고유 프로그램 상세 정보 보강 시작")
+
+    try:
+        results_map.update(run_enrichment(
+            jobs,
+            lambda driver, title: scrape_kinolights_info(driver, title, cache),
+            pool,
+            KINOLIGHTS_DEFAULT_INFO,
+            cache=cache,
+            workers=workers,
+            on_result=on_result,
+        ))
+    finally:
+        if own_cache:
+            cache.close()
+        if own_pool:
+            pool.shutdown()
 
     # 새로 추가된 키 포함: poster_url, age_rating, runtime_or_episode
-    for key in ['plot', 'genre', 'cast', 'director', 'poster_url', 'age_rating', 'runtime_or_episode']:
+    for key in ENRICH_COLUMNS:
         df[key] = df['search_title'].apply(lambda x: results_map.get(x, {}).get(key, ""))
     df.drop(columns=['search_title'], inplace=True)
     return df
@@ -323,28 +523,133 @@ def extract_poster_url_from_html(driver: webdriver.Chrome) -> str:
     return poster_url
 
 # ===================================================================
-# 6. 메인 실행부 (생략: 변경 없음)
+# 6. 날짜별 편성표 저장 (주간 모드)
 # ===================================================================
-if __name__ == "__main__":
-    try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+def partition_path(out_dir, broadcast_date):
+    return os.path.join(out_dir, f"{broadcast_date}.parquet")
 
-        for name, code in TARGET_CHANNELS.items():
-            result = crawl_single_channel(name, code)
-            all_data.extend(result)
-            time.sleep(1.5)
 
-    finally:
-        if driver:
-            driver.quit()
+def captured_dates(out_dir) -> set:
+    """이미 저장된 방송 날짜 목록 (예전 .csv 저장분 포함)"""
+    if not os.path.isdir(out_dir):
+        return set()
+    return {os.path.splitext(name)[0] for name in os.listdir(out_dir) if name.endswith(('.parquet', '.csv'))}
 
-    if all_data:
-        df = pd.DataFrame(all_data)
-        df.sort_values(by=['channel', 'broadcast_time'], inplace=True)
 
-        df = enrich_data(df)
+def save_partitions(df: pd.DataFrame, out_dir=PARTITION_DIR):
+    os.makedirs(out_dir, exist_ok=True)
+    for broadcast_date, part in df.groupby('broadcast_date', sort=True):
+        write_dataset(part, partition_path(out_dir, broadcast_date), TV_SCHEMA)
+        print(f"💾 {partition_path(out_dir, broadcast_date)} 저장 ({len(part)}건)")
 
-        df.to_csv('tv_crawling.csv', index=False, encoding='utf-8-sig')
-        print(f"\n🎉 'tv_crawling.csv' 저장 완료 ({len(df)}건)")
+
+def load_partitions(out_dir=PARTITION_DIR, since: str = '') -> pd.DataFrame:
+    """since(YYYY-MM-DD) 이후 날짜의 저장분을 모두 읽어 합칩니다."""
+    frames = [read_dataset(partition_path(out_dir, d), TV_SCHEMA)
+              for d in sorted(captured_dates(out_dir)) if d >= since]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def add_broadcast_at(df: pd.DataFrame) -> pd.DataFrame:
+    """broadcast_date('11.17' 또는 'YYYY-MM-DD') + broadcast_time으로 KST 방송 시각 컬럼을 만듭니다."""
+    iso = {d: d if re.fullmatch(r'\d{4}-\d{2}-\d{2}', str(d)) else resolve_column_date(str(d))
+           for d in df['broadcast_date'].unique()}
+    df['broadcast_at'] = kst_timestamps(df['broadcast_date'].map(iso), df['broadcast_time'])
+    return df
+
+
+# ===================================================================
+# 7. 메인 실행부
+# ===================================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TV 편성표 크롤링")
+    parser.add_argument('--workers', type=int, default=DEFAULT_CHANNEL_WORKERS,
+                        help=f"동시에 크롤링할 채널 수 (기본값: {DEFAULT_CHANNEL_WORKERS}, 1이면 순차 실행)")
+    parser.add_argument('--backend', choices=['auto', 'http', 'selenium'], default='auto',
+                        help="편성표 페이지 로드 방식 (기본값: auto = HTTP 우선, 필요할 때만 Chrome)")
+    parser.add_argument('--base-url', default=BASE_URL,
+                        help="편성표 URL (녹화 페이지 로컬 서버 등으로 바꿀 때 사용)")
+    parser.add_argument('--all-days', action='store_true',
+                        help=f"페이지의 모든 날짜(주간)를 추출해 '{PARTITION_DIR}/날짜.parquet'로 나눠 저장")
+    parser.add_argument('--refresh', action='store_true',
+                        help="주간 모드에서 이미 저장된 날짜도 다시 저장")
+    parser.add_argument('--enrich-workers', type=int, default=DEFAULT_ENRICH_WORKERS,
+                        help=f"상세 정보를 동시에 수집할 브라우저 수 (기본값: {DEFAULT_ENRICH_WORKERS})")
+    parser.add_argument('--incremental', action='store_true',
+                        help="이전 결과와 비교해 새로 생긴 제목만 상세 정보를 조회")
+    parser.add_argument('--previous', default=TV_DATASET,
+                        help=f"--incremental 비교 대상 (기본값: {TV_DATASET})")
+    parser.add_argument('--browser-profile', choices=BROWSER_PROFILES, default=PROFILE_DEFAULT,
+                        help="Chrome 프로필 (lean = headless + 이미지/폰트/분석 스크립트 차단)")
+    parser.add_argument('--rate-limit', action='append', default=[], metavar='HOST=RATE[:BURST]',
+                        help="호스트별 초당 요청 수/버스트 (예: kinolights.com=2:4, 여러 번 지정 가능)")
+    parser.add_argument('--resume', action='store_true',
+                        help=f"중단된 실행을 '{JOURNAL_FILE}'에 기록된 항목부터 이어서 진행")
+    parser.add_argument('--csv', action='store_true',
+                        help=f"'{TV_DATASET}'와 함께 tv_crawling.csv도 저장")
+    args = parser.parse_args()
+    try:
+        configure_limits(args.rate_limit)
+    except ValueError as e:
+        parser.error(str(e))
+    workers = max(1, min(args.workers, len(TARGET_CHANNELS)))
+    previous = load_previous_schedule(args.previous) if args.incremental else None
+
+    # 편성표 크롤링과 상세 정보 보강이 같은 Chrome 세션 풀을 공유 (Chrome은 실제로 필요할 때만 실행)
+    enrich_workers = max(1, args.enrich_workers)
+    journal = CrawlJournal(JOURNAL_FILE, JOURNAL_KEYS)
+    if args.resume:
+        print(f"⏩ 저널 '{JOURNAL_FILE}'에서 {journal.load()}건을 불러와 이어서 실행합니다.")
     else:
-        print("⚠️ 크롤링 결과가 없습니다.")
\ No newline at end of file
+        journal.clear()
+    with BrowserPool(size=max(workers, enrich_workers), profile=args.browser_profile) as pool:
+        fetcher = make_page_fetcher(args.backend, pool, workers)
+        started = time.time()
+        try:
+            all_data, today_date_info = crawl_channels(TARGET_CHANNELS, fetcher, workers=workers,
+                                                       base_url=args.base_url, all_days=args.all_days)
+        finally:
+            fetcher.close()
+        print(f"\n⏱️ {len(TARGET_CHANNELS)}개 채널 크롤링 {time.time() - started:.1f}초 (동시 {workers}개, 날짜: {today_date_info})")
+
+        if all_data and args.all_days:
+            df = pd.DataFrame(all_data)
+            done = set() if args.refresh else captured_dates(PARTITION_DIR)
+            skipped = sorted(done & set(df['broadcast_date']))
+            if skipped:
+                print(f"⏭️ 이미 저장된 날짜 건너뜀: {', '.join(skipped)}")
+            df = df[~df['broadcast_date'].isin(done)].copy()
+
+            if not df.empty:
+                df.sort_values(by=['broadcast_date', 'channel', 'broadcast_time'], inplace=True)
+                if previous is not None and 'broadcast_date' in previous.columns:
+                    # 이번에 새로 저장하는 날짜끼리만 비교
+                    same_days = previous[previous['broadcast_date'].isin(df['broadcast_date'])]
+                    print_schedule_diff(diff_schedules(same_days, df))
+                df = enrich_data(df, pool=pool, previous=previous, workers=enrich_workers,
+                                 journal=journal)
+                save_partitions(add_broadcast_at(df), PARTITION_DIR)
+
+            # 다음 단계(합본)용 데이터셋에는 오늘 이후 날짜를 모두 담습니다.
+            today_iso = resolve_column_date(today_date_info) or date.today().isoformat()
+            df = load_partitions(PARTITION_DIR, since=today_iso)
+            write_dataset(df, TV_DATASET, TV_SCHEMA, csv_path='tv_crawling.csv' if args.csv else None)
+            print(f"\n🎉 '{TV_DATASET}' 저장 완료 ({len(df)}건, {today_iso} 이후)")
+            journal.clear()
+
+        elif all_data:
+            df = pd.DataFrame(all_data)
+            df.sort_values(by=['channel', 'broadcast_time'], inplace=True)
+
+            if previous is not None:
+                print_schedule_diff(diff_schedules(previous, df))
+            df = enrich_data(df, pool=pool, previous=previous, workers=enrich_workers,
+                             journal=journal)
+
+            df = add_broadcast_at(df)
+            write_dataset(df, TV_DATASET, TV_SCHEMA, csv_path='tv_crawling.csv' if args.csv else None)
+            print(f"\n🎉 '{TV_DATASET}' 저장 완료 ({len(df)}건)")
+            journal.clear()
+        else:
+            print("⚠️ 크롤링 결과가 없습니다.")
+    DEFAULT_LIMITER.print_report()
@@ -1,18 +1,26 @@
 # ott_crawling_fast_stable.py
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
-    NoSuchElementException, TimeoutException, StaleElementReferenceException
+    NoSuchElementException, TimeoutException
 )
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-import time
+import argparse
 import pandas as pd
 import re
 
+from browser_pool import BROWSER_PROFILES, PROFILE_DEFAULT, BrowserPool
+from crawl_journal import CrawlJournal
+from dataset_io import OTT_DATASET, OTT_SCHEMA, write_dataset
+from enrichment_scheduler import COMPLETED_STATUSES, DEFAULT_WORKERS as DEFAULT_ENRICH_WORKERS, run_enrichment
+from kinolights import (
+    KINOLIGHTS_SEARCH_URL, open_known_detail_page, wait_for_detail_page, wait_for_synopsis_expanded
+)
+from kinolights_cache import KinolightsCache
+from rank_history import RankHistory
+from rate_limiter import DEFAULT_LIMITER, configure_limits, throttle
+
 # ===================================================================
 # 1. OTT 랭킹 URL 목록
 # ===================================================================
@@ -26,6 +34,11 @@ OTT_URLS = {
     "BoxOffice": "https://m.kinolights.com/ranking/boxoffice"
 }
 
+# 완성된 행을 바로바로 남기는 저널 (중단 후 --resume으로 이어서 실행)
+JOURNAL_FILE = 'ott_crawling.journal.jsonl'
+# 순위가 비어 있는 항목끼리 키가 겹치지 않도록 제목까지 포함
+JOURNAL_KEYS = ('platform', 'rank', 'title')
+
 # ===================================================================
 # 2. 제목 정규화 함수
 # ===================================================================
@@ -45,39 +58,48 @@ def clean_title(title: str) -> str:
 # ===================================================================
 # 3. 키노라이츠 상세 정보 가져오기
 # ===================================================================
-def fetch_kinolights_info(driver, title: str, wait_time=10):
-    info = {
-        "synopsis": "",
-        "genre": "",
-        "cast": "",
-        "director": "",
-        "age_rating": "",
-        "running_time": "",
-        "poster_image": ""
-    }
+# 상세 정보 기본값 (아무것도 찾지 못한 경우 = 캐시의 '빈 결과')
+KINOLIGHTS_DEFAULT_INFO = {
+    "synopsis": "",
+    "genre": "",
+    "cast": "",
+    "director": "",
+    "age_rating": "",
+    "running_time": "",
+    "poster_image": ""
+}
+
+
+def fetch_kinolights_info(driver, title: str, wait_time=10, url_index: KinolightsCache = None):
+    info = dict(KINOLIGHTS_DEFAULT_INFO)
     try:
         wait = WebDriverWait(driver, wait_time)
 
-        # 1. 검색 페이지 이동
-        driver.get("https://m.kinolights.com/search")
-        search_input = wait.until(EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "input.search-form__input")
-        ))
-        search_input.clear()
-        search_input.send_keys(title)
-        search_input.send_keys(Keys.RETURN)
-        time.sleep(1.0)
-
-        # 2. 첫 번째 결과 클릭
-        try:
-            first_result = wait.until(EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "a.content__body")
+        # 이미 아는 제목(검색 이력/랭킹 링크)은 검색 없이 상세 페이지로 바로 이동
+        if not open_known_detail_page(driver, title, url_index):
+            # 1. 검색 페이지 이동
+            throttle(KINOLIGHTS_SEARCH_URL)
+            driver.get(KINOLIGHTS_SEARCH_URL)
+            search_input = wait.until(EC.presence_of_element_located(
+                (By.CSS_SELECTOR, "input.search-form__input")
             ))
-            first_result.click()
-        except TimeoutException:
-            return info  # 검색 결과 없으면 빈 정보 반환
+            search_input.clear()
+            search_input.send_keys(title)
+            search_input.send_keys(Keys.RETURN)
+
+            # 2. 첫 번째 결과 클릭
+            try:
+                first_result = wait.until(EC.element_to_be_clickable(
+                    (By.CSS_SELECTOR, "a.content__body")
+                ))
+                search_url = driver.current_url
+                throttle(KINOLIGHTS_SEARCH_URL)
+                first_result.click()
+            except TimeoutException:
+                return info  # 검색 결과 없으면 빈 정보 반환
 
-        time.sleep(2)  # 상세 페이지 로딩 대기
+            if wait_for_detail_page(driver, wait, search_url) and url_index is not None:
+                url_index.put_url(title, driver.current_url, source='search')
 
         # 3. 상세 정보 추출
         # 줄거리
@@ -86,8 +108,9 @@ def fetch_kinolights_info(driver, title: str, wait_time=10):
             # 더보기 버튼 클릭 시도
             try:
                 more_btn = driver.find_element(By.CSS_SELECTOR, "button.more")
+                before_text = driver.find_element(By.CSS_SELECTOR, "div.synopsis .text").text.strip()
                 driver.execute_script("arguments[0].click();", more_btn)
-                time.sleep(0.5)  # 펼쳐지는 시간 잠깐 대기
+                wait_for_synopsis_expanded(driver, before_text)
             except:
                 pass  # 더보기 버튼이 없으면 그냥 넘어감
 
@@ -163,118 +186,264 @@ def fetch_kinolights_info(driver, title: str, wait_time=10):
 # ===================================================================
 # 4. OTT 랭킹 목록 크롤링
 # ===================================================================
-def crawl_ott(platform, url):
-    options = webdriver.ChromeOptions()
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("window-size=1200,900")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    wait = WebDriverWait(driver, 15)
+# 랭킹 목록 전체를 브라우저 안에서 한 번에 추출하는 스크립트
+# (항목마다 find_element를 5번 이상 호출하던 WebDriver 왕복을 1회로 줄임)
+RANKING_LIST_SCRIPT = """
+return Array.from(document.querySelectorAll('ul.content-ranking-list > li')).map(function (li) {
+    function text(el) { return el ? (el.innerText || '').trim() : ''; }
+    var titleEl = li.querySelector('h5.info__title');
+    var changeEl = li.querySelector('.rank__change span');
+    var imgEl = li.querySelector('img');
+    var linkEl = li.querySelector('a');
+    return {
+        rank: text(li.querySelector('.rank__number span')),
+        has_change: !!changeEl,
+        change_text: text(changeEl),
+        change_class: changeEl ? (changeEl.getAttribute('class') || '') : '',
+        title: titleEl ? text(titleEl) : text(li.querySelector('.title')),
+        poster_image: imgEl ? (imgEl.src || '') : '',
+        detail_url: linkEl ? (linkEl.href || '') : ''
+    };
+});
+"""
+
+
+def format_rank_change(change_val: str, classes: str) -> str:
+    """랭킹 변동 표시(span의 class)를 '+3', '-2', '0', 'NEW' 형식으로 바꿉니다."""
+    if "change--up" in classes:
+        return f"+{change_val}"
+    if "change--down" in classes:
+        return f"-{change_val}"
+    if "change--same" in classes:
+        return "0"
+    if "change--new" in classes:
+        return "NEW"
+    return change_val
+
 
+def extract_ranking_items(driver):
+    """
+    현재 랭킹 페이지의 항목을 한 번의 스크립트 실행으로 가져옵니다.
+    반환값: [{'rank', 'rank_change', 'title', 'poster_image', 'detail_url'}, ...] (제목 없는 항목 제외)
+    """
+    raw_items = driver.execute_script(RANKING_LIST_SCRIPT) or []
+    items = []
+    for raw in raw_items:
+        if not raw.get('title'):
+            continue
+        rank_change = format_rank_change(raw['change_text'], raw['change_class']) if raw.get('has_change') else ""
+        items.append({
+            "rank": raw.get('rank', ''),
+            "rank_change": rank_change,
+            "title": raw['title'],
+            "poster_image": raw.get('poster_image', ''),
+            "detail_url": raw.get('detail_url', ''),
+        })
+    return items
+
+
+def crawl_ranking(driver, url, wait_time=10):
+    """랭킹 페이지를 열어 목록만 추출합니다 (상세 정보 보강 없음)."""
+    throttle(url)
+    driver.get(url)
     try:
-        driver.get(url)
-        time.sleep(2)
+        # 목록 항목이 렌더링될 때까지만 대기
+        WebDriverWait(driver, wait_time).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "ul.content-ranking-list > li"))
+        )
+    except TimeoutException:
+        print(f"⚠️ 랭킹 목록이 {wait_time}초 안에 나타나지 않음: {url}")
+    try:
+        return extract_ranking_items(driver)
+    except Exception as e:
+        print(f"랭킹 목록 추출 예외: {e}")
+        return []
+
+
+def rank_priority(rank: str, fallback: int) -> int:
+    """상세 정보 수집 순서: 랭킹 숫자가 작을수록 먼저"""
+    digits = re.sub(r'\D', '', str(rank))
+    return int(digits) if digits else fallback
+
+
+def build_ott_row(platform, item, detail_info):
+    return {
+        "platform": platform,
+        "rank": item["rank"],
+        "rank_change": item["rank_change"],
+        "title": item["title"],
+        "poster_image": item["poster_image"] or detail_info["poster_image"],
+        "genre": detail_info["genre"],
+        "cast": detail_info["cast"],
+        "director": detail_info["director"],
+        "synopsis": detail_info["synopsis"],
+        "age_rating": detail_info["age_rating"],
+        "running_time": detail_info["running_time"]
+    }
+
+
+def collect_rankings(ott_urls: dict, pool: BrowserPool) -> dict:
+    """모든 플랫폼의 랭킹 목록만 먼저 추출합니다. 반환값: {플랫폼: [항목, ...]}"""
+    rankings = {}
+    # 플랫폼마다 Chrome을 새로 띄우지 않고 풀의 세션을 재사용
+    with pool.lease() as driver:
+        for platform, url in ott_urls.items():
+            rankings[platform] = crawl_ranking(driver, url)
+            print(f"📋 {platform} 랭킹 {len(rankings[platform])}개 추출")
+    return rankings
 
-        # 랭킹 아이템
-        try:
-            items = driver.find_elements(By.CSS_SELECTOR, "ul.content-ranking-list > li")
-        except:
-            items = []
 
-        data = []
+def enrich_rankings(rankings: dict, cache: KinolightsCache, pool: BrowserPool,
+                    workers: int = DEFAULT_ENRICH_WORKERS, on_result=None) -> dict:
+    """
+    전체 플랫폼에 걸쳐 고유한 clean_title마다 상세 정보를 한 번만 수집합니다.
+    같은 제목이 여러 플랫폼에 있으면 가장 높은 순위를 우선순위로 사용합니다.
+    on_result(title, info, status)는 제목 하나가 끝날 때마다 호출됩니다.
+    반환값: {clean_title: 상세 정보}
+    """
+    jobs = []
+    for items in rankings.values():
         for idx, item in enumerate(items, 1):
-            try:
-                # rank
-                try:
-                    rank = item.find_element(By.CSS_SELECTOR, ".rank__number span").text.strip()
-                except:
-                    rank = ""
+            search_title = clean_title(item["title"])
+            # 랭킹 항목의 상세 페이지 링크를 URL 색인에 기록 (다음 조회 시 검색 생략)
+            if cache is not None:
+                cache.put_url(search_title, item["detail_url"], source='ranking')
+            jobs.append((rank_priority(item["rank"], idx), search_title))
 
-                # rank change
-                try:
-                    change_el = item.find_element(By.CSS_SELECTOR, ".rank__change span")
-                    change_val = change_el.text.strip()
-
-                    classes = change_el.get_attribute("class")
-
-                    if "change--up" in classes:
-                        rank_change = f"+{change_val}"
-                    elif "change--down" in classes:
-                        rank_change = f"-{change_val}"
-                    elif "change--same" in classes:
-                        rank_change = "0"
-                    elif "change--new" in classes:
-                        rank_change = "NEW"
-                    else:
-                        rank_change = change_val
+    unique = len({title for _, title in jobs if title})
+    print(f"🔗 랭킹 {len(jobs)}건 중 고유 제목 {unique}개만 상세 정보 수집")
 
-                except:
-                    rank_change = ""
+    return run_enrichment(
+        jobs,
+        lambda driver, title: fetch_kinolights_info(driver, title, url_index=cache),
+        pool,
+        KINOLIGHTS_DEFAULT_INFO,
+        cache=cache,
+        workers=workers,
+        on_result=on_result,
+    )
 
-                # title
-                try:
-                    title = item.find_element(By.CSS_SELECTOR, "h5.info__title").text.strip()
-                except:
-                    try:
-                        title = item.find_element(By.CSS_SELECTOR, ".title").text.strip()
-                    except:
-                        title = ""
-                if not title:
+
+def build_journal_key(platform, item) -> dict:
+    return {"platform": platform, "rank": item["rank"], "title": item["title"]}
+
+
+def journal_writer(journal: CrawlJournal, rankings: dict):
+    """제목 하나가 끝날 때마다 그 제목의 랭킹 행들을 저널에 남기는 on_result 콜백 (journal이 없으면 None)"""
+    if journal is None:
+        return None
+    by_title = {}
+    for platform, items in rankings.items():
+        for item in items:
+            by_title.setdefault(clean_title(item["title"]), []).append((platform, item))
+
+    def on_result(title, info, status):
+        # 시간 초과/오류로 기본값만 남은 제목은 기록하지 않음 → --resume 때 다시 수집
+        if status not in COMPLETED_STATUSES:
+            return
+        journal.append([build_ott_row(p, item, info) for p, item in by_title.get(title, [])])
+
+    return on_result
+
+
+def crawl_all_ott(ott_urls: dict, cache: KinolightsCache = None, pool: BrowserPool = None,
+                  workers: int = DEFAULT_ENRICH_WORKERS, journal: CrawlJournal = None,
+                  profile: str = PROFILE_DEFAULT):
+    """
+    랭킹 목록을 모두 모은 뒤 고유 제목만 보강하고, 결과를 플랫폼별 행에 나눠 채웁니다.
+    pool을 주지 않으면 profile(default/lean) 설정으로 풀을 만들어 씁니다.
+    journal을 주면 완성된 행을 바로 기록하고, 이미 기록된 (플랫폼, 순위, 제목) 항목은 다시 수집하지 않습니다.
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = BrowserPool(size=workers, profile=profile)
+    try:
+        rankings = collect_rankings(ott_urls, pool)
+
+        # 저널에 같은 순위·같은 제목으로 남아 있는 항목은 그대로 재사용
+        resumed = {}
+        pending = {}
+        for platform, items in rankings.items():
+            for item in items:
+                saved = journal.get(build_journal_key(platform, item)) if journal is not None else None
+                if saved is not None:
+                    resumed[(platform, item["rank"], item["title"])] = saved
+                else:
+                    pending.setdefault(platform, []).append(item)
+        if resumed:
+            print(f"⏩ 저널에서 {len(resumed)}건 재사용, 남은 {sum(len(v) for v in pending.values())}건 수집")
+
+        on_result = journal_writer(journal, pending)
+        details = enrich_rankings(pending, cache, pool, workers, on_result)
+        rows = []
+        for platform, items in rankings.items():
+            for item in items:
+                saved = resumed.get((platform, item["rank"], item["title"]))
+                if saved is not None:
+                    rows.append(saved)
                     continue
-                # poster
-                try:
-                    poster_el = item.find_element(By.CSS_SELECTOR, "img")
-                    poster_image = poster_el.get_attribute("src")
-                except:
-                    poster_image = ""
-
-                # 검색용 title
-                search_title = clean_title(title)
-
-                # 상세 정보 새 탭에서 크롤링
-                driver.execute_script("window.open('');")
-                driver.switch_to.window(driver.window_handles[1])
-                detail_info = fetch_kinolights_info(driver, search_title)
-                driver.close()
-                driver.switch_to.window(driver.window_handles[0])
-
-                row = {
-                    "platform": platform,
-                    "rank": rank,
-                    "rank_change": rank_change,
-                    "title": title,
-                    "poster_image": poster_image or detail_info["poster_image"],
-                    "genre": detail_info["genre"],
-                    "cast": detail_info["cast"],
-                    "director": detail_info["director"],
-                    "synopsis": detail_info["synopsis"],
-                    "age_rating": detail_info["age_rating"],
-                    "running_time": detail_info["running_time"]
-                }
-                data.append(row)
-                print(f"[{idx}/{len(items)}] {title} 처리 완료")
-            except StaleElementReferenceException:
-                continue
-            except Exception as e:
-                print(f"아이템 처리 중 예외: {e}")
-                continue
-        return data
+                detail_info = details.get(clean_title(item["title"]), KINOLIGHTS_DEFAULT_INFO)
+                rows.append(build_ott_row(platform, item, detail_info))
+        return rows
     finally:
-        driver.quit()
+        if own_pool:
+            pool.shutdown()
+
+
+def crawl_ott(platform, url, cache: KinolightsCache = None, pool: BrowserPool = None,
+              workers: int = DEFAULT_ENRICH_WORKERS, journal: CrawlJournal = None,
+              profile: str = PROFILE_DEFAULT):
+    """플랫폼 하나만 크롤링합니다 (crawl_all_ott의 단일 플랫폼 버전)."""
+    return crawl_all_ott({platform: url}, cache=cache, pool=pool, workers=workers,
+                         journal=journal, profile=profile)
 
 # ===================================================================
 # 5. 메인
 # ===================================================================
 if __name__ == "__main__":
-    all_data = []
-    for platform, url in OTT_URLS.items():
-        result = crawl_ott(platform, url)
-        all_data.extend(result)
+    parser = argparse.ArgumentParser(description="OTT 랭킹 크롤링")
+    parser.add_argument('--workers', type=int, default=DEFAULT_ENRICH_WORKERS,
+                        help=f"상세 정보를 동시에 수집할 브라우저 수 (기본값: {DEFAULT_ENRICH_WORKERS})")
+    parser.add_argument('--browser-profile', choices=BROWSER_PROFILES, default=PROFILE_DEFAULT,
+                        help="Chrome 프로필 (lean = headless + 이미지/폰트/분석 스크립트 차단)")
+    parser.add_argument('--rate-limit', action='append', default=[], metavar='HOST=RATE[:BURST]',
+                        help="호스트별 초당 요청 수/버스트 (예: kinolights.com=2:4, 여러 번 지정 가능)")
+    parser.add_argument('--resume', action='store_true',
+                        help=f"중단된 실행을 '{JOURNAL_FILE}'에 기록된 항목부터 이어서 진행")
+    parser.add_argument('--csv', action='store_true',
+                        help=f"'{OTT_DATASET}'와 함께 ott_crawling.csv도 저장")
+    args = parser.parse_args()
+    try:
+        configure_limits(args.rate_limit)
+    except ValueError as e:
+        parser.error(str(e))
+    workers = max(1, args.workers)
+
+    journal = CrawlJournal(JOURNAL_FILE, JOURNAL_KEYS)
+    if args.resume:
+        print(f"⏩ 저널 '{JOURNAL_FILE}'에서 {journal.load()}건을 불러와 이어서 실행합니다.")
+    else:
+        journal.clear()
+
+    with KinolightsCache() as cache, BrowserPool(size=workers, profile=args.browser_profile) as pool:
+        all_data = crawl_all_ott(OTT_URLS, cache=cache, pool=pool, workers=workers,
+                                 journal=journal)
+        print(f"📦 캐시 적중 {cache.hits}건, 빈 결과 적중 {cache.negative_hits}건, 신규 수집 {cache.misses}건")
+    DEFAULT_LIMITER.print_report()
 
     if all_data:
+        # 랭킹 이력 누적 (순위 변동은 직전 기록과 비교해 계산)
+        with RankHistory() as history:
+            print(f"📈 랭킹 이력 {history.record(all_data)}건 기록")
+            deltas = history.deltas()
+
         df = pd.DataFrame(all_data)
-        out_file = "ott_crawling.csv"
-        df.to_csv(out_file, index=False, encoding="utf-8-sig")
-        print(f"\n🎉 OTT 크롤링 완료! 총 {len(df)}건 저장됨. 파일명: {out_file}")
+        # record()는 앞뒤 공백을 뺀 값으로 저장하므로 같은 방식으로 조회
+        df["rank_delta"] = [deltas.get((str(p).strip(), str(t).strip())) for p, t in zip(df["platform"], df["title"])]
+        df["captured_at"] = pd.Timestamp.now(tz="Asia/Seoul")
+        write_dataset(df, OTT_DATASET, OTT_SCHEMA, csv_path="ott_crawling.csv" if args.csv else None)
+        print(f"\n🎉 OTT 크롤링 완료! 총 {len(df)}건 저장됨. 파일명: {OTT_DATASET}")
+        # 정상 완료: 다음 실행은 처음부터
+        journal.clear()
     else:
         print("⚠️ OTT 크롤링 결과 없음")
@@ -1,19 +1,24 @@
+import argparse
 import pandas as pd
-import os
 
-TV_FILE = 'tv_crawling.csv'
-OTT_FILE = 'ott_crawling.csv'
-FINAL_FILE = 'final_crawling.csv'
+from dataset_io import (FINAL_DATASET, FINAL_SCHEMA, OTT_DATASET, OTT_SCHEMA, TV_DATASET, TV_SCHEMA,
+                        dataset_exists, read_dataset, write_dataset)
+from serving_dataset import SERVING_DATASET, write_serving_dataset
 
+TV_FILE = TV_DATASET
+OTT_FILE = OTT_DATASET
+FINAL_FILE = FINAL_DATASET
+FINAL_CSV_FILE = 'final_crawling.csv'
 
-def combine_data_files():
+
+def combine_data_files(export_csv: bool = False):
     print("====================================")
 
     # ============================
     # 1) TV 데이터 로드
     # ============================
-    if os.path.exists(TV_FILE):
-        df_tv = pd.read_csv(TV_FILE, encoding='utf-8-sig')
+    if dataset_exists(TV_FILE):
+        df_tv = read_dataset(TV_FILE, TV_SCHEMA)
         df_tv['source'] = 'TV'
         df_tv['platform'] = 'Cable'
         df_tv['rank'] = ''
@@ -32,8 +37,8 @@ def combine_data_files():
     # ============================
     # 2) OTT 데이터 로드
     # ============================
-    if os.path.exists(OTT_FILE):
-        df_ott = pd.read_csv(OTT_FILE, encoding='utf-8-sig')
+    if dataset_exists(OTT_FILE):
+        df_ott = read_dataset(OTT_FILE, OTT_SCHEMA)
         df_ott['source'] = 'OTT'
         df_ott['channel'] = ''
         df_ott['broadcast_date'] = ''
@@ -50,40 +55,45 @@ def combine_data_files():
         df_ott = pd.DataFrame()
 
     # ============================
-    # 3) 최종 컬럼 구조
+    # 3) 최종 컬럼 구조 (dataset_io.FINAL_SCHEMA)
     # ============================
-    final_columns = [
-        'source', 'platform', 'channel',
-        'broadcast_date', 'broadcast_time',
-        'title', 'plot', 'genre', 'cast', 'director',
-        'poster_url', 'age_rating', 'runtime',
-        'rank', 'rank_change',
-    ]
+    final_columns = FINAL_SCHEMA.names
 
     # ============================
     # 4) 누락 컬럼 보완
     # ============================
     for col in final_columns:
         if col not in df_tv.columns:
-            df_tv[col] = ''
+            df_tv[col] = None
         if col not in df_ott.columns:
-            df_ott[col] = ''
+            df_ott[col] = None
 
     # ============================
     # 5) 통합
     # ============================
     df_final = pd.concat([
-        df_tv[final_columns],
-        df_ott[final_columns]
+        df_tv[final_columns].astype(object),
+        df_ott[final_columns].astype(object)
     ], ignore_index=True)
 
     # ============================
-    # 6) 저장
+    # 6) 저장 (스키마에 맞춘 Parquet, CSV는 선택)
     # ============================
-    df_final.to_csv(FINAL_FILE, index=False, encoding='utf-8-sig')
+    df_final = write_dataset(df_final, FINAL_FILE, FINAL_SCHEMA, csv_path=FINAL_CSV_FILE if export_csv else None)
 
     print(f"\n🎉 합본 생성 완료! 총 {len(df_final)}건 → '{FINAL_FILE}' 저장")
 
+    # ============================
+    # 7) 서빙 데이터셋 (앱이 변환 없이 읽는 화면용 데이터)
+    # ============================
+    df_serving = write_serving_dataset(df_final, SERVING_DATASET)
+    dropped = len(df_final) - len(df_serving)
+    print(f"📺 서빙 데이터셋 생성 완료! {len(df_serving)}건 → '{SERVING_DATASET}' 저장"
+          + (f" (날짜 해석 불가 {dropped}건 제외)" if dropped else ""))
+
 
 if __name__ == "__main__":
-    combine_data_files()
+    parser = argparse.ArgumentParser(description="TV/OTT 데이터 합본 생성")
+    parser.add_argument('--csv', action='store_true', help=f"'{FINAL_FILE}'와 함께 {FINAL_CSV_FILE}도 저장")
+    args = parser.parse_args()
+    combine_data_files(export_csv=args.csv)
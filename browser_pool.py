@@ -0,0 +1,376 @@
+# browser_pool.py (TV/OTT 크롤러 공용 Chrome 세션 풀)
+#
+# 사용 예)
+#   with BrowserPool(size=2) as pool:
+#       with pool.lease() as driver:
+#           driver.get("https://m.kinolights.com/search")
+#
+# 브라우저 프로필
+#   - default: 기존 설정 (이미지/폰트/외부 스크립트 모두 로드)
+#   - lean   : headless + eager 로딩 + 이미지/미디어/폰트/분석 스크립트 차단
+#              (포스터 URL은 src 속성, 본문은 DOM에서 읽으므로 화면 렌더링이 필요 없음)
+#
+# 프로필 비교 벤치마크 (default는 예전처럼 창을 띄운 Chrome, lean은 headless)
+#   python browser_pool.py https://m.kinolights.com/ranking/netflix --rounds 3
+#   python browser_pool.py ... --headless-baseline   # 화면이 없는 서버: default도 headless로 비교
+
+import argparse
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+# =================================================================
+# 1. 기본 설정
+# =================================================================
+# ChromeDriverManager().install() 결과(드라이버 경로)를 저장해 두는 파일
+DRIVER_PATH_CACHE = '.chromedriver_path.json'
+# 저장된 경로를 다시 확인(온라인 조회)하기까지의 기간
+DRIVER_PATH_MAX_AGE = 7 * 24 * 60 * 60
+
+DEFAULT_POOL_SIZE = 1
+DEFAULT_MAX_USES = 50
+
+PROFILE_DEFAULT = 'default'
+PROFILE_LEAN = 'lean'
+BROWSER_PROFILES = (PROFILE_DEFAULT, PROFILE_LEAN)
+
+# lean 프로필에서 요청 자체를 막는 URL 패턴 (CDP Network.setBlockedURLs, * 와일드카드)
+LEAN_BLOCKED_URLS = [
+    # 이미지 / 미디어
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.mp4', '*.webm', '*.m3u8', '*.ts', '*.mp3',
+    # 웹 폰트
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # 분석 / 광고
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*facebook.net*', '*connect.facebook.com*',
+    '*analytics.tiktok.com*', '*wcs.naver.net*', '*t1.daumcdn.net/kas*',
+    '*hotjar.com*', '*clarity.ms*', '*amplitude.com*', '*branch.io*',
+]
+
+_driver_path_lock = threading.Lock()
+_driver_path = None
+
+
+# =================================================================
+# 2. 드라이버 경로 / 옵션
+# =================================================================
+def resolve_driver_path() -> str:
+    """chromedriver 경로를 반환합니다. 저장된 경로가 유효하면 네트워크 조회 없이 재사용합니다."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+
+        try:
+            with open(DRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            path = saved.get('path', '')
+            fresh = time.time() - saved.get('resolved_at', 0) < DRIVER_PATH_MAX_AGE
+            if path and os.path.exists(path) and fresh:
+                _driver_path = path
+                return path
+        except (OSError, json.JSONDecodeError, AttributeError):
+            saved = {}
+
+        try:
+            path = ChromeDriverManager().install()
+        except Exception:
+            # 오프라인 등으로 조회 실패 시, 기간이 지났더라도 남아있는 경로를 사용
+            path = saved.get('path', '') if isinstance(saved, dict) else ''
+            if not path or not os.path.exists(path):
+                raise
+
+        # pipeline.py로 TV/OTT를 동시에 실행하면 두 프로세스가 함께 쓰므로, 프로세스별 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{DRIVER_PATH_CACHE}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'path': path, 'resolved_at': time.time()}, f)
+            os.replace(tmp_path, DRIVER_PATH_CACHE)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+        _driver_path = path
+        return path
+
+
+def build_chrome_options(headless: bool = True, profile: str = PROFILE_DEFAULT) -> webdriver.ChromeOptions:
+    options = webdriver.ChromeOptions()
+    if headless or profile == PROFILE_LEAN:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("window-size=1200,900")
+
+    if profile == PROFILE_LEAN:
+        # DOMContentLoaded까지만 기다림 (이미지/광고 등 부속 리소스를 기다리지 않음)
+        options.page_load_strategy = 'eager'
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--mute-audio")
+        options.add_argument("--disable-background-networking")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+    return options
+
+
+def apply_lean_blocking(driver):
+    """CDP로 이미지/미디어/폰트/분석 스크립트 요청을 네트워크 단계에서 차단합니다."""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+    except Exception as e:
+        print(f"  -> 리소스 차단 설정 실패 (기본 로딩으로 진행): {e}")
+
+
+def new_driver(headless: bool = True, profile: str = PROFILE_DEFAULT) -> webdriver.Chrome:
+    """풀을 거치지 않는 단독 Chrome 세션을 생성합니다."""
+    if profile not in BROWSER_PROFILES:
+        raise ValueError(f"알 수 없는 브라우저 프로필: {profile}")
+    driver = webdriver.Chrome(service=Service(resolve_driver_path()),
+                              options=build_chrome_options(headless, profile))
+    if profile == PROFILE_LEAN:
+        apply_lean_blocking(driver)
+    return driver
+
+
+def _is_alive(driver) -> bool:
+    try:
+        driver.current_window_handle
+        return True
+    except Exception:
+        return False
+
+
+def _quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+# =================================================================
+# 3. 세션 풀
+# =================================================================
+class BrowserPool:
+    """
+    미리 띄워둔 Chrome 세션을 빌려주고 돌려받는 풀.
+    - 세션은 max_uses 회 사용 후 또는 비정상 종료(크래시) 시 새 세션으로 교체됩니다.
+    - shutdown()(또는 with 블록 종료, 프로그램 종료) 시 모든 세션을 닫습니다.
+    """
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, max_uses: int = DEFAULT_MAX_USES,
+                 headless: bool = True, profile: str = PROFILE_DEFAULT):
+        if profile not in BROWSER_PROFILES:
+            raise ValueError(f"알 수 없는 브라우저 프로필: {profile}")
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.headless = headless
+        self.profile = profile
+        self.created = 0
+        self.recycled = 0
+        self._idle = queue.LifoQueue()
+        self._uses = {}
+        self._all = set()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        atexit.register(self.shutdown)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def _spawn(self):
+        driver = new_driver(self.headless, self.profile)
+        with self._lock:
+            self._uses[id(driver)] = 0
+            self._all.add(driver)
+            self.created += 1
+        return driver
+
+    def _retire(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self._all.discard(driver)
+            self.recycled += 1
+        _quit_quietly(driver)
+
+    def warm_up(self, count: int = None):
+        """세션을 미리 띄워 둡니다 (기본값: 풀 크기만큼)."""
+        count = self.size if count is None else min(count, self.size)
+        while len(self._all) < count:
+            self._idle.put(self._spawn())
+
+    def _acquire(self):
+        while True:
+            if self._closed:
+                raise RuntimeError("BrowserPool이 이미 종료되었습니다.")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                can_spawn = len(self._all) + self._pending < self.size
+                if can_spawn:
+                    # 생성 중인 자리를 예약해 동시에 size를 넘지 않도록 합니다.
+                    self._pending += 1
+            if can_spawn:
+                try:
+                    return self._spawn()
+                finally:
+                    with self._lock:
+                        self._pending -= 1
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _release(self, driver, failed: bool):
+        with self._lock:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            uses = self._uses[id(driver)]
+
+        if self._closed or failed or uses >= self.max_uses or not _is_alive(driver):
+            self._retire(driver)
+            return
+
+        # 다음 사용자를 위해 탭을 하나만 남겨 둡니다.
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+        except Exception:
+            self._retire(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def lease(self):
+        """세션을 하나 빌립니다. 블록 안에서 예외가 나면 해당 세션은 폐기됩니다."""
+        driver = self._acquire()
+        failed = False
+        try:
+            yield driver
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._release(driver, failed)
+
+    def shutdown(self):
+        """모든 세션을 닫습니다. 여러 번 호출해도 안전합니다."""
+        if self._closed:
+            return
+        self._closed = True
+        with self._lock:
+            drivers = list(self._all)
+            self._all.clear()
+        for driver in drivers:
+            _quit_quietly(driver)
+        try:
+            atexit.unregister(self.shutdown)
+        except Exception:
+            pass
+
+
+# =================================================================
+# 4. 프로필 비교 벤치마크
+# =================================================================
+# 페이지가 실제로 받은 리소스 수/용량
+_RESOURCE_STATS_SCRIPT = """
+var entries = performance.getEntriesByType('resource');
+var bytes = 0;
+entries.forEach(function (e) { bytes += e.transferSize || 0; });
+return [entries.length, bytes];
+"""
+
+
+def _page_metrics(driver) -> dict:
+    metrics = {}
+    try:
+        raw = driver.execute_cdp_cmd('Performance.getMetrics', {}).get('metrics', [])
+        metrics = {m['name']: m['value'] for m in raw}
+    except Exception:
+        pass
+    try:
+        count, transferred = driver.execute_script(_RESOURCE_STATS_SCRIPT)
+    except Exception:
+        count, transferred = 0, 0
+    return {
+        'js_heap_mb': metrics.get('JSHeapUsedSize', 0) / (1024 * 1024),
+        'nodes': int(metrics.get('Nodes', 0)),
+        'resources': int(count),
+        'transferred_kb': transferred / 1024,
+    }
+
+
+def benchmark_profiles(urls, rounds: int = 3, profiles=BROWSER_PROFILES, baseline_headless: bool = False) -> dict:
+    """
+    프로필별로 세션을 하나 띄워 urls를 rounds회 로드하고 평균 지표를 반환합니다.
+    default 프로필은 기존 크롤러처럼 창을 띄워 실행합니다 (baseline_headless=True면 headless).
+    반환값: {프로필: {'headless', 'load_sec', 'js_heap_mb', 'nodes', 'resources', 'transferred_kb'}}
+    """
+    results = {}
+    for profile in profiles:
+        headless = baseline_headless if profile == PROFILE_DEFAULT else True
+        driver = new_driver(headless=headless, profile=profile)
+        try:
+            driver.execute_cdp_cmd('Performance.enable', {})
+        except Exception:
+            pass
+        samples = []
+        try:
+            for _ in range(rounds):
+                for url in urls:
+                    started = time.perf_counter()
+                    driver.get(url)
+                    sample = {'load_sec': time.perf_counter() - started}
+                    sample.update(_page_metrics(driver))
+                    samples.append(sample)
+        finally:
+            _quit_quietly(driver)
+        averages = {key: sum(s[key] for s in samples) / len(samples) for key in samples[0]} if samples else {}
+        results[profile] = {'headless': headless, **averages}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="브라우저 프로필(default/lean) 페이지 로딩 비교")
+    parser.add_argument('urls', nargs='+', help="로드할 페이지 URL")
+    parser.add_argument('--rounds', type=int, default=3, help="URL별 반복 횟수 (기본값: 3)")
+    parser.add_argument('--headless-baseline', action='store_true',
+                        help="default 프로필도 headless로 실행 (화면이 없는 환경용, 기존 창 모드와는 다른 기준)")
+    args = parser.parse_args()
+
+    results = benchmark_profiles(args.urls, rounds=max(1, args.rounds), baseline_headless=args.headless_baseline)
+    labels = {profile: f"{profile}({'headless' if r['headless'] else '창'})" for profile, r in results.items()}
+    print(f"{'프로필':<18} {'로딩(초)':>9} {'JS 힙(MB)':>10} {'DOM 노드':>9} {'리소스':>7} {'전송(KB)':>10}")
+    for profile, r in results.items():
+        if 'load_sec' not in r:
+            continue
+        print(f"{labels[profile]:<18} {r['load_sec']:>9.2f} {r['js_heap_mb']:>10.1f} {r['nodes']:>9.0f} "
+              f"{r['resources']:>7.0f} {r['transferred_kb']:>10.0f}")
+    base, lean = results.get(PROFILE_DEFAULT), results.get(PROFILE_LEAN)
+    if base and lean and base.get('load_sec', 0) > 0 and 'load_sec' in lean:
+        print(f"\n⚡ {labels[PROFILE_LEAN]} vs {labels[PROFILE_DEFAULT]}: "
+              f"로딩 {base['load_sec'] / max(lean['load_sec'], 1e-9):.1f}배, "
+              f"JS 힙 {base['js_heap_mb'] - lean['js_heap_mb']:.1f}MB 감소")
@@ -0,0 +1,69 @@
+# crawl_journal.py (완료된 항목을 한 줄씩 남기는 추가 전용 저널: 중단 후 --resume 용)
+#
+# - 행이 만들어질 때마다 JSON 한 줄로 기록하고 바로 flush/fsync 합니다.
+# - 각 행은 key_fields(예: platform+rank, channel+broadcast_date+broadcast_time)로 구분합니다.
+# - 기록 도중 프로그램이 죽어 마지막 줄이 잘려도, 읽을 때 그 줄만 건너뜁니다.
+# - 실행이 정상적으로 끝나 최종 CSV를 저장하면 clear()로 지웁니다.
+
+import json
+import os
+import threading
+
+
+class CrawlJournal:
+    def __init__(self, path: str, key_fields):
+        self.path = path
+        self.key_fields = tuple(key_fields)
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def key_of(self, row: dict) -> tuple:
+        return tuple(str(row.get(field, '')) for field in self.key_fields)
+
+    def load(self) -> int:
+        """기존 저널을 읽어 옵니다 (같은 키는 나중 기록 우선). 읽은 항목 수를 반환합니다."""
+        self._rows = {}
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 기록 중 중단된 마지막 줄
+                self._rows[self.key_of(row)] = row
+        return len(self._rows)
+
+    def get(self, row: dict):
+        """row와 같은 키로 기록된 행을 반환합니다 (없으면 None)."""
+        return self._rows.get(self.key_of(row))
+
+    def __contains__(self, row: dict) -> bool:
+        return self.key_of(row) in self._rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def rows(self):
+        return list(self._rows.values())
+
+    def append(self, rows):
+        """완료된 행(들)을 기록하고 디스크에 바로 반영합니다."""
+        if isinstance(rows, dict):
+            rows = [rows]
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+                self._rows[self.key_of(row)] = row
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self):
+        """저널을 비웁니다 (새로 시작하거나 정상 완료 후)."""
+        with self._lock:
+            self._rows = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -0,0 +1,242 @@
+# dataset_cache.py (앱용 데이터셋 캐시: 파일이 바뀌면 백그라운드에서 다시 읽어 교체)
+#
+# @st.cache_data로 감싼 load_data는 파일이 바뀌어도 앱을 재시작하기 전까지 예전 데이터를 보여줬습니다.
+# 이 캐시는 파일 식별값(mtime, 크기, 내용 해시)으로 새 파일을 알아채고,
+# 백그라운드 스레드에서 새 DataFrame을 다 만든 뒤 한 번에 교체합니다.
+# - 읽는 쪽(get)은 항상 완성된 (frame, 파생 데이터) 묶음만 받습니다.
+# - 다시 읽기는 프로세스 전체에서 한 번에 하나만 돌고, 같은 파일을 두 번 읽지 않습니다.
+# - mtime/크기가 바뀌었어도 내용 해시가 같으면 다시 읽지 않습니다.
+# - register()로 등록한 파생 데이터(검색 색인 등)도 같은 스레드에서 만들어 함께 교체합니다.
+#
+# 사용 예)
+#   cache = DatasetCache(['serving_dataset.parquet', 'final_crawling.parquet'], loader)
+#   cache.start_watcher()          # 2초마다 파일 확인 (선택)
+#   df = cache.get()
+
+import hashlib
+import os
+import threading
+import time
+
+import pandas as pd
+
+# =================================================================
+# 1. 기본 설정
+# =================================================================
+DEFAULT_POLL_SECONDS = 2.0
+_HASH_CHUNK = 1024 * 1024
+
+
+def file_identity(path: str, previous=None):
+    """
+    (mtime_ns, size, sha256 앞 16자리). 파일이 없으면 None.
+    previous와 mtime/크기가 같으면 해시를 다시 계산하지 않습니다.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if previous is not None and previous[:2] == (st.st_mtime_ns, st.st_size):
+        return previous
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, digest.hexdigest()[:16]
+
+
+# =================================================================
+# 2. 캐시
+# =================================================================
+class _Snapshot:
+    """한 번에 교체되는 묶음: 경로, 파일 식별값, DataFrame, 파생 데이터"""
+
+    def __init__(self, path=None, identity=None, frame=None, artifacts=None):
+        self.path = path
+        self.identity = identity
+        self.frame = frame if frame is not None else pd.DataFrame()
+        self.artifacts = artifacts or {}
+
+
+class DatasetCache:
+    """
+    paths 중 처음으로 존재하는 파일을 지켜보며 loader()로 읽은 DataFrame을 보관합니다.
+    loader는 인자 없이 DataFrame을 반환하는 함수입니다.
+    """
+
+    def __init__(self, paths, loader, poll_seconds: float = DEFAULT_POLL_SECONDS):
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.loader = loader
+        self.poll_seconds = poll_seconds
+        self._builders = {}
+        self._snapshot = _Snapshot()
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()  # 다시 읽기는 한 번에 하나만
+        self._loaded_once = threading.Event()
+        self._last_check = 0.0
+        self._failed = None  # 읽기에 실패한 파일 식별값 (같은 파일로 재시도하지 않음)
+        self._watcher = None
+        self._stop = threading.Event()
+
+        self.version = 0
+        self.reloads = 0
+        self.skipped = 0
+        self.errors = 0
+        self.last_error = ''
+        self.last_reload_seconds = 0.0
+        self.total_reload_seconds = 0.0
+        self.last_loaded_at = None
+
+    # -------------------------------------------------------------
+    # 등록 / 조회
+    # -------------------------------------------------------------
+    def register(self, name: str, builder):
+        """builder(frame)로 만든 파생 데이터를 name으로 함께 보관합니다 (다음 로드부터, 이미 로드됐으면 바로)."""
+        with self._lock:
+            self._builders[name] = builder
+            snapshot = self._snapshot
+        if not self._loaded_once.is_set():
+            return
+        # 다른 세션이 읽고 있는 묶음은 고치지 않고, 파생 데이터를 더한 새 묶음으로 교체
+        while name not in snapshot.artifacts:
+            value = builder(snapshot.frame)
+            with self._lock:
+                current = self._snapshot
+                if current is snapshot:
+                    artifacts = {**snapshot.artifacts, name: value}
+                    self._snapshot = _Snapshot(snapshot.path, snapshot.identity, snapshot.frame, artifacts)
+                    return
+            snapshot = current  # 만드는 사이 다시 읽혔으면 새 묶음 기준으로 다시 확인
+
+    def get(self) -> pd.DataFrame:
+        """현재 DataFrame. 처음 한 번은 직접 읽고, 이후에는 바뀐 파일을 백그라운드에서 다시 읽습니다."""
+        if not self._loaded_once.is_set():
+            with self._reload_lock:
+                # 여러 세션이 동시에 처음 들어와도 한 번만 읽음
+                if not self._loaded_once.is_set():
+                    self._reload()
+        else:
+            self.check()
+        return self._snapshot.frame
+
+    def artifact(self, name: str):
+        """현재 DataFrame과 짝이 맞는 파생 데이터 (없으면 None)"""
+        return self._snapshot.artifacts.get(name)
+
+    def snapshot(self):
+        """(frame, artifacts)를 같은 시점 것으로 함께 반환합니다."""
+        snapshot = self._snapshot
+        return snapshot.frame, snapshot.artifacts
+
+    # -------------------------------------------------------------
+    # 변경 감지 / 다시 읽기
+    # -------------------------------------------------------------
+    def _current_file(self):
+        previous = self._snapshot
+        for path in self.paths:
+            if os.path.exists(path):
+                return path, file_identity(path, previous.identity if previous.path == path else None)
+        return None, None
+
+    def check(self, force: bool = False) -> bool:
+        """파일이 바뀌었으면 백그라운드 다시 읽기를 시작합니다. 시작했으면 True."""
+        now = time.monotonic()
+        if not force and now - self._last_check < self.poll_seconds:
+            return False
+        self._last_check = now
+        path, identity = self._current_file()
+        snapshot = self._snapshot
+        if (path, identity) in ((snapshot.path, snapshot.identity), self._failed):
+            return False
+        if identity is not None and snapshot.identity is not None and identity[2] == snapshot.identity[2]:
+            # 내용은 같고 mtime만 바뀜 (같은 데이터로 다시 저장)
+            with self._lock:
+                self._snapshot = _Snapshot(path, identity, snapshot.frame, snapshot.artifacts)
+                self.skipped += 1
+            return False
+        if not self._reload_lock.acquire(blocking=False):
+            return False  # 이미 다시 읽는 중
+
+        def run():
+            try:
+                self._reload()
+            finally:
+                self._reload_lock.release()
+
+        threading.Thread(target=run, name='dataset-reload', daemon=True).start()
+        return True
+
+    def reload(self):
+        """지금 스레드에서 다시 읽습니다 (다른 스레드가 읽는 중이면 끝나기를 기다린 뒤)."""
+        with self._reload_lock:
+            self._reload()
+
+    def _reload(self):
+        # _reload_lock을 잡은 상태에서만 호출
+        started = time.time()
+        path, identity = None, None
+        try:
+            path, identity = self._current_file()
+            frame = self.loader() if path is not None else pd.DataFrame()
+            with self._lock:
+                builders = dict(self._builders)
+            artifacts = {name: builder(frame) for name, builder in builders.items()}
+            elapsed = time.time() - started
+            with self._lock:
+                # 완성된 묶음을 한 번에 교체
+                self._snapshot = _Snapshot(path, identity, frame, artifacts)
+                self.version += 1
+                self.reloads += 1
+                self.last_reload_seconds = elapsed
+                self.total_reload_seconds += elapsed
+                self.last_loaded_at = time.time()
+                self.last_error = ''
+            print(f"🔄 데이터셋 로드: {path or '(없음)'} {len(frame)}건, {elapsed:.2f}초 (#{self.reloads})")
+        except Exception as e:
+            with self._lock:
+                self._failed = (path, identity)
+                self.errors += 1
+                self.last_error = str(e)
+            print(f"⚠️ 데이터셋 다시 읽기 실패 (이전 데이터 유지): {e}")
+        finally:
+            self._loaded_once.set()
+
+    # -------------------------------------------------------------
+    # 감시 스레드 / 통계
+    # -------------------------------------------------------------
+    def start_watcher(self):
+        """poll_seconds마다 파일을 확인하는 백그라운드 스레드를 시작합니다 (한 번만)."""
+        if self._watcher is not None:
+            return
+
+        def watch():
+            while not self._stop.wait(self.poll_seconds):
+                if self._loaded_once.is_set():
+                    self.check(force=True)
+
+        self._watcher = threading.Thread(target=watch, name='dataset-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = self._snapshot
+            return {
+                'path': snapshot.path or '',
+                'rows': len(snapshot.frame),
+                'version': self.version,
+                'reloads': self.reloads,
+                'skipped': self.skipped,
+                'errors': self.errors,
+                'last_error': self.last_error,
+                'last_reload_seconds': self.last_reload_seconds,
+                'total_reload_seconds': self.total_reload_seconds,
+                'last_loaded_at': self.last_loaded_at,
+                'reloading': self._reload_lock.locked(),
+                'artifacts': sorted(snapshot.artifacts),
+            }
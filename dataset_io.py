@@ -0,0 +1,216 @@
+# dataset_io.py (단계 간 데이터 주고받기: 스키마가 정해진 Parquet, CSV는 선택 출력)
+#
+# TV/OTT 크롤러 → 합본 → Streamlit 앱이 모두 이 모듈로 읽고 씁니다.
+# - 순위/순위 변동은 정수(Int32, 없으면 NA), 시각은 KST 타임존이 붙은 timestamp
+# - platform/channel/source 같은 반복 값은 dictionary(= pandas category)로 저장
+# - 문자열 컬럼의 빈 값은 '' 로 통일 (앱의 fillna('') 불필요)
+# - Parquet이 아직 없으면 같은 이름의 예전 CSV를 읽어 스키마에 맞춰 돌려줍니다 (이전 실행분 호환)
+#
+# 사용 예)
+#   python dataset_io.py final_crawling.parquet            # 스키마/건수 확인
+#   python dataset_io.py final_crawling.parquet --csv out.csv
+
+import argparse
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# =================================================================
+# 1. 파일 / 스키마
+# =================================================================
+TV_DATASET = 'tv_crawling.parquet'
+OTT_DATASET = 'ott_crawling.parquet'
+FINAL_DATASET = 'final_crawling.parquet'
+
+TIMEZONE = 'Asia/Seoul'
+_TIMESTAMP = pa.timestamp('s', tz=TIMEZONE)
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+_ENRICH_FIELDS = [
+    ('plot', pa.string()),
+    ('genre', pa.string()),
+    ('cast', pa.string()),
+    ('director', pa.string()),
+    ('poster_url', pa.string()),
+    ('age_rating', pa.string()),
+]
+
+TV_SCHEMA = pa.schema([
+    ('channel', _CATEGORY),
+    ('broadcast_date', pa.string()),
+    ('broadcast_time', pa.string()),
+    ('broadcast_at', _TIMESTAMP),
+    ('title', pa.string()),
+    *_ENRICH_FIELDS,
+    ('runtime_or_episode', pa.string()),
+])
+
+OTT_SCHEMA = pa.schema([
+    ('platform', _CATEGORY),
+    ('rank', pa.int32()),
+    ('rank_change', pa.string()),
+    ('rank_delta', pa.int32()),
+    ('title', pa.string()),
+    ('poster_image', pa.string()),
+    ('genre', pa.string()),
+    ('cast', pa.string()),
+    ('director', pa.string()),
+    ('synopsis', pa.string()),
+    ('age_rating', pa.string()),
+    ('running_time', pa.string()),
+    ('captured_at', _TIMESTAMP),
+])
+
+FINAL_SCHEMA = pa.schema([
+    ('source', _CATEGORY),
+    ('platform', _CATEGORY),
+    ('channel', _CATEGORY),
+    ('broadcast_date', pa.string()),
+    ('broadcast_time', pa.string()),
+    ('broadcast_at', _TIMESTAMP),
+    ('title', pa.string()),
+    *_ENRICH_FIELDS,
+    ('runtime', pa.string()),
+    ('rank', pa.int32()),
+    ('rank_change', pa.string()),
+    ('rank_delta', pa.int32()),
+    ('captured_at', _TIMESTAMP),
+])
+
+# 합본 + 화면용 파생 컬럼 (serving_dataset.py가 생성, 앱이 그대로 읽음)
+SERVING_SCHEMA = pa.schema([
+    *FINAL_SCHEMA,
+    ('full_time', pa.string()),
+    ('datetime', _TIMESTAMP),
+    ('time_slot', _CATEGORY),
+])
+
+SCHEMAS = {'tv': TV_SCHEMA, 'ott': OTT_SCHEMA, 'final': FINAL_SCHEMA, 'serving': SERVING_SCHEMA}
+
+
+# =================================================================
+# 2. 스키마 맞추기
+# =================================================================
+def _to_timestamp(values: pd.Series) -> pd.Series:
+    # 스키마가 초 단위이므로 그 아래는 버림
+    ts = pd.to_datetime(values, errors='coerce').dt.floor('s')
+    if getattr(ts.dt, 'tz', None) is None:
+        return ts.dt.tz_localize(TIMEZONE)
+    return ts.dt.tz_convert(TIMEZONE)
+
+
+def _to_int(values: pd.Series) -> pd.Series:
+    # '3', '3.0', 3.0, '' 를 모두 허용 ('+3' 같은 문자열은 숫자만 추출)
+    if not pd.api.types.is_numeric_dtype(values):
+        values = values.astype('string').str.extract(r'(-?\d+)', expand=False)
+    return pd.to_numeric(values, errors='coerce').round().astype('Int32')
+
+
+def conform(df: pd.DataFrame, schema: pa.Schema) -> pd.DataFrame:
+    """df를 schema 컬럼 순서/타입으로 맞춥니다. 없는 컬럼은 빈 값으로 채우고, 나머지 컬럼은 버립니다."""
+    out = {}
+    n = len(df)
+    for field in schema:
+        col = df[field.name] if field.name in df.columns else pd.Series([None] * n, index=df.index)
+        if pa.types.is_timestamp(field.type):
+            out[field.name] = _to_timestamp(col)
+        elif pa.types.is_integer(field.type):
+            out[field.name] = col if isinstance(col.dtype, pd.Int32Dtype) else _to_int(col)
+        elif pa.types.is_dictionary(field.type):
+            if isinstance(col.dtype, pd.CategoricalDtype) and not col.isna().any():
+                out[field.name] = col
+            else:
+                out[field.name] = col.astype(object).fillna('').astype(str).astype('category')
+        else:
+            out[field.name] = col.fillna('').astype(str)
+    return pd.DataFrame(out, index=df.index)
+
+
+def kst_timestamps(dates_iso: pd.Series, times: pd.Series) -> pd.Series:
+    """'YYYY-MM-DD' + 'HH:MM' 문자열을 KST 타임존이 붙은 시각으로 합칩니다 (해석 불가는 NaT)."""
+    combined = dates_iso.fillna('').astype(str) + ' ' + times.fillna('').astype(str)
+    ts = pd.to_datetime(combined, format='%Y-%m-%d %H:%M', errors='coerce')
+    return ts.dt.tz_localize(TIMEZONE)
+
+
+# =================================================================
+# 3. 읽기 / 쓰기
+# =================================================================
+def write_dataset(df: pd.DataFrame, path: str, schema: pa.Schema, csv_path: str = None,
+                  metadata: dict = None) -> pd.DataFrame:
+    """
+    스키마에 맞춘 Parquet을 저장합니다. 임시 파일에 쓴 뒤 교체하므로 읽는 쪽이 반쯤 쓴 파일을 보지 않습니다.
+    csv_path를 주면 같은 내용을 CSV로도 내보냅니다. metadata는 스키마 메타데이터(문자열)로 함께 저장됩니다.
+    저장한 DataFrame을 반환합니다.
+    """
+    typed = conform(df, schema)
+    table = pa.Table.from_pandas(typed, schema=schema, preserve_index=False)
+    if metadata:
+        merged = dict(table.schema.metadata or {})
+        merged.update({str(k).encode(): str(v).encode() for k, v in metadata.items()})
+        table = table.replace_schema_metadata(merged)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+    if csv_path:
+        typed.to_csv(csv_path, index=False, encoding='utf-8-sig')
+    return typed
+
+
+def read_schema_metadata(path: str) -> dict:
+    """write_dataset(metadata=...)로 저장한 값을 읽습니다 (pandas 내부 메타데이터 제외)."""
+    raw = pq.read_schema(path).metadata or {}
+    return {k.decode(): v.decode() for k, v in raw.items() if k != b'pandas'}
+
+
+def legacy_csv_path(path: str) -> str:
+    return os.path.splitext(path)[0] + '.csv'
+
+
+def dataset_exists(path: str) -> bool:
+    return os.path.exists(path) or os.path.exists(legacy_csv_path(path))
+
+
+def read_dataset(path: str, schema: pa.Schema = None, columns=None) -> pd.DataFrame:
+    """
+    Parquet을 읽어 pandas 타입(category / Int32 / datetime64[KST] / str)으로 돌려줍니다.
+    Parquet이 없고 같은 이름의 .csv가 있으면 그것을 읽어 schema에 맞춥니다. 둘 다 없으면 빈 DataFrame.
+    """
+    if os.path.exists(path):
+        table = pq.read_table(path, columns=columns)
+        df = table.to_pandas(types_mapper={pa.int32(): pd.Int32Dtype()}.get)
+        if schema is not None:
+            df = conform(df, schema if columns is None else pa.schema([schema.field(c) for c in columns]))
+        return df
+
+    csv_path = legacy_csv_path(path)
+    if os.path.exists(csv_path):
+        df = pd.read_csv(csv_path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+        if schema is not None:
+            df = conform(df, schema)
+        return df[columns] if columns else df
+    return pd.DataFrame()
+
+
+# =================================================================
+# 4. CLI (스키마 확인 / CSV 내보내기)
+# =================================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parquet 데이터셋 확인/CSV 내보내기")
+    parser.add_argument('path', help="Parquet 파일")
+    parser.add_argument('--csv', help="CSV로 내보낼 경로")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"⚠️ 파일이 없습니다: {args.path}")
+    else:
+        meta = pq.read_metadata(args.path)
+        print(f"📦 {args.path}: {meta.num_rows}건, {os.path.getsize(args.path) / 1024:.1f}KB")
+        print(pq.read_schema(args.path).to_string(show_schema_metadata=False))
+        if args.csv:
+            read_dataset(args.path).to_csv(args.csv, index=False, encoding='utf-8-sig')
+            print(f"💾 CSV 내보내기 완료: {args.csv}")
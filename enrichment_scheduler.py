@@ -0,0 +1,112 @@
+# enrichment_scheduler.py (키노라이츠 상세 정보 동시 수집 스케줄러: TV/OTT 공용)
+#
+# - 작업 큐: (우선순위, 제목) 목록. 우선순위 값이 작을수록 먼저 처리합니다.
+#   (OTT는 랭킹 순위, TV는 방영 시각이 가까운 순)
+# - BrowserPool 세션 N개로 동시에 수집하고, 항목별 제한 시간을 넘기면 해당 세션을 강제 종료합니다.
+# - 캐시(kinolights_cache)에 있는 제목은 브라우저 없이 바로 처리합니다.
+# - 항목이 끝날 때마다 on_result 콜백을 호출하므로, 진행 중 결과를 바로 저장할 수 있습니다.
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_WORKERS = 3
+DEFAULT_ITEM_TIMEOUT = 60
+
+STATUS_CACHED = 'cached'
+STATUS_FETCHED = 'fetched'
+STATUS_TIMEOUT = 'timeout'
+STATUS_ERROR = 'error'
+# 실제로 끝난 결과 (저널에 남겨 --resume 때 재사용). 시간 초과/오류는 다음 실행에서 다시 수집합니다.
+COMPLETED_STATUSES = (STATUS_CACHED, STATUS_FETCHED)
+
+
+def run_enrichment(jobs, fetch, pool, default: dict, cache=None, workers: int = DEFAULT_WORKERS,
+                   item_timeout: float = DEFAULT_ITEM_TIMEOUT, on_result=None) -> dict:
+    """
+    jobs: [(우선순위, 제목), ...] — 같은 제목이 여러 번 있으면 가장 높은 우선순위 하나만 처리
+    fetch(driver, title) -> dict : 빌린 세션으로 상세 정보를 수집하는 함수
+    on_result(title, info, status): 항목이 끝날 때마다 (메인 스레드에서) 호출
+    반환값: {제목: 상세 정보}
+    """
+    best = {}
+    for priority, title in jobs:
+        if title and (title not in best or priority < best[title]):
+            best[title] = priority
+    queue = sorted(best, key=lambda t: (best[t], t))
+
+    results = {}
+    counts = {STATUS_CACHED: 0, STATUS_FETCHED: 0, STATUS_TIMEOUT: 0, STATUS_ERROR: 0}
+    total = len(queue)
+
+    def finish(title, info, status):
+        results[title] = info
+        counts[status] += 1
+        if on_result is not None:
+            on_result(title, info, status)
+        print(f"[{len(results)}/{total}] '{title}' {status}")
+
+    # 1) 캐시 적중분은 브라우저 없이 바로 처리
+    pending = []
+    for title in queue:
+        cached = cache.get(title, default) if cache is not None else None
+        if cached is not None:
+            finish(title, cached, STATUS_CACHED)
+        else:
+            pending.append(title)
+
+    # 2) 나머지는 우선순위 순서대로 세션 N개에서 동시에 수집
+    active = {}  # 제목 -> (driver, 시작 시각)
+    active_lock = threading.Lock()
+
+    def task(title):
+        with pool.lease() as driver:
+            with active_lock:
+                active[title] = (driver, time.time())
+            try:
+                return fetch(driver, title)
+            finally:
+                with active_lock:
+                    active.pop(title, None)
+
+    started = time.time()
+    if pending:
+        print(f"\n🚀 상세 정보 수집 {len(pending)}건 (동시 {workers}개, 캐시 {counts[STATUS_CACHED]}건)")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(task, title): title for title in pending}
+        timed_out = set()
+        remaining = set(futures)
+        while remaining:
+            done, remaining = wait(remaining, timeout=1, return_when=FIRST_COMPLETED)
+            for future in done:
+                title = futures[future]
+                if title in timed_out:
+                    continue
+                try:
+                    info = future.result()
+                    if cache is not None:
+                        cache.put(title, info, default)
+                    finish(title, info, STATUS_FETCHED)
+                except Exception as e:
+                    print(f"  -> '{title}' 수집 오류: {e}")
+                    finish(title, dict(default), STATUS_ERROR)
+
+            # 제한 시간을 넘긴 항목: 세션을 종료해 진행 중인 WebDriver 호출을 끊습니다.
+            now = time.time()
+            with active_lock:
+                overdue = [(t, d) for t, (d, since) in active.items()
+                           if now - since > item_timeout and t not in timed_out]
+            for title, driver in overdue:
+                timed_out.add(title)
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+                finish(title, dict(default), STATUS_TIMEOUT)
+
+    elapsed = time.time() - started
+    print(f"📊 상세 정보: 캐시 {counts[STATUS_CACHED]}, 수집 {counts[STATUS_FETCHED]}, "
+          f"시간 초과 {counts[STATUS_TIMEOUT]}, 오류 {counts[STATUS_ERROR]} ({elapsed:.1f}초)")
+    return results
+
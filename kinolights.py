@@ -0,0 +1,70 @@
+# kinolights.py (TV/OTT 크롤러 공용 키노라이츠 페이지 이동/대기 함수)
+#
+# 두 크롤러가 같은 검색 페이지, 같은 상세 페이지 판단 기준을 쓰도록 한 곳에 모았습니다.
+# 필드 추출(줄거리, 출연진 등)은 크롤러마다 저장하는 필드가 달라 각 스크립트에 남겨 둡니다.
+#
+# 사용 예)
+#   from kinolights import KINOLIGHTS_SEARCH_URL, open_known_detail_page, wait_for_detail_page
+#   if not open_known_detail_page(driver, title, cache):
+#       driver.get(KINOLIGHTS_SEARCH_URL)
+#       ...
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+from kinolights_cache import KinolightsCache
+from rate_limiter import throttle
+
+# =================================================================
+# 1. 기본 설정
+# =================================================================
+KINOLIGHTS_SEARCH_URL = "https://m.kinolights.com/search"
+
+# 상세 페이지가 로드되었는지 판단하는 요소
+DETAIL_READY_SELECTOR = "div.synopsis, .poster, span.item__title"
+
+
+# =================================================================
+# 2. 상세 페이지 이동 / 대기
+# =================================================================
+def wait_for_detail_page(driver, wait: WebDriverWait, previous_url: str) -> bool:
+    """검색 결과 클릭 후 주소가 바뀌고 상세 정보 요소가 나타날 때까지 기다립니다 (고정 대기 대신)."""
+    try:
+        wait.until(lambda d: d.current_url != previous_url
+                   and d.find_elements(By.CSS_SELECTOR, DETAIL_READY_SELECTOR))
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_synopsis_expanded(driver, before_text: str, timeout: float = 2) -> None:
+    """'더보기' 클릭 후 줄거리가 바뀌거나 버튼이 사라질 때까지만 기다립니다."""
+    def expanded(d):
+        if d.find_element(By.CSS_SELECTOR, "div.synopsis .text").text.strip() != before_text:
+            return True
+        return not any(b.is_displayed() for b in d.find_elements(By.CSS_SELECTOR, "button.more"))
+
+    try:
+        WebDriverWait(driver, timeout, ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+                      ).until(expanded)
+    except TimeoutException:
+        pass
+
+
+def open_known_detail_page(driver, title: str, url_index: KinolightsCache) -> bool:
+    """URL 색인에 있는 제목이면 상세 페이지로 바로 이동합니다. 열리지 않으면 색인에서 지우고 False."""
+    url = url_index.get_url(title) if url_index is not None else None
+    if not url:
+        return False
+    try:
+        throttle(url)
+        driver.get(url)
+        WebDriverWait(driver, 5).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, DETAIL_READY_SELECTOR))
+        )
+        return True
+    except TimeoutException:
+        url_index.drop_url(title)
+        return False
@@ -0,0 +1,323 @@
+# kinolights_cache.py (키노라이츠 상세 정보 영구 캐시: SQLite)
+#
+# 제목 → 상세 페이지 URL 색인도 함께 저장해, 이미 아는 제목은 검색 없이 바로 이동합니다.
+#
+# 사용 예)
+#   python kinolights_cache.py stats             # 캐시 현황
+#   python kinolights_cache.py show 눈물의 여왕    # 특정 제목 캐시 내용
+#   python kinolights_cache.py urls              # 제목 → 상세 페이지 URL 색인
+#   python kinolights_cache.py purge --expired   # 만료된 항목 삭제
+#   python kinolights_cache.py purge --all       # 전체 삭제
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+# =================================================================
+# 1. 기본 설정
+# =================================================================
+CACHE_FILE = 'kinolights_cache.sqlite3'
+
+DAY = 24 * 60 * 60
+
+# 필드별 유효기간(초). TV/OTT 스크립트의 필드명을 모두 포함합니다.
+FIELD_TTL = {
+    'plot': 30 * DAY,
+    'synopsis': 30 * DAY,
+    'genre': 90 * DAY,
+    'cast': 30 * DAY,
+    'director': 90 * DAY,
+    'age_rating': 90 * DAY,
+    'poster_url': 14 * DAY,
+    'poster_image': 14 * DAY,
+    # 방영 중인 드라마는 회차가 계속 늘어나므로 짧게 유지
+    'runtime_or_episode': 3 * DAY,
+    'running_time': 3 * DAY,
+}
+DEFAULT_TTL = 7 * DAY
+
+# 검색 타임아웃/검색 결과 없음 등 '빈 결과'의 유효기간
+NEGATIVE_TTL = 12 * 60 * 60
+
+
+# =================================================================
+# 2. 캐시 클래스
+# =================================================================
+class KinolightsCache:
+    """clean_title 결과를 키로 하는 키노라이츠 상세 정보 캐시"""
+
+    def __init__(self, path: str = CACHE_FILE):
+        self.path = path
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS fields (
+                title      TEXT NOT NULL,
+                field      TEXT NOT NULL,
+                value      TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (title, field)
+            );
+            CREATE TABLE IF NOT EXISTS negatives (
+                title      TEXT PRIMARY KEY,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS content_urls (
+                title      TEXT PRIMARY KEY,
+                url        TEXT NOT NULL,
+                source     TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------------------
+    # 조회 / 저장
+    # -------------------------------------------------------------
+    def get(self, title: str, default: dict, now: float = None):
+        """
+        캐시에서 상세 정보를 찾습니다.
+        - 모든 필드가 유효기간 안이면 그 값을,
+        - 유효한 '빈 결과' 기록이 있으면 default 사본을,
+        - 그 외에는 None(재수집 필요)을 반환합니다.
+        """
+        now = now if now is not None else time.time()
+        # 여러 수집 워커가 동시에 호출하므로 통계 카운터도 잠금 안에서 올림
+        with self._lock:
+            neg = self._conn.execute(
+                "SELECT fetched_at FROM negatives WHERE title = ?", (title,)
+            ).fetchone()
+            rows = self._conn.execute(
+                "SELECT field, value, fetched_at FROM fields WHERE title = ?", (title,)
+            ).fetchall()
+
+            if neg and now - neg[0] < NEGATIVE_TTL:
+                self.negative_hits += 1
+                return dict(default)
+
+            cached = {field: (value, fetched_at) for field, value, fetched_at in rows}
+            info = dict(default)
+            for field in default:
+                if field not in cached:
+                    self.misses += 1
+                    return None
+                value, fetched_at = cached[field]
+                if now - fetched_at >= FIELD_TTL.get(field, DEFAULT_TTL):
+                    self.misses += 1
+                    return None
+                info[field] = value
+
+            self.hits += 1
+            return info
+
+    def put(self, title: str, info: dict, default: dict, now: float = None):
+        """수집 결과를 저장합니다. default와 같으면(아무것도 못 찾음) 빈 결과로 기록합니다."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            if info == default:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO negatives (title, fetched_at) VALUES (?, ?)",
+                    (title, now)
+                )
+            else:
+                self._conn.execute("DELETE FROM negatives WHERE title = ?", (title,))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO fields (title, field, value, fetched_at) VALUES (?, ?, ?, ?)",
+                    [(title, field, str(value or ''), now) for field, value in info.items()]
+                )
+            self._conn.commit()
+
+    # -------------------------------------------------------------
+    # 제목 → 상세 페이지 URL 색인
+    # -------------------------------------------------------------
+    def get_url(self, title: str):
+        with self._lock:
+            row = self._conn.execute("SELECT url FROM content_urls WHERE title = ?", (title,)).fetchone()
+        return row[0] if row else None
+
+    def put_url(self, title: str, url: str, source: str = 'search'):
+        """source: 'search'(검색 결과 클릭) 또는 'ranking'(랭킹 목록 링크)"""
+        if not title or not url:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO content_urls (title, url, source, updated_at) VALUES (?, ?, ?, ?)",
+                (title, url, source, time.time())
+            )
+            self._conn.commit()
+
+    def drop_url(self, title: str):
+        """상세 페이지가 더 이상 열리지 않는 URL을 색인에서 제거합니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM content_urls WHERE title = ?", (title,))
+            self._conn.commit()
+
+    def url_entries(self, title: str = None):
+        query = "SELECT title, url, source, updated_at FROM content_urls"
+        params = ()
+        if title:
+            query += " WHERE title = ?"
+            params = (title,)
+        with self._lock:
+            return self._conn.execute(query + " ORDER BY title", params).fetchall()
+
+    # -------------------------------------------------------------
+    # 관리 (CLI용)
+    # -------------------------------------------------------------
+    def entries(self, title: str = None):
+        """제목별 저장 필드/수집 시각 목록을 반환합니다."""
+        query = "SELECT title, field, value, fetched_at FROM fields"
+        params = ()
+        if title:
+            query += " WHERE title = ?"
+            params = (title,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY title, field", params).fetchall()
+            neg_query = "SELECT title, fetched_at FROM negatives"
+            negs = self._conn.execute(neg_query + (" WHERE title = ?" if title else ""), params).fetchall()
+        return rows, negs
+
+    def stats(self, now: float = None) -> dict:
+        now = now if now is not None else time.time()
+        with self._lock:
+            titles = self._conn.execute("SELECT COUNT(DISTINCT title) FROM fields").fetchone()[0]
+            negatives = self._conn.execute("SELECT COUNT(*) FROM negatives").fetchone()[0]
+            negatives_live = self._conn.execute(
+                "SELECT COUNT(*) FROM negatives WHERE fetched_at > ?", (now - NEGATIVE_TTL,)
+            ).fetchone()[0]
+            rows = self._conn.execute("SELECT field, fetched_at FROM fields").fetchall()
+            urls = self._conn.execute("SELECT COUNT(*) FROM content_urls").fetchone()[0]
+        expired = sum(1 for field, fetched_at in rows if now - fetched_at >= FIELD_TTL.get(field, DEFAULT_TTL))
+        return {
+            'titles': titles,
+            'fields': len(rows),
+            'expired_fields': expired,
+            'negatives': negatives,
+            'negatives_live': negatives_live,
+            'urls': urls,
+        }
+
+    def purge(self, title: str = None, expired_only: bool = False, negative_only: bool = False,
+              urls: bool = False, now: float = None) -> int:
+        """조건에 맞는 항목을 삭제하고 삭제된 행 수를 반환합니다. (urls=True: URL 색인만 삭제)"""
+        now = now if now is not None else time.time()
+        removed = 0
+        with self._lock:
+            if urls:
+                where, params = ("WHERE title = ?", (title,)) if title else ("", ())
+                removed += self._conn.execute(f"DELETE FROM content_urls {where}", params).rowcount
+            elif expired_only:
+                title_filter, title_params = (" AND title = ?", (title,)) if title else ("", ())
+                cur = self._conn.execute(
+                    "DELETE FROM negatives WHERE fetched_at <= ?" + title_filter,
+                    (now - NEGATIVE_TTL, *title_params)
+                )
+                removed += cur.rowcount
+                if not negative_only:
+                    where, params = ("WHERE title = ?", (title,)) if title else ("", ())
+                    rows = self._conn.execute(f"SELECT title, field, fetched_at FROM fields {where}", params).fetchall()
+                    stale = [(t, f) for t, f, fetched_at in rows
+                             if now - fetched_at >= FIELD_TTL.get(f, DEFAULT_TTL)]
+                    self._conn.executemany("DELETE FROM fields WHERE title = ? AND field = ?", stale)
+                    removed += len(stale)
+            else:
+                where, params = ("WHERE title = ?", (title,)) if title else ("", ())
+                removed += self._conn.execute(f"DELETE FROM negatives {where}", params).rowcount
+                if not negative_only:
+                    removed += self._conn.execute(f"DELETE FROM fields {where}", params).rowcount
+            self._conn.commit()
+        return removed
+
+
+# =================================================================
+# 3. CLI
+# =================================================================
+def _format_ts(ts: float) -> str:
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(ts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="키노라이츠 상세 정보 캐시 조회/정리")
+    parser.add_argument('--db', default=CACHE_FILE, help=f"캐시 파일 경로 (기본값: {CACHE_FILE})")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('stats', help="캐시 현황 출력")
+
+    show = sub.add_parser('show', help="캐시 내용 출력")
+    show.add_argument('title', nargs='?', help="검색용 제목(clean_title 결과)")
+
+    purge = sub.add_parser('purge', help="캐시 항목 삭제")
+    purge.add_argument('--title', help="해당 제목만 삭제")
+    purge.add_argument('--expired', action='store_true', help="유효기간이 지난 항목만 삭제")
+    purge.add_argument('--negative', action='store_true', help="빈 결과 기록만 삭제")
+    purge.add_argument('--urls', action='store_true', help="상세 페이지 URL 색인 삭제 (--title과 함께 사용 가능)")
+    purge.add_argument('--all', action='store_true', help="전체 삭제 (URL 색인 제외)")
+
+    urls = sub.add_parser('urls', help="제목 → 상세 페이지 URL 색인 출력")
+    urls.add_argument('title', nargs='?', help="검색용 제목(clean_title 결과)")
+
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"⚠️ 캐시 파일이 없습니다: {args.db}")
+        return
+
+    with KinolightsCache(args.db) as cache:
+        if args.command == 'stats':
+            s = cache.stats()
+            print(f"📦 캐시 파일: {args.db}")
+            print(f"  - 제목 수: {s['titles']}개 (필드 {s['fields']}개, 만료 {s['expired_fields']}개)")
+            print(f"  - 빈 결과 기록: {s['negatives']}개 (유효 {s['negatives_live']}개)")
+            print(f"  - 상세 페이지 URL 색인: {s['urls']}개")
+
+        elif args.command == 'show':
+            rows, negs = cache.entries(args.title)
+            current = None
+            for title, field, value, fetched_at in rows:
+                if title != current:
+                    current = title
+                    print(f"\n🎬 {title}")
+                short = value if len(value) <= 60 else value[:57] + '...'
+                print(f"  {field:<20} {_format_ts(fetched_at)}  {short}")
+            for title, fetched_at in negs:
+                print(f"\n🚫 {title} (빈 결과, {_format_ts(fetched_at)})")
+            if not rows and not negs:
+                print("⚠️ 해당하는 캐시 항목이 없습니다.")
+
+        elif args.command == 'urls':
+            entries = cache.url_entries(args.title)
+            for title, url, source, updated_at in entries:
+                print(f"  {title:<30} {source:<8} {_format_ts(updated_at)}  {url}")
+            if not entries:
+                print("⚠️ 해당하는 URL 색인이 없습니다.")
+
+        elif args.command == 'purge':
+            if not (args.title or args.expired or args.negative or args.urls or args.all):
+                parser.error("purge에는 --title, --expired, --negative, --urls, --all 중 하나가 필요합니다.")
+            removed = cache.purge(
+                title=args.title,
+                expired_only=args.expired,
+                negative_only=args.negative,
+                urls=args.urls,
+            )
+            print(f"🗑️ {removed}개 항목 삭제 완료")
+
+
+if __name__ == "__main__":
+    main()
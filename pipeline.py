@@ -0,0 +1,197 @@
+# pipeline.py (TV/OTT 크롤링 → 합본을 한 번에 실행하는 오케스트레이터)
+#
+# 예전에는 1) TV → 2) OTT → 3) 합본 스크립트를 손으로 차례대로 실행했습니다.
+# TV와 OTT 크롤링은 서로 데이터를 주고받지 않으므로 별도 프로세스로 동시에 돌리고,
+# 둘 다 끝나면 합본을 실행합니다. 전체 시간 ≈ 더 긴 크롤링 + 합본.
+#
+# - 각 단계의 출력은 [TV] / [OTT] / [합본] 접두어를 붙여 그대로 보여줍니다.
+# - 모든 데이터셋은 dataset_io.write_dataset이 임시 파일에 쓴 뒤 os.replace로 교체하므로,
+#   실행 중에도 앱은 항상 이전 완성본 또는 새 완성본만 읽습니다.
+# - 크롤링이 하나라도 실패하면 합본을 건너뜁니다 (--allow-partial이면 이전 결과로 합본).
+# - 호스트별 속도 제한(rate_limiter)은 프로세스마다 따로 있으므로, TV와 OTT가 함께 쓰는
+#   키노라이츠 제한을 동시에 도는 크롤러 수로 나눠 각 프로세스에 --rate-limit으로 넘깁니다.
+#   (두 프로세스의 합계가 호스트별 제한을 넘지 않음)
+#
+# 사용 예)
+#   python pipeline.py
+#   python pipeline.py --tv-args "--all-days --incremental" --ott-args "--workers 4" --csv
+#   python pipeline.py --skip-tv                # OTT만 다시 수집하고 합본
+#   python pipeline.py --kinolights-rate 2      # 두 크롤러 합계 초당 2회 (각 1회)
+
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+
+from dataset_io import FINAL_DATASET, OTT_DATASET, TV_DATASET
+from rate_limiter import DEFAULT_LIMITS, KINOLIGHTS_HOST
+from serving_dataset import SERVING_DATASET
+
+# =================================================================
+# 1. 기본 설정
+# =================================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TV_SCRIPT = os.path.join(BASE_DIR, '1) TV_최종.py')
+OTT_SCRIPT = os.path.join(BASE_DIR, '2) OTT_최종.py')
+MERGE_SCRIPT = os.path.join(BASE_DIR, '3) TV&OTT_합본csv만드는거.py')
+
+
+# =================================================================
+# 2. 단계 실행
+# =================================================================
+class Stage:
+    """하위 프로세스 하나로 실행되는 단계 (스크립트, 인자, 결과 파일)"""
+
+    def __init__(self, name: str, script: str, args=None, outputs=()):
+        self.name = name
+        self.script = script
+        self.args = list(args or [])
+        self.outputs = list(outputs)
+        self.returncode = None
+        self.elapsed = 0.0
+        self.updated = []
+        self._proc = None
+        self._reader = None
+        self._started = 0.0
+        self._mtimes = {}
+
+    def start(self, cwd: str):
+        self._mtimes = {path: _mtime(os.path.join(cwd, path)) for path in self.outputs}
+        env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+        self._started = time.time()
+        self._proc = subprocess.Popen(
+            [sys.executable, self.script, *self.args], cwd=cwd, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding='utf-8', errors='replace',
+        )
+        self._reader = threading.Thread(target=self._relay, daemon=True)
+        self._reader.start()
+        return self
+
+    def _relay(self):
+        # 출력을 접두어와 함께 중계하고, 프로세스가 끝난 시각으로 소요 시간을 기록
+        for line in self._proc.stdout:
+            print(f"[{self.name}] {line.rstrip()}", flush=True)
+        self.returncode = self._proc.wait()
+        self.elapsed = time.time() - self._started
+
+    def wait(self, cwd: str) -> int:
+        self._reader.join()
+        self.updated = [path for path in self.outputs
+                        if _mtime(os.path.join(cwd, path)) != self._mtimes.get(path)]
+        return self.returncode
+
+    def terminate(self):
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.terminate()
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+
+def split_host_limit(host: str, rate: float, burst: int, parts: int) -> str:
+    """프로세스 parts개가 나눠 쓸 한 프로세스 몫의 --rate-limit 값 ('호스트=초당횟수:버스트')"""
+    parts = max(1, parts)
+    return f"{host}={rate / parts:g}:{max(1, burst // parts)}"
+
+
+def _mtime(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def run_pipeline(tv_args=None, ott_args=None, skip_tv=False, skip_ott=False,
+                 allow_partial=False, export_csv=False, cwd: str = None,
+                 kinolights_limit=DEFAULT_LIMITS[KINOLIGHTS_HOST]):
+    """
+    TV/OTT 크롤링을 동시에 실행하고, 끝나면 합본을 실행합니다. 실행한 Stage 목록을 반환합니다.
+    kinolights_limit(초당 횟수, 버스트)는 동시에 도는 크롤러들이 나눠 씁니다.
+    --tv-args/--ott-args에 직접 준 --rate-limit은 그 뒤에 적용되므로 그대로 우선합니다.
+    """
+    cwd = cwd or os.getcwd()
+    crawls = []
+    if not skip_tv:
+        crawls.append(Stage('TV', TV_SCRIPT, tv_args, outputs=[TV_DATASET]))
+    if not skip_ott:
+        crawls.append(Stage('OTT', OTT_SCRIPT, ott_args, outputs=[OTT_DATASET]))
+
+    share = split_host_limit(KINOLIGHTS_HOST, *kinolights_limit, parts=len(crawls))
+    for stage in crawls:
+        stage.args = ['--rate-limit', share, *stage.args]
+    if len(crawls) > 1:
+        print(f"🚦 {KINOLIGHTS_HOST} 제한 초당 {kinolights_limit[0]:g}회를 {len(crawls)}개 크롤러가 나눠 사용 ({share})")
+
+    started = time.time()
+    print(f"🚀 크롤링 동시 시작: {', '.join(s.name for s in crawls) or '(없음)'}")
+    try:
+        for stage in crawls:
+            stage.start(cwd)
+        for stage in crawls:
+            stage.wait(cwd)
+            print(f"{'✅' if stage.ok else '❌'} {stage.name} 종료 (코드 {stage.returncode}, {stage.elapsed:.1f}초)")
+    except KeyboardInterrupt:
+        for stage in crawls:
+            stage.terminate()
+        raise
+
+    stages = list(crawls)
+    failed = [s.name for s in crawls if not s.ok]
+    if failed and not allow_partial:
+        print(f"⚠️ 크롤링 실패({', '.join(failed)})로 합본을 건너뜁니다. 앱은 이전 데이터를 그대로 사용합니다.")
+    else:
+        if failed:
+            print(f"⚠️ 크롤링 실패({', '.join(failed)}): 이전 결과 파일로 합본합니다.")
+        merge = Stage('합본', MERGE_SCRIPT, ['--csv'] if export_csv else [],
+                      outputs=[FINAL_DATASET, SERVING_DATASET])
+        merge.start(cwd).wait(cwd)
+        stages.append(merge)
+
+    print_summary(stages, time.time() - started)
+    return stages
+
+
+def print_summary(stages, total: float):
+    print("\n" + "=" * 60)
+    print("⏱️ 단계별 결과")
+    for stage in stages:
+        outputs = ', '.join(stage.updated) if stage.updated else '갱신 없음'
+        print(f"  {'✅' if stage.ok else '❌'} {stage.name:<4} 코드 {stage.returncode:>3}  "
+              f"{stage.elapsed:7.1f}초  → {outputs}")
+    serial = sum(s.elapsed for s in stages)
+    print(f"  전체 {total:.1f}초 (순차 실행이었다면 약 {serial:.1f}초)")
+    print("=" * 60)
+
+
+# =================================================================
+# 3. CLI
+# =================================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TV/OTT 동시 크롤링 후 합본까지 한 번에 실행")
+    parser.add_argument('--tv-args', default='', help="TV 크롤러에 넘길 인자 (예: \"--all-days --incremental\")")
+    parser.add_argument('--ott-args', default='', help="OTT 크롤러에 넘길 인자 (예: \"--workers 4\")")
+    parser.add_argument('--skip-tv', action='store_true', help="TV 크롤링 생략 (기존 결과로 합본)")
+    parser.add_argument('--skip-ott', action='store_true', help="OTT 크롤링 생략 (기존 결과로 합본)")
+    parser.add_argument('--allow-partial', action='store_true',
+                        help="크롤링이 실패해도 남아 있는 이전 결과로 합본")
+    parser.add_argument('--csv', action='store_true', help="합본을 CSV로도 저장")
+    default_rate, default_burst = DEFAULT_LIMITS[KINOLIGHTS_HOST]
+    parser.add_argument('--kinolights-rate', type=float, default=default_rate,
+                        help=f"키노라이츠 전체 초당 요청 수, 크롤러끼리 나눠 씀 (기본값: {default_rate:g})")
+    parser.add_argument('--kinolights-burst', type=int, default=default_burst,
+                        help=f"키노라이츠 전체 순간 최대 요청 수 (기본값: {default_burst})")
+    args = parser.parse_args()
+    if args.kinolights_rate <= 0:
+        parser.error("--kinolights-rate는 0보다 커야 합니다.")
+
+    result = run_pipeline(tv_args=shlex.split(args.tv_args), ott_args=shlex.split(args.ott_args),
+                          skip_tv=args.skip_tv, skip_ott=args.skip_ott,
+                          allow_partial=args.allow_partial, export_csv=args.csv,
+                          kinolights_limit=(args.kinolights_rate, args.kinolights_burst))
+    sys.exit(0 if all(stage.ok for stage in result) else 1)
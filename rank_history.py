@@ -0,0 +1,241 @@
+# rank_history.py (OTT 랭킹 이력 저장소: SQLite, 실행마다 누적)
+#
+# ott_crawling.csv는 매번 덮어쓰이므로, 랭킹을 (플랫폼, 날짜, 제목) 단위로 따로 쌓아 둡니다.
+# 순위 변동(rank_delta)은 사이트 표시값 대신 직전 기록과 비교해 직접 계산합니다.
+#   rank_delta = 직전 순위 - 현재 순위 (양수 = 상승, NULL = 신규 진입)
+#
+# 사용 예)
+#   python rank_history.py record ott_crawling.parquet   # 현재 랭킹을 오늘 날짜로 기록
+#   python rank_history.py peak "눈물의 여왕"              # 최고 순위
+#   python rank_history.py top "눈물의 여왕" --n 10        # TOP 10에 든 날 수
+#   python rank_history.py trend "눈물의 여왕" --days 7    # 최근 7일 추이
+
+import argparse
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+# =================================================================
+# 1. 기본 설정
+# =================================================================
+HISTORY_FILE = 'rank_history.sqlite3'
+
+
+def parse_rank(value):
+    """'1', '1.0', '1위' 같은 값을 정수 순위로 바꿉니다 (없으면 None)."""
+    digits = ''.join(ch for ch in str(value).split('.')[0] if ch.isdigit())
+    return int(digits) if digits else None
+
+
+# =================================================================
+# 2. 이력 저장소
+# =================================================================
+class RankHistory:
+    """(platform, captured_date, title)을 키로 하는 랭킹 이력"""
+
+    def __init__(self, path: str = HISTORY_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS ranks (
+                platform         TEXT NOT NULL,
+                captured_date    TEXT NOT NULL,
+                title            TEXT NOT NULL,
+                rank             INTEGER NOT NULL,
+                rank_delta       INTEGER,
+                site_rank_change TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (platform, captured_date, title)
+            );
+            CREATE INDEX IF NOT EXISTS ix_ranks_title_date ON ranks (title, captured_date);
+            CREATE INDEX IF NOT EXISTS ix_ranks_date_rank ON ranks (captured_date, rank);
+        """)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------------------
+    # 기록
+    # -------------------------------------------------------------
+    def record(self, rows, captured_date: str = None) -> int:
+        """
+        랭킹 행(platform, rank, title, rank_change)을 captured_date(기본값: 오늘) 기록으로 저장합니다.
+        같은 날 같은 제목이 다시 나오면(중복 행, 재실행) 더 높은 순위 쪽을 남깁니다. 저장한 행 수를 반환합니다.
+        """
+        captured_date = captured_date or date.today().isoformat()
+        saved = 0
+        with self._lock:
+            for row in rows:
+                rank = parse_rank(row.get('rank', ''))
+                title = str(row.get('title', '')).strip()
+                platform = str(row.get('platform', '')).strip()
+                if rank is None or not title or not platform:
+                    continue
+                prev = self._conn.execute(
+                    "SELECT rank FROM ranks WHERE title = ? AND platform = ? AND captured_date < ? "
+                    "ORDER BY captured_date DESC LIMIT 1",
+                    (title, platform, captured_date),
+                ).fetchone()
+                delta = prev[0] - rank if prev else None
+                # SET 안의 rank 등은 기존 값 → 순위가 더 높을 때만 변동/사이트 표시값도 함께 교체
+                self._conn.execute(
+                    "INSERT INTO ranks VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(platform, captured_date, title) DO UPDATE SET "
+                    "rank = MIN(rank, excluded.rank), "
+                    "rank_delta = CASE WHEN excluded.rank < rank THEN excluded.rank_delta ELSE rank_delta END, "
+                    "site_rank_change = CASE WHEN excluded.rank < rank "
+                    "THEN excluded.site_rank_change ELSE site_rank_change END",
+                    (platform, captured_date, title, rank, delta, str(row.get('rank_change', '') or '')),
+                )
+                saved += 1
+            self._conn.commit()
+        return saved
+
+    # -------------------------------------------------------------
+    # 조회
+    # -------------------------------------------------------------
+    def _where(self, title: str, platform: str = None):
+        if platform:
+            return "title = ? AND platform = ?", [title, platform]
+        return "title = ?", [title]
+
+    def days_in_top(self, title: str, n: int = 10, platform: str = None) -> int:
+        """TOP n 안에 든 날짜 수 (여러 플랫폼에 있었던 날은 하루로 계산)"""
+        where, params = self._where(title, platform)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT COUNT(DISTINCT captured_date) FROM ranks WHERE {where} AND rank <= ?",
+                params + [n],
+            ).fetchone()
+        return row[0]
+
+    def peak_rank(self, title: str, platform: str = None):
+        """최고 순위 기록: {'rank', 'platform', 'captured_date'} (없으면 None, 같은 순위는 먼저 달성한 날)"""
+        where, params = self._where(title, platform)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT rank, platform, captured_date FROM ranks WHERE {where} "
+                "ORDER BY rank ASC, captured_date ASC LIMIT 1",
+                params,
+            ).fetchone()
+        if row is None:
+            return None
+        return {'rank': row[0], 'platform': row[1], 'captured_date': row[2]}
+
+    def trend(self, title: str, days: int = 7, platform: str = None, until: str = None):
+        """
+        until(기본값: 오늘)까지 최근 days일의 기록을 날짜 순으로 반환합니다.
+        [{'captured_date', 'platform', 'rank', 'rank_delta'}, ...]
+        """
+        end = date.fromisoformat(until) if until else date.today()
+        start = (end - timedelta(days=days - 1)).isoformat()
+        where, params = self._where(title, platform)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT captured_date, platform, rank, rank_delta FROM ranks "
+                f"WHERE {where} AND captured_date BETWEEN ? AND ? ORDER BY captured_date, platform",
+                params + [start, end.isoformat()],
+            ).fetchall()
+        return [{'captured_date': d, 'platform': p, 'rank': r, 'rank_delta': delta}
+                for d, p, r, delta in rows]
+
+    def deltas(self, captured_date: str = None) -> dict:
+        """captured_date(기본값: 오늘) 기록의 계산된 순위 변동: {(platform, title): rank_delta}"""
+        captured_date = captured_date or date.today().isoformat()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT platform, title, rank_delta FROM ranks WHERE captured_date = ?", (captured_date,)
+            ).fetchall()
+        return {(p, t): delta for p, t, delta in rows}
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows, titles, days = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT title), COUNT(DISTINCT captured_date) FROM ranks"
+            ).fetchone()
+            last = self._conn.execute("SELECT MAX(captured_date) FROM ranks").fetchone()[0]
+        return {'rows': rows, 'titles': titles, 'days': days, 'last_date': last or ''}
+
+
+def format_delta(delta) -> str:
+    if delta is None:
+        return 'NEW'
+    if delta > 0:
+        return f'▲{delta}'
+    if delta < 0:
+        return f'▼{-delta}'
+    return '-'
+
+
+# =================================================================
+# 3. CLI
+# =================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OTT 랭킹 이력 기록/조회")
+    parser.add_argument('--db', default=HISTORY_FILE, help=f"이력 파일 경로 (기본값: {HISTORY_FILE})")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help="OTT 랭킹 데이터셋을 이력에 추가")
+    rec.add_argument('path', nargs='?', default='ott_crawling.parquet', help="Parquet (또는 예전 CSV)")
+    rec.add_argument('--date', help="기록 날짜 YYYY-MM-DD (기본값: 오늘)")
+
+    sub.add_parser('stats', help="이력 현황 출력")
+
+    for name, help_text in (('peak', "최고 순위"), ('top', "TOP N에 든 날 수"), ('trend', "최근 추이")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('title')
+        p.add_argument('--platform', help="플랫폼 지정 (기본값: 전체)")
+        if name == 'top':
+            p.add_argument('--n', type=int, default=10)
+        if name == 'trend':
+            p.add_argument('--days', type=int, default=7)
+
+    args = parser.parse_args(argv)
+
+    if args.command != 'record' and not os.path.exists(args.db):
+        print(f"⚠️ 이력 파일이 없습니다: {args.db}")
+        return
+
+    with RankHistory(args.db) as history:
+        if args.command == 'record':
+            from dataset_io import OTT_SCHEMA, read_dataset
+            df = read_dataset(args.path, OTT_SCHEMA)
+            saved = history.record(df.to_dict('records'), captured_date=args.date)
+            print(f"📈 '{args.path}' {saved}건을 이력에 기록 ({args.date or date.today().isoformat()})")
+
+        elif args.command == 'stats':
+            s = history.stats()
+            print(f"📈 이력 파일: {args.db}")
+            print(f"  - 기록 {s['rows']}건, 제목 {s['titles']}개, 수집일 {s['days']}일 (마지막: {s['last_date']})")
+
+        elif args.command == 'peak':
+            peak = history.peak_rank(args.title, args.platform)
+            if peak is None:
+                print("⚠️ 해당 제목의 기록이 없습니다.")
+            else:
+                print(f"🏆 {args.title}: 최고 {peak['rank']}위 ({peak['platform']}, {peak['captured_date']})")
+
+        elif args.command == 'top':
+            days = history.days_in_top(args.title, args.n, args.platform)
+            print(f"🔟 {args.title}: TOP {args.n} {days}일")
+
+        elif args.command == 'trend':
+            rows = history.trend(args.title, args.days, args.platform)
+            for r in rows:
+                print(f"  {r['captured_date']}  {r['platform']:<14} {r['rank']:>3}위  {format_delta(r['rank_delta'])}")
+            if not rows:
+                print(f"⚠️ 최근 {args.days}일 기록이 없습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# rate_limiter.py (호스트별 요청 속도 제한: 토큰 버킷, TV/OTT 크롤러 공용)
+#
+# 고정된 time.sleep 대신, 같은 호스트로 보내는 요청이 초당 rate회(순간 최대 burst회)를
+# 넘을 때만 기다립니다. 여러 스레드/브라우저 세션이 같은 버킷을 공유합니다.
+#
+# 사용 예)
+#   from rate_limiter import throttle
+#   throttle("https://m.kinolights.com/search")   # 필요하면 잠시 대기
+#   driver.get("https://m.kinolights.com/search")
+#
+# 속도 변경: configure_limits(["kinolights.com=2:4", "211.43.210.44=1"])  (호스트=초당횟수[:버스트])
+
+import threading
+import time
+from urllib.parse import urlparse
+
+# =================================================================
+# 1. 기본 설정
+# =================================================================
+KINOLIGHTS_HOST = 'kinolights.com'
+TVGUIDE_HOST = '211.43.210.44'
+
+# 호스트: (초당 요청 수, 버스트)
+DEFAULT_LIMITS = {
+    KINOLIGHTS_HOST: (3.0, 5),
+    TVGUIDE_HOST: (2.0, 5),
+}
+
+
+# =================================================================
+# 2. 토큰 버킷
+# =================================================================
+class TokenBucket:
+    """초당 rate개씩 토큰이 차고, 최대 burst개까지 쌓이는 버킷"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.requests = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 하나를 가져갑니다. 기다린 시간(초)을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # 토큰을 먼저 차감해 두고(음수 허용), 부족분만큼 잠금 밖에서 기다림 → 대기 순서 보장
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.requests += 1
+            if wait > 0:
+                self.throttled += 1
+                self.throttled_seconds += wait
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+# =================================================================
+# 3. 호스트별 제한
+# =================================================================
+def _host_of(url: str) -> str:
+    return (urlparse(url).hostname or url).lower()
+
+
+class HostRateLimiter:
+    """호스트마다 TokenBucket을 하나씩 둡니다. 'kinolights.com'은 m.kinolights.com 등 하위 도메인도 포함합니다."""
+
+    def __init__(self, limits: dict = None):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        for host, (rate, burst) in (limits or {}).items():
+            self.set_limit(host, rate, burst)
+
+    def set_limit(self, host: str, rate: float, burst: int = 1):
+        with self._lock:
+            self._buckets[host.lower()] = TokenBucket(rate, burst)
+
+    def _bucket_for(self, host: str):
+        with self._lock:
+            for name, bucket in self._buckets.items():
+                if host == name or host.endswith('.' + name):
+                    return bucket
+        return None
+
+    def acquire(self, url: str) -> float:
+        """url의 호스트에 제한이 있으면 토큰을 가져갑니다 (제한 없는 호스트는 바로 통과)."""
+        bucket = self._bucket_for(_host_of(url))
+        return bucket.acquire() if bucket is not None else 0.0
+
+    def report(self) -> dict:
+        """{호스트: {'rate', 'burst', 'requests', 'throttled', 'throttled_seconds'}}"""
+        with self._lock:
+            return {host: {'rate': b.rate, 'burst': b.burst, 'requests': b.requests,
+                           'throttled': b.throttled, 'throttled_seconds': b.throttled_seconds}
+                    for host, b in self._buckets.items()}
+
+    def print_report(self):
+        for host, r in self.report().items():
+            if r['requests']:
+                print(f"🚦 {host}: 요청 {r['requests']}회 (초당 {r['rate']:g}, 버스트 {r['burst']}), "
+                      f"대기 {r['throttled']}회 / 총 {r['throttled_seconds']:.1f}초")
+
+
+def parse_limit_spec(spec: str):
+    """'호스트=초당횟수[:버스트]' 문자열을 (호스트, rate, burst)로 바꿉니다."""
+    try:
+        host, value = spec.split('=', 1)
+        rate, _, burst = value.partition(':')
+        return host.strip(), float(rate), int(burst) if burst else max(1, int(float(rate)))
+    except ValueError as e:
+        raise ValueError(f"속도 제한 형식이 잘못되었습니다 (호스트=초당횟수[:버스트]): {spec}") from e
+
+
+# 크롤러 전체가 공유하는 기본 제한기
+DEFAULT_LIMITER = HostRateLimiter(DEFAULT_LIMITS)
+
+
+def configure_limits(specs):
+    """CLI의 --rate-limit 값들을 기본 제한기에 반영합니다. 잘못된 값이면 ValueError."""
+    for spec in specs or []:
+        host, rate, burst = parse_limit_spec(spec)
+        DEFAULT_LIMITER.set_limit(host, rate, burst)
+
+
+def throttle(url: str) -> float:
+    return DEFAULT_LIMITER.acquire(url)
@@ -0,0 +1,483 @@
+# search_index.py (홈 화면 검색용 색인: 데이터셋을 읽을 때 한 번 만들고, 검색은 집합 교집합으로)
+#
+# 예전에는 검색어를 입력할 때마다 전체 행에 astype(str).str.lower().str.contains(...)를 돌렸습니다
+# ('전체'는 4개 컬럼 모두). 이제 컬럼별로
+#   - 고유값 목록 (같은 작품이 여러 번 방영돼도 값은 한 번만)
+#   - 글자 1개/2개(bigram) → 그 글자를 포함한 고유값 번호 집합
+# 을 만들어 두고, 검색어의 bigram 집합을 교집합한 후보만 실제 부분 문자열인지 확인합니다.
+# 결과는 "소문자로 바꾼 값에 검색어가 들어 있는가" (기존 str.contains와 같음, 단 정규식이 아닌 문자 그대로).
+#
+# '초성/자모' 검색: 제목/배우/감독의 초성 문자열(눈물의 여왕 → ㄴㅁㅇㅇㅇ)과 자모 분해 문자열
+# (눈물 → ㄴㅜㄴㅁㅜㄹ)도 같은 방식으로 색인해 둡니다. 검색어가 초성으로만 되어 있으면 초성 색인,
+# 아니면 자모로 분해해 자모 색인에서 찾으므로 입력 중인 글자('눈무', '눈ㅁ')도 찾을 수 있습니다.
+#
+# '유사 검색': 제목과 배우/감독 이름(쉼표로 나눈 한 명씩)을 자모 trigram으로 색인합니다.
+# 검색어와 trigram이 많이 겹치는 후보만 골라 편집 거리로 다시 점수를 매기므로,
+# 한 글자 틀린 검색어('눈믈의 여왕')나 사이트마다 조금 다른 제목도 순위대로 찾습니다.
+# 검색어가 그대로 들어 있는 단어는 자모 색인으로 따로 찾아, 긴 제목이라도 후보에서 빠지지 않습니다.
+#
+# 사용 예)
+#   index = build_search_index(df)
+#   mask = index.search("눈물", '전체')     # df와 같은 길이의 bool 배열
+#   df[mask]
+#
+#   index.search("ㄴㅁㅇㅇㅇ", '초성/자모')
+#   index.fuzzy("눈믈의 여왕", k=5)         # [FuzzyMatch(text, column, score, ...), ...]
+#
+#   python search_index.py --bench          # str.contains와 결과/속도 비교
+
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+# =================================================================
+# 1. 기본 설정
+# =================================================================
+# 홈 화면 '🔍 검색 기준' 선택지 → 검색할 컬럼
+SEARCH_FIELDS = {
+    '전체': ['title', 'cast', 'director', 'genre'],
+    '제목': ['title'],
+    '배우': ['cast'],
+    '감독': ['director'],
+    '장르': ['genre'],
+    '초성/자모': ['title', 'cast', 'director'],
+    # 유사 검색: 제목은 통째로, 배우/감독은 이름 하나씩
+    '유사 검색': ['title', 'cast', 'director'],
+}
+INDEXED_COLUMNS = ['title', 'cast', 'director', 'genre']
+# 초성/자모 색인을 추가로 만드는 컬럼 (제목, 사람 이름)
+JAMO_COLUMNS = ['title', 'cast', 'director']
+JAMO_OPTION = '초성/자모'
+FUZZY_OPTION = '유사 검색'
+FUZZY_TOP_K = 10
+FUZZY_MIN_SCORE = 0.45
+_NAME_SPLIT = re.compile(r'\s*[,/·|]\s*')
+
+
+# =================================================================
+# 2. 한글 초성 / 자모 분해
+# =================================================================
+_HANGUL_BASE, _HANGUL_LAST = 0xAC00, 0xD7A3
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSEONG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+             'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+# 겹모음/겹받침은 입력 순서대로 나눔 (과 → ㄱㅗㅏ 이므로 '고'까지 입력해도 찾음)
+_COMPOUND_JAMO = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+}
+
+
+def chosung_key(text: str) -> str:
+    """한글 음절은 초성으로, 나머지 글자는 소문자로 (공백 제거). '눈물의 여왕' → 'ㄴㅁㅇㅇㅇ'"""
+    out = []
+    for ch in text.lower():
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            out.append(CHOSEONG[(code - _HANGUL_BASE) // 588])
+        elif not ch.isspace():
+            out.append(ch)
+    return ''.join(out)
+
+
+def jamo_key(text: str) -> str:
+    """한글 음절/겹자모를 낱자모로 풀어 씁니다 (공백 제거). '눈물' → 'ㄴㅜㄴㅁㅜㄹ'"""
+    out = []
+    for ch in text.lower():
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            index = code - _HANGUL_BASE
+            out.append(CHOSEONG[index // 588])
+            jung = JUNGSEONG[(index % 588) // 28]
+            jong = JONGSEONG[index % 28]
+            out.append(_COMPOUND_JAMO.get(jung, jung))
+            out.append(_COMPOUND_JAMO.get(jong, jong))
+        elif not ch.isspace():
+            out.append(_COMPOUND_JAMO.get(ch, ch))
+    return ''.join(out)
+
+
+def _is_hangul(ch: str) -> bool:
+    """한글 음절 또는 호환용 자모(ㄱ~ㅣ)인지"""
+    code = ord(ch)
+    return _HANGUL_BASE <= code <= _HANGUL_LAST or 0x3131 <= code <= 0x318E
+
+
+def is_chosung_query(query: str) -> bool:
+    """
+    초성(ㄱ~ㅎ)이 하나 이상 있고, 나머지 한글도 모두 초성인 검색어인지 (공백 무시).
+    숫자/영문 등 한글이 아닌 글자는 chosung_key가 그대로 두므로 판단에서 제외합니다 ('ㅂㅇ1' → 초성).
+    """
+    letters = [ch for ch in query if not ch.isspace()]
+    return (any(ch in CHOSEONG for ch in letters)
+            and all(ch in CHOSEONG or not _is_hangul(ch) for ch in letters))
+
+
+# =================================================================
+# 3. 컬럼 색인
+# =================================================================
+def _grams(text: str, n: int):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class TextPostings:
+    """고유값마다 변환한 문자열(소문자/초성/자모)의 글자/bigram → 고유값 번호 집합"""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.unigrams = {}
+        self.bigrams = {}
+        for value_id, text in enumerate(texts):
+            for ch in set(text):
+                self.unigrams.setdefault(ch, set()).add(value_id)
+            for gram in _grams(text, 2):
+                self.bigrams.setdefault(gram, set()).add(value_id)
+
+    def match(self, query: str):
+        """query를 부분 문자열로 포함하는 고유값 번호 목록"""
+        if not query:
+            return list(range(len(self.texts)))
+        if len(query) == 1:
+            return list(self.unigrams.get(query, ()))
+        postings = []
+        for gram in _grams(query, 2):
+            ids = self.bigrams.get(gram)
+            if not ids:
+                return []
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                return []
+        # bigram이 모두 들어 있어도 순서/연속이 다를 수 있으므로 실제로 확인
+        return [value_id for value_id in candidates if query in self.texts[value_id]]
+
+
+class FieldIndex:
+    """한 컬럼의 고유값, 고유값별 행 위치, 변환 방식별 TextPostings ('plain', 'chosung', 'jamo')"""
+
+    def __init__(self, values: pd.Series, jamo: bool = False):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            uniques = [str(v) for v in values.cat.categories]
+        else:
+            codes, uniques = pd.factorize(values.astype(str), sort=False)
+            uniques = list(uniques)
+        self.n_rows = len(values)
+        self.values = uniques
+
+        # 고유값 번호 → 그 값을 가진 행 위치 (정렬된 int 배열)
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        starts = np.concatenate(([0], np.cumsum(counts)))
+        offset = int((codes < 0).sum())  # NA(-1)는 앞쪽에 모임
+        self.rows = [order[offset + starts[i]:offset + starts[i + 1]] for i in range(len(uniques))]
+
+        self.views = {'plain': TextPostings([v.lower() for v in uniques])}
+        if jamo:
+            self.views['chosung'] = TextPostings([chosung_key(v) for v in uniques])
+            self.views['jamo'] = TextPostings([jamo_key(v) for v in uniques])
+
+    def match_values(self, query: str, view: str = 'plain'):
+        """query(view와 같은 방식으로 변환된 검색어)를 포함하는 고유값 번호 목록"""
+        postings = self.views.get(view)
+        return postings.match(query) if postings is not None else []
+
+    def rows_of(self, value_ids) -> np.ndarray:
+        if not value_ids:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.rows[value_id] for value_id in value_ids])
+
+
+# =================================================================
+# 4. 유사 검색 (오타 허용, 자모 trigram + 편집 거리)
+# =================================================================
+def _trigrams(key: str):
+    # 앞뒤에 여백을 붙여 짧은 이름도 trigram이 생기도록 ('공유' → ㄱㅗㅇㅇㅠ → '  ㄱ', ' ㄱㅗ', ...)
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """레벤슈타인 거리 (후보 몇십 개에만 사용)"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def _fuzzy_score(key: str, term_key: str, similarity: float) -> float:
+    if key in term_key:
+        return 1.0  # 검색어가 그대로 들어 있음
+    distance = edit_distance(key, term_key)
+    return (similarity + 1 - distance / max(len(key), len(term_key))) / 2
+
+
+class FuzzyMatch:
+    """유사 검색 결과 하나: 찾은 문자열, 컬럼, 점수(0~1), 그 문자열이 들어 있는 고유값 번호들"""
+
+    def __init__(self, text: str, column: str, score: float, value_ids):
+        self.text = text
+        self.column = column
+        self.score = score
+        self.value_ids = value_ids
+
+    def __repr__(self):
+        return f"FuzzyMatch({self.text!r}, {self.column!r}, {self.score:.2f})"
+
+
+class FuzzyIndex:
+    """검색 단어(제목, 사람 이름) → 자모 trigram 색인"""
+
+    def __init__(self, fields: dict):
+        self.fields = fields
+        self.terms = []       # (표시 문자열, 컬럼, 자모 키, 고유값 번호 목록)
+        # 컬럼별 고유값 번호 → 그 값에서 나온 단어 번호 (자모 색인으로 찾은 값을 단어로 바꿀 때 사용)
+        self.value_terms = {col: [[] for _ in field.values] for col, field in fields.items()}
+        grams_per_term = []   # 단어별 trigram 개수
+        postings = {}         # trigram → 단어 번호 목록
+        for col, field in fields.items():
+            by_text = {}
+            for value_id, value in enumerate(field.values):
+                parts = [value.strip()] if col == 'title' else _NAME_SPLIT.split(value)
+                for part in parts:
+                    if part:
+                        by_text.setdefault(part, []).append(value_id)
+            for text, value_ids in by_text.items():
+                key = jamo_key(text)
+                if not key:
+                    continue
+                term_id = len(self.terms)
+                self.terms.append((text, col, key, value_ids))
+                for value_id in value_ids:
+                    self.value_terms[col][value_id].append(term_id)
+                grams = _trigrams(key)
+                grams_per_term.append(len(grams))
+                for gram in grams:
+                    postings.setdefault(gram, []).append(term_id)
+        # 검색 때 np.bincount로 한 번에 세도록 배열로 보관
+        self.grams = np.array(grams_per_term, dtype=np.int32)
+        term_columns = np.array([col for _, col, _, _ in self.terms], dtype=object)
+        self.column_masks = {col: term_columns == col for col in fields}
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def search(self, query: str, columns, k: int = FUZZY_TOP_K, min_score: float = FUZZY_MIN_SCORE,
+               candidates: int = 100):
+        """query와 비슷한 단어 상위 k개 (점수 높은 순)"""
+        key = jamo_key(query.strip())
+        if not key:
+            return []
+        exact = self._substring_terms(key, columns)
+        query_grams = _trigrams(key)
+        hits = [self.postings[gram] for gram in query_grams if gram in self.postings]
+        if not hits and not exact:
+            return []
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.terms)) if hits \
+            else np.zeros(len(self.terms), dtype=np.int64)
+
+        # trigram 유사도(겹친 수 / 합집합 크기)로 후보를 줄인 뒤 편집 거리로 다시 점수
+        similarity = shared / (len(query_grams) + self.grams - shared)
+        allowed = np.zeros(len(self.terms), dtype=bool)
+        for col in columns:
+            if col in self.column_masks:
+                allowed |= self.column_masks[col]
+        similarity[(shared == 0) | ~allowed] = 0
+        top = np.flatnonzero(similarity)
+        if len(top) > candidates:
+            top = top[np.argpartition(-similarity[top], candidates)[:candidates]]
+
+        matches = []
+        # 검색어가 그대로 들어 있는 단어(점수 1.0)는 trigram 후보에서 밀려났더라도 항상 포함
+        for term_id in exact.union(top.tolist()):
+            text, col, term_key, value_ids = self.terms[term_id]
+            score = _fuzzy_score(key, term_key, float(similarity[term_id]))
+            if score >= min_score:
+                matches.append(FuzzyMatch(text, col, score, value_ids))
+        matches.sort(key=lambda m: (-m.score, len(m.text), m.text))
+        return matches[:k]
+
+    def _substring_terms(self, key: str, columns) -> set:
+        """자모 키에 key가 그대로 들어 있는 단어 번호 (FieldIndex의 자모 색인으로 값을 먼저 좁힘)"""
+        found = set()
+        for col in columns:
+            field = self.fields.get(col)
+            if field is None:
+                continue
+            for value_id in field.match_values(key, 'jamo'):
+                for term_id in self.value_terms[col][value_id]:
+                    if key in self.terms[term_id][2]:
+                        found.add(term_id)
+        return found
+
+
+# =================================================================
+# 5. 검색 색인
+# =================================================================
+class SearchIndex:
+    def __init__(self, df: pd.DataFrame, columns=INDEXED_COLUMNS):
+        self.n_rows = len(df)
+        self.fields = {col: FieldIndex(df[col], jamo=col in JAMO_COLUMNS) for col in columns if col in df.columns}
+        self.fuzzy_index = FuzzyIndex({col: field for col, field in self.fields.items()
+                                       if col in SEARCH_FIELDS[FUZZY_OPTION]})
+
+    def fuzzy(self, query: str, k: int = FUZZY_TOP_K, option: str = FUZZY_OPTION):
+        """비슷한 제목/이름 상위 k개 (FuzzyMatch 목록, 점수 높은 순)"""
+        return self.fuzzy_index.search(query, SEARCH_FIELDS.get(option, SEARCH_FIELDS[FUZZY_OPTION]), k)
+
+    def rows_of_matches(self, matches) -> np.ndarray:
+        """유사 검색 결과가 가리키는 행의 bool 배열"""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        for match in matches:
+            field = self.fields[match.column]
+            mask[field.rows_of(match.value_ids)] = True
+        return mask
+
+    def search(self, query: str, option: str = '전체') -> np.ndarray:
+        """
+        option(SEARCH_FIELDS의 키) 컬럼 중 하나라도 query를 포함하는 행의 bool 배열.
+        빈 검색어는 모두 True.
+        """
+        query = query.strip().lower()
+        mask = np.zeros(self.n_rows, dtype=bool)
+        if not query:
+            mask[:] = True
+            return mask
+        if option == FUZZY_OPTION:
+            return self.rows_of_matches(self.fuzzy(query))
+        view = 'plain'
+        if option == JAMO_OPTION:
+            # 초성만 입력했으면 초성 색인, 아니면 자모로 풀어서 자모 색인
+            view, query = ('chosung', chosung_key(query)) if is_chosung_query(query) else ('jamo', jamo_key(query))
+        for col in SEARCH_FIELDS.get(option, SEARCH_FIELDS['전체']):
+            field = self.fields.get(col)
+            if field is not None:
+                mask[field.rows_of(field.match_values(query, view))] = True
+        return mask
+
+
+def build_search_index(df: pd.DataFrame) -> SearchIndex:
+    """DatasetCache.register('search', build_search_index)로 등록해 데이터셋과 함께 만듭니다."""
+    return SearchIndex(df)
+
+
+# =================================================================
+# 6. 벤치마크 (str.contains vs 색인)
+# =================================================================
+def _contains_mask(df: pd.DataFrame, query: str, option: str) -> np.ndarray:
+    # 기존 render_home_screen의 contains_safe (문자 그대로 비교)
+    mask = np.zeros(len(df), dtype=bool)
+    for col in SEARCH_FIELDS[option]:
+        if col in df.columns:
+            mask |= df[col].astype(str).str.lower().str.contains(query, regex=False, na=False).to_numpy()
+    return mask
+
+
+def _jamo_scan_mask(df: pd.DataFrame, query: str, mode: str) -> np.ndarray:
+    # 색인 없이 매 검색마다 모든 행을 초성/자모로 분해하는 방식 (비교 기준)
+    # mode('chosung'/'jamo')는 벤치마크 목록에 직접 적어 둔 값 → is_chosung_query와 독립된 기대값
+    key = chosung_key if mode == 'chosung' else jamo_key
+    query = key(query.strip())
+    mask = np.zeros(len(df), dtype=bool)
+    for col in SEARCH_FIELDS[JAMO_OPTION]:
+        if col in df.columns:
+            mask |= np.array([query in key(str(v)) for v in df[col]], dtype=bool)
+    return mask
+
+
+def _fuzzy_scan(index: SearchIndex, query: str, k: int = FUZZY_TOP_K):
+    # 색인 없이 모든 단어와 점수를 계산하는 방식 (비교 기준). [(문자열, 점수), ...]
+    key = jamo_key(query.strip())
+    query_grams = _trigrams(key)
+    scored = []
+    for text, col, term_key, _ in index.fuzzy_index.terms:
+        grams = _trigrams(term_key)
+        similarity = len(query_grams & grams) / len(query_grams | grams)
+        score = _fuzzy_score(key, term_key, similarity)
+        if score >= FUZZY_MIN_SCORE:
+            scored.append((-score, len(text), text))
+    return [(text, -neg_score) for neg_score, _, text in sorted(scored)[:k]]
+
+
+def benchmark_search(sizes=(1_000, 10_000, 50_000), queries=('제목1', '배우2', '줄', 'drama', '감독9', '없는검색어'),
+                     jamo_queries=(('ㅈㅁ', 'chosung'), ('ㅂㅇ1', 'chosung'), ('제모', 'jamo'),
+                                   ('배ㅇ', 'jamo'), ('ㄱㄷ9', 'chosung'), ('ㅈㅁ 12', 'chosung')),
+                     fuzzy_queries=('제묵12', '배후45', '감똑7', '재목 301', '목12', '우45', '감독', 'ㅔ목3',
+                                    '배우', '12', '제목', '드라마 제목 1')):
+    from serving_dataset import build_details, build_serving_frame, compact_frame, sample_final_frame, with_details
+
+    for n in sizes:
+        # 앱과 같은 형태: 행 단위 표 + 제목별 출연진을 붙여서 색인
+        serving = build_serving_frame(sample_final_frame(n))
+        df = with_details(compact_frame(serving), build_details(serving, ['cast']))
+        started = time.perf_counter()
+        index = build_search_index(df)
+        build_seconds = time.perf_counter() - started
+
+        scan_total = index_total = 0.0
+        options = [option for option in SEARCH_FIELDS if option not in (JAMO_OPTION, FUZZY_OPTION)]
+        for query in queries:
+            for option in options:
+                started = time.perf_counter()
+                expected = _contains_mask(df, query.lower(), option)
+                scan_total += time.perf_counter() - started
+                started = time.perf_counter()
+                got = index.search(query, option)
+                index_total += time.perf_counter() - started
+                assert (expected == got).all(), (n, query, option)
+        runs = len(queries) * len(options)
+        print(f"🔎 {len(df):>7,}행: 색인 생성 {build_seconds:.2f}초 | 검색 1회 평균 "
+              f"str.contains {scan_total / runs * 1000:7.2f}ms / 색인 {index_total / runs * 1000:6.2f}ms (결과 동일)")
+
+        scan_total = index_total = 0.0
+        for query, mode in jamo_queries:
+            started = time.perf_counter()
+            expected = _jamo_scan_mask(df, query, mode)
+            scan_total += time.perf_counter() - started
+            started = time.perf_counter()
+            got = index.search(query, JAMO_OPTION)
+            index_total += time.perf_counter() - started
+            # 가짜 데이터에는 모든 검색어에 맞는 행이 있음 (빈 결과끼리 같아서 통과하는 일이 없도록)
+            assert expected.any(), (n, query, mode)
+            assert (expected == got).all(), (n, query, JAMO_OPTION)
+        runs = len(jamo_queries)
+        print(f"   {'':>7}  초성/자모 검색 1회 평균 "
+              f"전체 분해 {scan_total / runs * 1000:7.2f}ms / 색인 {index_total / runs * 1000:6.2f}ms (결과 동일)")
+
+        scan_total = index_total = 0.0
+        same_top = same_all = 0
+        for query in fuzzy_queries:
+            started = time.perf_counter()
+            expected = _fuzzy_scan(index, query)
+            scan_total += time.perf_counter() - started
+            started = time.perf_counter()
+            got = [m.text for m in index.fuzzy(query)]
+            index_total += time.perf_counter() - started
+            # 검색어가 그대로 들어 있는 단어(점수 1.0)는 후보를 줄여도 빠지면 안 됨
+            exact = [text for text, score in expected if score >= 1.0]
+            assert got[:len(exact)] == exact, (n, query, exact, got)
+            same_top += [text for text, _ in expected[:1]] == got[:1]
+            same_all += [text for text, _ in expected] == got
+        runs = len(fuzzy_queries)
+        print(f"   {'':>7}  유사 검색 1회 평균 전체 비교 {scan_total / runs * 1000:7.2f}ms / "
+              f"색인 {index_total / runs * 1000:6.2f}ms "
+              f"(1위 일치 {same_top}/{runs}, 상위 {FUZZY_TOP_K}개 일치 {same_all}/{runs}, 포함 검색 결과 동일)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="검색 색인 벤치마크")
+    parser.add_argument('--bench', nargs='*', type=int, metavar='N',
+                        help="str.contains와 결과/속도 비교 (기본값: 1000 10000 50000행)")
+    args = parser.parse_args()
+    benchmark_search(args.bench or (1_000, 10_000, 50_000))
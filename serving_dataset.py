@@ -0,0 +1,632 @@
+# serving_dataset.py (앱이 그대로 읽어 쓰는 '서빙 데이터셋' 생성/검증)
+#
+# 예전에는 Streamlit 앱의 load_data가 시작할 때마다 플랫폼/채널 정규화, 장르 정규화,
+# 날짜·시간 결합, 시간대 계산, 정렬을 모두 수행했습니다.
+# 이제 합본 단계(3번 스크립트)가 이 모듈로 한 번만 변환·검증해 serving_dataset.parquet을 만들고,
+# 앱은 변환 없이 읽기만 합니다.
+#
+# 사용 예)
+#   python serving_dataset.py                  # final_crawling.parquet → serving_dataset.parquet
+#   python serving_dataset.py --check          # 저장된 서빙 데이터셋 검증만
+#   python serving_dataset.py --bench          # 행 단위 vs 열 단위 변환 비교 (1천/1만/10만 행)
+#   python serving_dataset.py --memory         # 앱 메모리 사용량 (예전 read_csv vs compact_frame + 제목별 표, 컬럼별)
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from dataset_io import (FINAL_DATASET, FINAL_SCHEMA, SERVING_SCHEMA, dataset_exists, read_dataset,
+                        read_schema_metadata, write_dataset)
+
+# =================================================================
+# 1. 기본 설정
+# =================================================================
+SERVING_DATASET = 'serving_dataset.parquet'
+
+# 변환 규칙/컬럼이 바뀌면 올립니다. 앱은 버전이 다르면 합본에서 다시 만듭니다.
+SERVING_SCHEMA_VERSION = '1'
+VERSION_KEY = 'serving_schema_version'
+
+KST = pytz.timezone('Asia/Seoul')
+
+# 명시적인 OTT 플랫폼 리스트
+OTT_NAMES = {'NETFLIX', 'COUPANG PLAY', 'BOXOFFICE', 'TVING', 'WATCHA', 'WAVVE', 'DISNEY+'}
+
+TIME_SLOTS = ['오전 (5시~11시)', '오후 (12시~17시)', '저녁 (18시~21시)', '심야/새벽 (22시~4시)']
+
+GENRE_MAP = {
+    'DRAMA': '드라마', 'MOVIE': '영화', 'ACTION': '액션',
+    'COMEDY': '코미디', 'ROMANCE': '로맨스', 'DOCUMENTARY': '다큐멘터리'
+}
+
+
+# =================================================================
+# 2. 행 단위 변환 (기존 load_data 로직, 열 단위 변환의 기준 구현)
+# =================================================================
+def normalize_platform_channel(row):
+    """OTT/TV 구분 정규화: (platform, channel) = ('OTT', 'Netflix') 또는 ('Cable/TV', 'tvN')"""
+    source = str(row.get('source', '')).strip().upper()
+    raw_platform = str(row.get('platform', '')).strip()
+    raw_channel = str(row.get('channel', '')).strip()
+
+    p_upper = raw_platform.upper()
+    c_upper = raw_channel.upper()
+
+    # 1. source가 OTT이거나, platform/channel에 명시된 OTT 이름이 있는 경우
+    is_explicitly_ott = source == 'OTT' or p_upper in OTT_NAMES or c_upper in OTT_NAMES
+
+    if is_explicitly_ott:
+        # 실제 OTT 이름 (예: Netflix)을 찾아서 채널명으로 설정
+        ott_name = ""
+        if p_upper in OTT_NAMES:
+            ott_name = raw_platform
+        elif c_upper in OTT_NAMES:
+            ott_name = raw_channel
+        elif source == 'OTT' and raw_platform:
+            ott_name = raw_platform
+        elif raw_channel and raw_channel.upper() != 'OTT':
+            ott_name = raw_channel
+        else:
+            ott_name = 'OTT'
+
+        # 결과: platform='OTT' (구분), channel=OTT_NAME (채널명)
+        return 'OTT', ott_name
+
+    # 2. TV/Cable인 경우 (source='TV'이거나 platform이 'Cable')
+    if source == 'TV' or p_upper == 'CABLE':
+        # platform='Cable/TV'로 통일하여 화면에 표시
+        return 'Cable/TV', raw_channel
+
+    # 3. 기타 (기존 값 유지)
+    return raw_platform, raw_channel
+
+
+def normalize_text(text_str):
+    """장르 정규화 (영문 장르는 한글로, 나머지는 Title Case)"""
+    if not isinstance(text_str, str) or not text_str.strip():
+        return str(text_str)
+    upper_text = text_str.upper()
+    return GENRE_MAP.get(upper_text, text_str.title())
+
+
+def clean_date_and_combine(row, now: datetime):
+    """
+    방송 날짜/시간을 'yymmdd HHMM' 문자열로 합칩니다.
+    OTT는 수집 시각(captured_at)을, 그 값이 없으면 now(생성 시각)를 사용합니다.
+    """
+    p_str = str(row.get('platform', '')).strip().upper()
+
+    # 정규화된 platform 컬럼이 'OTT'인 경우 수집 시각(없으면 현재 시간)을 부여해 dropna 방지
+    if p_str == 'OTT':
+        captured = pd.to_datetime(row.get('captured_at'), errors='coerce')
+        if pd.isna(captured):
+            captured = now
+        elif captured.tzinfo is None:
+            captured = KST.localize(captured.to_pydatetime())
+        return captured.astimezone(KST).strftime('%y%m%d %H%M')
+
+    # TV 프로그램 처리 (기존 로직 유지)
+    date_part = str(row.get('broadcast_date', '')).split(' ')[0]
+    time_part = str(row.get('broadcast_time', '')).replace(':', '').strip().zfill(4)
+    current_year = str(now.year)[2:]
+    ymd_part = ""
+
+    if date_part:
+        try:
+            dt_obj = pd.to_datetime(date_part, errors='raise').strftime('%y%m%d')
+            ymd_part = dt_obj
+        except:
+            pass
+
+    if not ymd_part and '.' in date_part:
+        try:
+            month, day = date_part.split('.')
+            ymd_part = f"{current_year}{month.zfill(2)}{day.zfill(2)}"
+        except:
+            pass
+
+    if not ymd_part:
+        ymd_part = now.strftime('%y%m%d')
+
+    if not time_part or time_part == '0000':
+        return f"{ymd_part} 0000"
+
+    return f"{ymd_part} {time_part}"
+
+
+def get_time_slot(hour):
+    if 5 <= hour < 12: return '오전 (5시~11시)'
+    if 12 <= hour < 18: return '오후 (12시~17시)'
+    if 18 <= hour < 22: return '저녁 (18시~21시)'
+    return '심야/새벽 (22시~4시)'
+
+
+# =================================================================
+# 3. 열 단위 변환 (행 단위 변환과 결과가 같아야 함, --bench로 확인)
+# =================================================================
+def _text_column(df: pd.DataFrame, name: str) -> pd.Series:
+    # row.get(name, '') + str(...) 와 같은 값: 컬럼이 없으면 '', NaN은 'nan'
+    if name not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    return df[name].astype(object).astype(str)
+
+
+def normalize_platform_channel_columns(df: pd.DataFrame):
+    """normalize_platform_channel의 열 단위 버전: (platform, channel) Series 쌍"""
+    source = _text_column(df, 'source').str.strip().str.upper()
+    raw_platform = _text_column(df, 'platform').str.strip()
+    raw_channel = _text_column(df, 'channel').str.strip()
+    p_upper = raw_platform.str.upper()
+    c_upper = raw_channel.str.upper()
+
+    p_named = p_upper.isin(OTT_NAMES)
+    c_named = c_upper.isin(OTT_NAMES)
+    is_ott = (source == 'OTT') | p_named | c_named
+    is_tv = (source == 'TV') | (p_upper == 'CABLE')
+
+    ott_name = np.select(
+        [p_named, c_named, (source == 'OTT') & (raw_platform != ''), (raw_channel != '') & (c_upper != 'OTT')],
+        [raw_platform, raw_channel, raw_platform, raw_channel],
+        default='OTT',
+    )
+    platform = np.select([is_ott, is_tv], ['OTT', 'Cable/TV'], default=raw_platform)
+    channel = np.where(is_ott, ott_name, raw_channel)
+    return (pd.Series(platform, index=df.index, dtype=object),
+            pd.Series(channel, index=df.index, dtype=object))
+
+
+def normalize_text_column(values: pd.Series) -> pd.Series:
+    """normalize_text의 열 단위 버전"""
+    values = values.astype(object)
+    is_str = values.map(type).eq(str)
+    text = values.where(is_str, '')
+    has_text = is_str & text.str.strip().ne('')
+    normalized = text.str.upper().map(GENRE_MAP).fillna(text.str.title())
+    return normalized.where(has_text, values.astype(str)).astype(object)
+
+
+def _parse_dates_yymmdd(date_part: pd.Series) -> pd.Series:
+    """
+    날짜 문자열마다 pd.to_datetime(...).strftime('%y%m%d')을 적용한 결과 (해석 불가는 '').
+    날짜 종류는 많지 않으므로 고유값만 변환합니다. ISO 형식은 한 번에, 나머지는 하나씩.
+    """
+    uniques = pd.Series(date_part.unique(), dtype=object)
+    uniques = uniques[uniques != '']
+    parsed = pd.to_datetime(uniques, format='%Y-%m-%d', errors='coerce')
+    result = dict(zip(uniques[parsed.notna()], parsed[parsed.notna()].dt.strftime('%y%m%d')))
+    for value in uniques[parsed.isna()]:
+        try:
+            result[value] = pd.to_datetime(value, errors='raise').strftime('%y%m%d')
+        except:
+            pass
+    return date_part.map(result).fillna('').astype(object)
+
+
+def combine_date_columns(df: pd.DataFrame, now: datetime) -> pd.Series:
+    """clean_date_and_combine의 열 단위 버전 (platform은 정규화된 값이어야 함)"""
+    is_ott = _text_column(df, 'platform').str.strip().str.upper() == 'OTT'
+    date_part = _text_column(df, 'broadcast_date').str.split(' ', n=1).str[0]
+    time_part = _text_column(df, 'broadcast_time').str.replace(':', '', regex=False).str.strip().str.zfill(4)
+
+    ymd = _parse_dates_yymmdd(date_part)
+
+    # 'M.D' 형식 (점이 정확히 하나, 위에서 해석되지 않은 행만)
+    pending = np.flatnonzero((ymd == '').to_numpy())
+    parts = date_part.iloc[pending].str.split('.')
+    two = (parts.str.len() == 2).to_numpy()
+    parts = parts[two]
+    ymd.iloc[pending[two]] = (str(now.year)[2:] + parts.str[0].str.zfill(2) + parts.str[1].str.zfill(2)).to_numpy()
+    ymd = ymd.mask(ymd == '', now.strftime('%y%m%d'))
+
+    return (ymd + ' ' + time_part).mask(is_ott, _captured_times(df, now)).astype(object)
+
+
+def _captured_times(df: pd.DataFrame, now: datetime) -> pd.Series:
+    """OTT 행에 쓸 'yymmdd HHMM' (captured_at을 KST로, 없거나 비어 있으면 now)"""
+    fallback = now.astimezone(KST).strftime('%y%m%d %H%M')
+    if 'captured_at' not in df.columns:
+        return pd.Series(fallback, index=df.index, dtype=object)
+    captured = pd.to_datetime(df['captured_at'], errors='coerce')
+    if captured.dt.tz is None:
+        captured = captured.dt.tz_localize(KST)
+    return captured.dt.tz_convert(KST).dt.strftime('%y%m%d %H%M').fillna(fallback).astype(object)
+
+
+def time_slot_column(hours: pd.Series) -> pd.Series:
+    """get_time_slot의 열 단위 버전"""
+    slots = np.select(
+        [(hours >= 5) & (hours < 12), (hours >= 12) & (hours < 18), (hours >= 18) & (hours < 22)],
+        TIME_SLOTS[:3], default=TIME_SLOTS[3],
+    )
+    return pd.Series(slots, index=hours.index, dtype=object)
+
+
+# =================================================================
+# 4. 서빙 데이터셋 생성 / 검증
+# =================================================================
+def _finish_serving_frame(df: pd.DataFrame, slot_of) -> pd.DataFrame:
+    df['datetime'] = pd.to_datetime(df['full_time'], format='%y%m%d %H%M', errors='coerce')
+    df.dropna(subset=['datetime'], inplace=True)
+    df['datetime'] = df['datetime'].dt.tz_localize(KST)
+
+    df['time_slot'] = slot_of(df['datetime'].dt.hour)
+    df.sort_values(by='datetime', ascending=True, inplace=True)
+    return df
+
+
+def build_serving_frame(df: pd.DataFrame, now: datetime = None) -> pd.DataFrame:
+    """합본 DataFrame에 화면용 파생 컬럼(full_time, datetime, time_slot)을 붙이고 시간 순으로 정렬합니다."""
+    now = now or datetime.now(KST)
+    df = df.copy()
+
+    if 'platform' in df.columns and 'channel' in df.columns:
+        df['platform'], df['channel'] = normalize_platform_channel_columns(df)
+
+    if 'genre' in df.columns:
+        df['genre'] = normalize_text_column(df['genre'])
+    else:
+        df['genre'] = ''
+
+    df['full_time'] = combine_date_columns(df, now)
+    return _finish_serving_frame(df, time_slot_column)
+
+
+def build_serving_frame_rowwise(df: pd.DataFrame, now: datetime = None) -> pd.DataFrame:
+    """build_serving_frame과 같은 결과를 행 단위 함수로 만듭니다 (비교/벤치마크용)."""
+    now = now or datetime.now(KST)
+    df = df.copy()
+
+    if 'platform' in df.columns and 'channel' in df.columns:
+        new_cols = df.apply(normalize_platform_channel, axis=1, result_type='expand')
+        df['platform'] = new_cols[0]
+        df['channel'] = new_cols[1]
+
+    if 'genre' in df.columns:
+        df['genre'] = df['genre'].apply(normalize_text)
+    else:
+        df['genre'] = ''
+
+    df['full_time'] = df.apply(clean_date_and_combine, axis=1, now=now)
+    return _finish_serving_frame(df, lambda hours: hours.apply(get_time_slot))
+
+
+def validate_serving_frame(df: pd.DataFrame) -> None:
+    """앱이 변환 없이 쓸 수 있는지 확인합니다. 문제가 있으면 ValueError."""
+    missing = [name for name in SERVING_SCHEMA.names if name not in df.columns]
+    if missing:
+        raise ValueError(f"서빙 데이터셋 컬럼 누락: {missing}")
+    if df.empty:
+        return
+    if df['datetime'].isna().any():
+        raise ValueError("datetime이 비어 있는 행이 있습니다.")
+    if str(df['datetime'].dt.tz) != str(KST):
+        raise ValueError(f"datetime 타임존이 {KST}가 아닙니다: {df['datetime'].dt.tz}")
+    if not df['datetime'].is_monotonic_increasing:
+        raise ValueError("datetime 순으로 정렬되어 있지 않습니다.")
+    unknown_slots = set(df['time_slot'].astype(str)) - set(TIME_SLOTS)
+    if unknown_slots:
+        raise ValueError(f"알 수 없는 시간대: {sorted(unknown_slots)}")
+
+
+def write_serving_dataset(df_final: pd.DataFrame, path: str = SERVING_DATASET, now: datetime = None,
+                          csv_path: str = None) -> pd.DataFrame:
+    """합본에서 서빙 데이터셋을 만들어 검증한 뒤 저장합니다. 검증에 실패하면 저장하지 않습니다."""
+    serving = build_serving_frame(df_final, now)
+    validate_serving_frame(serving)
+    return write_dataset(serving, path, SERVING_SCHEMA, csv_path=csv_path,
+                         metadata={VERSION_KEY: SERVING_SCHEMA_VERSION})
+
+
+def read_serving_dataset(path: str = SERVING_DATASET) -> pd.DataFrame:
+    """
+    저장된 서빙 데이터셋을 변환 없이 읽습니다.
+    파일이 없거나 스키마 버전이 다르면 ValueError (호출 쪽에서 합본으로 다시 만들도록).
+    """
+    version = read_schema_metadata(path).get(VERSION_KEY)
+    if version != SERVING_SCHEMA_VERSION:
+        raise ValueError(f"서빙 데이터셋 버전 불일치: {version} (필요: {SERVING_SCHEMA_VERSION})")
+    return read_dataset(path)
+
+
+def load_serving_or_rebuild(path: str = SERVING_DATASET, final_path: str = FINAL_DATASET) -> pd.DataFrame:
+    """서빙 데이터셋을 읽고, 없거나 버전이 맞지 않으면 합본 데이터셋에서 그 자리에서 만듭니다."""
+    try:
+        return read_serving_dataset(path)
+    except (OSError, ValueError) as e:
+        if not dataset_exists(final_path):
+            raise
+        print(f"⚠️ 서빙 데이터셋을 쓸 수 없어 합본에서 변환합니다: {e}")
+        return build_serving_frame(read_dataset(final_path, FINAL_SCHEMA))
+
+
+# =================================================================
+# 5. 앱용 메모리 절약 (Streamlit 프로세스마다 한 벌씩 들고 있으므로)
+# =================================================================
+# 값 종류가 적은 컬럼 → category (행마다 1~2바이트 코드)
+CATEGORY_COLUMNS = ['source', 'platform', 'channel', 'genre', 'time_slot', 'age_rating', 'runtime', 'rank_change']
+# 같은 작품이 방영될 때마다 반복되는 텍스트 → 반복이 많으면 category, 아니면 같은 문자열 객체 공유
+REPEATED_TEXT_COLUMNS = ['director', 'poster_url']
+# datetime에서 언제든 만들 수 있는 컬럼 (format_full_time / format_broadcast_date / format_broadcast_time)
+DERIVED_COLUMNS = ['full_time', 'broadcast_date', 'broadcast_time', 'broadcast_at']
+# 작품마다 하나인 긴 텍스트 → 행마다 들고 있지 않고 제목별 표(build_details)로
+DETAIL_COLUMNS = ['plot', 'cast']
+
+
+def format_full_time(dt) -> str:
+    """datetime → 예전 full_time 문자열('yymmdd HHMM'). 알림/예약 키에 그대로 쓰입니다."""
+    if dt is None or pd.isna(dt):
+        return ''
+    return dt.strftime('%y%m%d %H%M')
+
+
+def format_broadcast_date(dt) -> str:
+    """datetime → 예전 broadcast_date 문자열('YYYY-MM-DD', TV 행용)"""
+    if dt is None or pd.isna(dt):
+        return ''
+    return dt.strftime('%Y-%m-%d')
+
+
+def format_broadcast_time(dt) -> str:
+    """datetime → 예전 broadcast_time 문자열('HH:MM', TV 행용)"""
+    if dt is None or pd.isna(dt):
+        return ''
+    return dt.strftime('%H:%M')
+
+
+def _sorted_category(values: pd.Series) -> pd.Series:
+    # 카테고리를 값 순서로 정렬해 두어야 sort_values 결과가 문자열 정렬과 같음
+    values = values.astype(object).where(values.notna(), '').astype(str)
+    return values.astype(pd.CategoricalDtype(sorted(values.unique())))
+
+
+def _intern(values: pd.Series) -> pd.Series:
+    # 같은 문자열은 같은 객체 하나를 가리키게 함
+    pool = {}
+    return values.map(lambda v: pool.setdefault(v, sys.intern(v) if isinstance(v, str) else v))
+
+
+def compact_frame(df: pd.DataFrame, category_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    앱이 메모리에 들고 있을 행 단위 형태로 바꿉니다. 남는 컬럼의 값은 그대로이고 dtype만 바뀝니다.
+    - DERIVED_COLUMNS: 제거 (datetime에서 format_* 함수로 계산)
+    - DETAIL_COLUMNS: 제거 (제목별 표 build_details / load_details, 줄거리는 read_detail로 필요할 때만)
+    - CATEGORY_COLUMNS: category / 제목: 문자열 공유(intern)
+    - REPEATED_TEXT_COLUMNS: 고유값 비율이 category_ratio 이하이면 category, 아니면 문자열 공유
+    """
+    out = df.drop(columns=[c for c in DERIVED_COLUMNS + DETAIL_COLUMNS if c in df.columns])
+    for col in CATEGORY_COLUMNS:
+        if col in out.columns:
+            out[col] = _sorted_category(out[col])
+    for col in REPEATED_TEXT_COLUMNS:
+        if col in out.columns:
+            if len(out) and out[col].nunique() <= len(out) * category_ratio:
+                out[col] = _sorted_category(out[col])
+            else:
+                out[col] = _intern(out[col].astype(object))
+    if 'title' in out.columns:
+        out['title'] = _intern(out['title'].astype(object))
+    return out
+
+
+def build_details(df: pd.DataFrame, columns=DETAIL_COLUMNS) -> pd.DataFrame:
+    """
+    제목 → 상세 정보 표 (index: title). 같은 작품이 여러 번 방영돼도 한 행이며,
+    제목마다 비어 있지 않은 첫 값을 씁니다. 제목 문자열은 compact_frame과 같은 객체를 공유합니다.
+    """
+    columns = [c for c in columns if c in df.columns]
+    values = df[columns].astype(object).where(df[columns].notna(), '').astype(str)
+    details = values.mask(values == '').groupby(df['title'].astype(str).to_numpy(), sort=False).first()
+    details.index = pd.Index(_intern(details.index.to_series()), name='title')
+    return details.fillna('')
+
+
+def load_details(columns=DETAIL_COLUMNS, path: str = SERVING_DATASET, final_path: str = FINAL_DATASET) -> pd.DataFrame:
+    """데이터셋 파일에서 제목과 필요한 컬럼만 읽어 build_details 표를 만듭니다 (서빙 데이터셋이 없으면 합본)."""
+    source = path if dataset_exists(path) else final_path
+    if not dataset_exists(source):
+        return pd.DataFrame(columns=list(columns), index=pd.Index([], name='title'))
+    return build_details(read_dataset(source, columns=['title', *columns]), columns)
+
+
+def read_detail(title: str, column: str, path: str = SERVING_DATASET, final_path: str = FINAL_DATASET) -> str:
+    """제목 하나의 상세 정보(예: 줄거리)를 필요할 때 파일에서 읽습니다. 없으면 ''."""
+    return load_details([column], path, final_path)[column].get(title, '')
+
+
+def with_details(df: pd.DataFrame, details: pd.DataFrame) -> pd.DataFrame:
+    """details의 컬럼을 제목으로 찾아 행마다 붙인 DataFrame (검색 색인을 만들 때처럼 잠깐 쓸 용도)"""
+    titles = df['title'].astype(str)
+    return df.assign(**{col: titles.map(details[col]).fillna('').to_numpy(dtype=object) for col in details.columns})
+
+
+def _object_bytes(values) -> int:
+    # 포인터(8바이트) + 서로 다른 문자열 객체 크기 (같은 객체를 여러 행이 가리키면 한 번만)
+    seen = {}
+    for v in values:
+        seen.setdefault(id(v), v)
+    return 8 * len(values) + sum(sys.getsizeof(v) for v in seen.values())
+
+
+def column_bytes(col: pd.Series) -> int:
+    """컬럼이 실제로 차지하는 바이트 (공유된 문자열 객체는 한 번만 계산)"""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        categories = col.cat.categories
+        cat_bytes = (_object_bytes(categories.to_numpy(dtype=object)) if categories.dtype == object
+                     else categories.memory_usage(deep=True))
+        return col.cat.codes.to_numpy().nbytes + cat_bytes
+    if col.dtype == object:
+        return _object_bytes(col.to_numpy())
+    return int(col.memory_usage(index=False, deep=True))
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """컬럼별 dtype / 바이트 (큰 순서)"""
+    rows = [{'column': c, 'dtype': str(df[c].dtype), 'bytes': column_bytes(df[c])} for c in df.columns]
+    rows.append({'column': '(index)', 'dtype': str(df.index.dtype), 'bytes': int(df.index.memory_usage(deep=True))})
+    return pd.DataFrame(rows).sort_values('bytes', ascending=False, ignore_index=True)
+
+
+def legacy_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """예전 앱이 들고 있던 형태: 같은 데이터를 CSV로 저장했다가 read_csv().fillna('')로 읽은 DataFrame"""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    buffer.seek(0)
+    return pd.read_csv(buffer).fillna('')
+
+
+def print_memory_report(before: pd.DataFrame, after: pd.DataFrame, details: pd.DataFrame = None):
+    """
+    before(예전 방식) 대비 after(compact_frame) + details(제목별 표)의 컬럼별 메모리.
+    details 컬럼은 '컬럼 (제목별)'로 표시합니다. details의 제목 문자열은 after의 title과 같은 객체이므로 포인터만 셉니다.
+    """
+    after_report = memory_report(after)
+    if details is not None:
+        side = memory_report(details)
+        side.loc[side['column'] == '(index)', 'bytes'] = 8 * len(details)
+        side['column'] = side['column'].where(side['column'] != '(index)', 'title') + ' (제목별)'
+        after_report = pd.concat([after_report, side], ignore_index=True)
+    report = memory_report(before).merge(after_report, on='column', how='outer', suffixes=('_before', '_after'))
+    report = report.sort_values('bytes_before', ascending=False, ignore_index=True, na_position='last')
+    print(f"{'컬럼':<16}{'원본':>12}{'compact':>12}  dtype")
+    for r in report.itertuples():
+        before_bytes = '-' if pd.isna(r.bytes_before) else f"{r.bytes_before / 1024:,.0f}KB"
+        after_bytes = '제거' if pd.isna(r.bytes_after) else f"{r.bytes_after / 1024:,.0f}KB"
+        print(f"{r.column:<16}{before_bytes:>12}{after_bytes:>12}  "
+              f"{'-' if pd.isna(r.dtype_before) else r.dtype_before} → {'-' if pd.isna(r.dtype_after) else r.dtype_after}")
+    total_before = report['bytes_before'].sum()
+    total_after = report['bytes_after'].sum()
+    print(f"{'합계':<16}{total_before / 1024:>10,.0f}KB{total_after / 1024:>10,.0f}KB  "
+          f"(x{total_before / max(total_after, 1):.1f} 절약)")
+
+
+# =================================================================
+# 6. 앱용 정렬 순서 (데이터셋을 읽을 때 한 번만 정렬)
+# =================================================================
+# 홈 화면 '📊 정렬 기준' 선택지 → 정렬 컬럼
+SORT_KEYS = {
+    '시간 순': ['datetime'],
+    '제목 순': ['title'],
+    '채널 순': ['platform', 'channel'],
+}
+
+
+def build_sort_orders(df: pd.DataFrame) -> dict:
+    """
+    정렬 기준마다 안정 정렬한 행 위치 배열 {'시간 순': array([...]), ...}.
+    필터 결과(bool 배열) mask에 대해 order[mask[order]]가 곧 정렬된 결과입니다.
+    """
+    positions = df.reset_index(drop=True)
+    orders = {}
+    for option, cols in SORT_KEYS.items():
+        cols = [c for c in cols if c in df.columns]
+        if cols:
+            orders[option] = positions.sort_values(by=cols, kind='stable').index.to_numpy()
+        else:
+            orders[option] = np.arange(len(df))
+    return orders
+
+
+# =================================================================
+# 7. 벤치마크 (행 단위 vs 열 단위)
+# =================================================================
+def sample_final_frame(n: int, seed: int = 0) -> pd.DataFrame:
+    """합본과 비슷한 구성의 가짜 데이터 (TV 여러 날짜/채널 + OTT, 여러 날짜·시간 표기 섞음)"""
+    rng = np.random.default_rng(seed)
+    n_ott = n // 10
+    n_tv = n - n_ott
+    dates = ['2025-05-01', '2025-05-02', '5.3', '2025.05.04', '', '05-05 (월)', 'nan']
+    times = ['21:00', '9:05', '0600', '', '23:40', '1230']
+    channels = ['tvN', 'OCN', 'JTBC', 'KBS2', 'Netflix', 'OTT']
+    genres = ['drama', 'MOVIE', '예능', 'romance comedy', '', ' ', None]
+    tv = pd.DataFrame({
+        'source': 'TV',
+        'platform': 'Cable',
+        'channel': rng.choice(channels, n_tv),
+        'broadcast_date': rng.choice(dates, n_tv),
+        'broadcast_time': rng.choice(times, n_tv),
+        'genre': rng.choice(np.array(genres, dtype=object), n_tv),
+    })
+    ott = pd.DataFrame({
+        'source': 'OTT',
+        'platform': rng.choice(['NETFLIX', 'Tving', 'wavve', 'Disney+', ''], n_ott),
+        'channel': '',
+        'broadcast_date': '',
+        'broadcast_time': '',
+        'genre': rng.choice(np.array(genres, dtype=object), n_ott),
+        # 예전 OTT 데이터셋에는 수집 시각이 없음 → 일부는 비워 둠
+        'captured_at': rng.choice(np.array([pd.Timestamp('2025-11-17 09:30', tz=KST),
+                                            pd.Timestamp('2025-11-18 23:05', tz=KST), None], dtype=object), n_ott),
+    })
+    df = pd.concat([tv, ott], ignore_index=True).sample(frac=1, random_state=seed).reset_index(drop=True)
+    title_ids = rng.integers(0, max(1, n // 8), len(df))
+    df['title'] = [f"제목{i}" for i in title_ids]
+    # 상세 정보는 작품마다 같은 값이 방영 횟수만큼 반복됨
+    df['plot'] = [f"작품 {i}의 줄거리입니다. " * 12 for i in title_ids]
+    df['cast'] = [f"배우{i}, 배우{i + 1}, 배우{i + 2}" for i in title_ids]
+    df['director'] = [f"감독{i % 300}" for i in title_ids]
+    df['poster_url'] = [f"https://img.example.com/poster/{i}.jpg" for i in title_ids]
+    return df
+
+
+def benchmark_transforms(sizes=(1_000, 10_000, 100_000)):
+    """행 단위/열 단위 변환의 결과가 같은지 확인하고 걸린 시간을 비교합니다."""
+    now = datetime.now(KST)
+    results = []
+    for n in sizes:
+        df = sample_final_frame(n)
+        started = time.perf_counter()
+        rowwise = build_serving_frame_rowwise(df, now)
+        rowwise_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        vectorized = build_serving_frame(df, now)
+        vectorized_seconds = time.perf_counter() - started
+
+        pd.testing.assert_frame_equal(rowwise, vectorized)
+        speedup = rowwise_seconds / vectorized_seconds if vectorized_seconds else float('inf')
+        print(f"📊 {n:>7,}행: 행 단위 {rowwise_seconds:7.3f}초 / 열 단위 {vectorized_seconds:7.3f}초 "
+              f"(x{speedup:.1f}, 결과 동일)")
+        results.append({'rows': n, 'rowwise': rowwise_seconds, 'vectorized': vectorized_seconds})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="서빙 데이터셋 생성/검증")
+    parser.add_argument('--final', default=FINAL_DATASET, help=f"합본 데이터셋 (기본값: {FINAL_DATASET})")
+    parser.add_argument('--out', default=SERVING_DATASET, help=f"저장 경로 (기본값: {SERVING_DATASET})")
+    parser.add_argument('--check', action='store_true', help="저장된 서빙 데이터셋 검증만 수행")
+    parser.add_argument('--bench', nargs='*', type=int, metavar='N',
+                        help="행 단위/열 단위 변환 비교 (기본값: 1000 10000 100000행)")
+    parser.add_argument('--memory', nargs='?', const=-1, type=int, metavar='N',
+                        help="앱 메모리 사용량 비교 (--out 파일, 또는 N행 가짜 데이터)")
+    args = parser.parse_args()
+
+    if args.bench is not None:
+        benchmark_transforms(args.bench or (1_000, 10_000, 100_000))
+    elif args.memory is not None:
+        if args.memory > 0:
+            # 앱과 같은 조건: Parquet으로 저장했다가 읽은 DataFrame
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, SERVING_DATASET)
+                write_dataset(build_serving_frame(sample_final_frame(args.memory)), path, SERVING_SCHEMA)
+                df = read_dataset(path)
+        else:
+            df = load_serving_or_rebuild(args.out, args.final)
+        # 기준: 예전 앱처럼 CSV를 read_csv().fillna('')로 읽은 형태 / 비교: 앱이 들고 있는 행 단위 표 + 제목별 출연진
+        # (줄거리는 상세보기를 열 때 read_detail로 읽으므로 메모리에 없음)
+        print(f"🧮 {len(df):,}행")
+        print_memory_report(legacy_frame(df), compact_frame(df), build_details(df, ['cast']))
+    elif args.check:
+        df = read_serving_dataset(args.out)
+        validate_serving_frame(df)
+        print(f"✅ '{args.out}' 검증 통과 ({len(df)}건, 버전 {SERVING_SCHEMA_VERSION})")
+    else:
+        df = write_serving_dataset(read_dataset(args.final, FINAL_SCHEMA), args.out)
+        print(f"🎉 '{args.out}' 생성 완료 ({len(df)}건, 버전 {SERVING_SCHEMA_VERSION})")
@@ -0,0 +1,19 @@
+# tests/conftest.py (저장소 루트의 모듈을 바로 import 할 수 있도록 경로 추가)
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(ROOT_DIR, 'tests', 'fixtures')
+
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+def load_script(filename: str, name: str):
+    """'1) TV_최종.py'처럼 import 할 수 없는 이름의 스크립트를 모듈로 불러옵니다."""
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
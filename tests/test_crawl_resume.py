@@ -0,0 +1,160 @@
+# tests/test_crawl_resume.py (시간 초과된 제목은 저널에 남지 않고 --resume 때 다시 수집되는지)
+#
+# 브라우저 대신 FakePool/FakeDriver를 쓰고, 스케줄러의 항목 제한 시간을 짧게 줄여
+# 첫 실행에서 '느린 드라마'만 시간 초과시킨 뒤 같은 저널로 이어서 실행합니다.
+
+import functools
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+import pytest
+
+from conftest import load_script
+from crawl_journal import CrawlJournal
+from enrichment_scheduler import run_enrichment
+from kinolights_cache import KinolightsCache
+
+SLOW_TITLE = '느린 드라마'
+FAST_TITLE = '빠른 드라마'
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = threading.Event()
+
+    def quit(self):
+        self.quit_called.set()
+
+
+class FakePool:
+    """lease()마다 새 FakeDriver를 빌려주는 BrowserPool 대역"""
+
+    @contextmanager
+    def lease(self):
+        yield FakeDriver()
+
+    def shutdown(self):
+        pass
+
+
+class FakeFetcher:
+    """slow=True인 동안 SLOW_TITLE은 세션이 강제 종료될 때까지 멈춰 있음"""
+
+    def __init__(self, make_info):
+        self.make_info = make_info
+        self.slow = True
+        self.calls = []
+
+    def __call__(self, driver, title, *args, **kwargs):
+        self.calls.append(title)
+        if self.slow and title == SLOW_TITLE:
+            driver.quit_called.wait(5)
+            raise RuntimeError("세션 종료됨")
+        return self.make_info(title)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with KinolightsCache(str(tmp_path / 'cache.sqlite3')) as c:
+        yield c
+
+
+def _short_timeout(module, monkeypatch):
+    monkeypatch.setattr(module, 'run_enrichment', functools.partial(run_enrichment, item_timeout=0.2))
+
+
+def test_tv_resume_refetches_timed_out_title(tmp_path, monkeypatch, cache):
+    tv = load_script('1) TV_최종.py', 'tv_crawler')
+    fetcher = FakeFetcher(lambda title: dict(tv.KINOLIGHTS_DEFAULT_INFO, plot=f"{title} 줄거리"))
+    monkeypatch.setattr(tv, 'scrape_kinolights_info', fetcher)
+    _short_timeout(tv, monkeypatch)
+
+    schedule = pd.DataFrame({
+        'channel': ['KBS 드라마', 'KBS 드라마'],
+        'broadcast_date': ['2025-11-17', '2025-11-17'],
+        'broadcast_time': ['05:00', '06:00'],
+        'title': [SLOW_TITLE, FAST_TITLE],
+    })
+    journal_path = str(tmp_path / 'tv.journal.jsonl')
+
+    first = tv.enrich_data(schedule.copy(), cache=cache, pool=FakePool(), workers=2,
+                           journal=CrawlJournal(journal_path, tv.JOURNAL_KEYS))
+    assert first.set_index('title').loc[SLOW_TITLE, 'plot'] == ''
+
+    journal = CrawlJournal(journal_path, tv.JOURNAL_KEYS)
+    journal.load()
+    assert {row['title'] for row in journal.rows()} == {FAST_TITLE}
+
+    fetcher.slow = False
+    fetcher.calls.clear()
+    second = tv.enrich_data(schedule.copy(), cache=cache, pool=FakePool(), workers=2, journal=journal)
+
+    assert fetcher.calls == [SLOW_TITLE]
+    assert second.set_index('title')['plot'].to_dict() == {
+        SLOW_TITLE: f"{SLOW_TITLE} 줄거리",
+        FAST_TITLE: f"{FAST_TITLE} 줄거리",
+    }
+
+
+def test_ott_resume_refetches_timed_out_title(tmp_path, monkeypatch, cache):
+    ott = load_script('2) OTT_최종.py', 'ott_crawler')
+    fetcher = FakeFetcher(lambda title: dict(ott.KINOLIGHTS_DEFAULT_INFO, synopsis=f"{title} 줄거리"))
+    monkeypatch.setattr(ott, 'fetch_kinolights_info', fetcher)
+    _short_timeout(ott, monkeypatch)
+
+    def item(rank, title):
+        return {"rank": rank, "rank_change": "", "title": title, "poster_image": "",
+                "detail_url": f"https://m.kinolights.com/title/{rank}"}
+
+    rankings = {"Netflix": [item("1", SLOW_TITLE), item("2", FAST_TITLE)]}
+    monkeypatch.setattr(ott, 'collect_rankings', lambda urls, pool: rankings)
+    journal_path = str(tmp_path / 'ott.journal.jsonl')
+
+    first = ott.crawl_all_ott({"Netflix": ""}, cache=cache, pool=FakePool(), workers=2,
+                              journal=CrawlJournal(journal_path, ott.JOURNAL_KEYS))
+    assert {row['title']: row['synopsis'] for row in first}[SLOW_TITLE] == ''
+
+    journal = CrawlJournal(journal_path, ott.JOURNAL_KEYS)
+    journal.load()
+    assert {row['title'] for row in journal.rows()} == {FAST_TITLE}
+
+    fetcher.slow = False
+    fetcher.calls.clear()
+    second = ott.crawl_all_ott({"Netflix": ""}, cache=cache, pool=FakePool(), workers=2, journal=journal)
+
+    assert fetcher.calls == [SLOW_TITLE]
+    assert {row['title']: row['synopsis'] for row in second} == {
+        SLOW_TITLE: f"{SLOW_TITLE} 줄거리",
+        FAST_TITLE: f"{FAST_TITLE} 줄거리",
+    }
+
+
+def test_ott_journal_keeps_every_title_without_rank(tmp_path, monkeypatch):
+    # 순위가 빈 항목이 여러 개여도 저널에서 서로 덮어쓰지 않고 모두 재사용
+    ott = load_script('2) OTT_최종.py', 'ott_crawler')
+    fetcher = FakeFetcher(lambda title: dict(ott.KINOLIGHTS_DEFAULT_INFO, synopsis=f"{title} 줄거리"))
+    fetcher.slow = False
+    monkeypatch.setattr(ott, 'fetch_kinolights_info', fetcher)
+
+    def item(title):
+        return {"rank": "", "rank_change": "", "title": title, "poster_image": "", "detail_url": ""}
+
+    rankings = {"Netflix": [item(SLOW_TITLE), item(FAST_TITLE)]}
+    monkeypatch.setattr(ott, 'collect_rankings', lambda urls, pool: rankings)
+    journal_path = str(tmp_path / 'ott.journal.jsonl')
+
+    ott.crawl_all_ott({"Netflix": ""}, cache=None, pool=FakePool(), workers=1,
+                      journal=CrawlJournal(journal_path, ott.JOURNAL_KEYS))
+    journal = CrawlJournal(journal_path, ott.JOURNAL_KEYS)
+    assert journal.load() == 2
+
+    fetcher.calls.clear()
+    # 캐시 없이 실행하므로 저널에서 못 찾은 제목은 다시 수집됨
+    rows = ott.crawl_all_ott({"Netflix": ""}, cache=None, pool=FakePool(), workers=1, journal=journal)
+
+    assert fetcher.calls == []
+    assert {row['title']: row['synopsis'] for row in rows} == {
+        SLOW_TITLE: f"{SLOW_TITLE} 줄거리",
+        FAST_TITLE: f"{FAST_TITLE} 줄거리",
+    }
@@ -0,0 +1,138 @@
+# tests/test_dataset_cache.py (DatasetCache: 중복 로드 없음, 같은 내용 재저장은 건너뜀, 묶음 교체)
+
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from dataset_cache import DatasetCache
+
+
+class CountingLoader:
+    """호출 횟수를 세고, gate가 열릴 때까지 기다릴 수 있는 loader"""
+
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        self.started.set()
+        self.gate.wait(5)
+        return pd.read_csv(self.path)
+
+
+def _write(path, text, bump_ns=0):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    if bump_ns:
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+
+
+def _wait_reload(cache):
+    # 백그라운드 다시 읽기가 끝날 때까지 (reload()는 _reload_lock을 기다림)
+    with cache._reload_lock:
+        pass
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = str(tmp_path / 'serving.csv')
+    _write(path, 'title\n눈물의 여왕\n')
+    return path
+
+
+def test_first_get_loads_once_across_threads(dataset):
+    loader = CountingLoader(dataset)
+    loader.gate.clear()
+    cache = DatasetCache(dataset, loader, poll_seconds=0)
+
+    frames = []
+    threads = [threading.Thread(target=lambda: frames.append(cache.get())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    assert loader.started.wait(5)
+    loader.gate.set()
+    for t in threads:
+        t.join(5)
+
+    assert loader.calls == 1
+    assert len(frames) == 8 and all(frame is frames[0] for frame in frames)
+
+
+def test_identical_rewrite_is_skipped(dataset):
+    loader = CountingLoader(dataset)
+    cache = DatasetCache(dataset, loader, poll_seconds=0)
+    first = cache.get()
+
+    _write(dataset, 'title\n눈물의 여왕\n', bump_ns=10 ** 9)
+
+    assert cache.check(force=True) is False
+    assert cache.get() is first
+    assert (loader.calls, cache.stats()['skipped'], cache.version) == (1, 1, 1)
+    # 식별값은 새 mtime으로 갱신되어 다음 확인에서도 다시 해시하거나 읽지 않음
+    assert cache.check(force=True) is False and cache.stats()['skipped'] == 1
+
+
+def test_changed_file_reloads_once_while_in_flight(dataset):
+    loader = CountingLoader(dataset)
+    cache = DatasetCache(dataset, loader, poll_seconds=0)
+    cache.get()
+
+    loader.gate.clear()
+    loader.started.clear()
+    _write(dataset, 'title\n선재 업고 튀어\n', bump_ns=10 ** 9)
+
+    assert cache.check(force=True) is True
+    assert loader.started.wait(5)
+    # 다시 읽는 중에는 몇 번을 확인해도 새 다시 읽기를 시작하지 않고 이전 데이터를 돌려줌
+    assert [cache.check(force=True) for _ in range(5)] == [False] * 5
+    assert cache.get()['title'].tolist() == ['눈물의 여왕']
+    loader.gate.set()
+    _wait_reload(cache)
+
+    assert loader.calls == 2 and cache.version == 2
+    assert cache.get()['title'].tolist() == ['선재 업고 튀어']
+    assert cache.check(force=True) is False and loader.calls == 2
+
+
+def test_failed_reload_keeps_previous_data(dataset):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        frame = pd.read_csv(dataset)
+        if 'broken' in frame.columns:
+            raise ValueError("스키마 불일치")
+        return frame
+
+    cache = DatasetCache(dataset, loader, poll_seconds=0)
+    cache.get()
+    _write(dataset, 'broken\n1\n', bump_ns=10 ** 9)
+    cache.check(force=True)
+    _wait_reload(cache)
+
+    assert cache.get()['title'].tolist() == ['눈물의 여왕']
+    assert cache.stats()['errors'] == 1
+    # 같은 (실패한) 파일로는 다시 시도하지 않음
+    assert cache.check(force=True) is False and len(calls) == 2
+
+
+def test_register_after_load_swaps_a_new_snapshot(dataset):
+    cache = DatasetCache(dataset, CountingLoader(dataset), poll_seconds=0)
+    cache.get()
+    frame, artifacts = cache.snapshot()
+
+    cache.register('rows', len)
+
+    assert 'rows' not in artifacts  # 이미 받아 간 묶음은 그대로
+    new_frame, new_artifacts = cache.snapshot()
+    assert new_frame is frame and new_artifacts['rows'] == 1
+    assert cache.artifact('rows') == 1
@@ -0,0 +1,31 @@
+# tests/test_rank_history.py (랭킹 이력: 같은 날 중복 행, 계산된 순위 변동)
+
+import pytest
+
+from rank_history import RankHistory
+
+
+@pytest.fixture
+def history(tmp_path):
+    with RankHistory(str(tmp_path / 'history.sqlite3')) as h:
+        yield h
+
+
+def test_duplicate_rows_keep_the_best_rank(history):
+    history.record([{'platform': 'Netflix', 'rank': '3', 'title': '눈물의 여왕'}], '2025-05-01')
+    history.record([
+        {'platform': 'Netflix', 'rank': '2', 'title': '눈물의 여왕', 'rank_change': '▲1'},
+        {'platform': 'Netflix', 'rank': '7', 'title': '눈물의 여왕 ', 'rank_change': '▼4'},
+    ], '2025-05-02')
+
+    [day] = history.trend('눈물의 여왕', days=1, until='2025-05-02')
+    assert (day['rank'], day['rank_delta']) == (2, 1)
+    assert history.peak_rank('눈물의 여왕')['rank'] == 2
+
+
+def test_worse_rerun_does_not_overwrite(history):
+    history.record([{'platform': 'TVING', 'rank': '1', 'title': '선재 업고 튀어'}], '2025-05-01')
+    history.record([{'platform': 'TVING', 'rank': '5', 'title': '선재 업고 튀어'}], '2025-05-01')
+
+    assert history.deltas('2025-05-01') == {('TVING', '선재 업고 튀어'): None}
+    assert history.trend('선재 업고 튀어', days=1, until='2025-05-01')[0]['rank'] == 1
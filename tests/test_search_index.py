@@ -0,0 +1,82 @@
+# tests/test_search_index.py (홈 화면 검색 색인: 일반 / 초성·자모 검색)
+
+import pandas as pd
+import pytest
+
+from search_index import build_search_index, is_chosung_query
+
+FRAME = pd.DataFrame({
+    'title': ['눈물의 여왕', '선재 업고 튀어', '무빙2', 'Drama Special'],
+    'cast': ['김수현, 김지원', '변우석, 김혜윤', '배우1, 배우2', '배우10'],
+    'director': ['장영우', '윤종호', '박인제', '감독9'],
+    'genre': ['drama', 'romance', 'action', 'drama'],
+})
+
+
+@pytest.fixture(scope='module')
+def index():
+    return build_search_index(FRAME)
+
+
+def _titles(mask):
+    return FRAME.loc[mask, 'title'].tolist()
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('ㄴㅁㅇㅇㅇ', True),
+    ('ㅂㅇ1', True),      # 숫자는 초성 판단에서 제외
+    ('ㄱㄷ9', True),
+    ('ㅁㅂ 2', True),
+    ('눈ㅁ', False),      # 완성된 음절이 섞이면 자모 검색
+    ('ㅏ', False),
+    ('drama', False),     # 초성이 하나도 없음
+    ('', False),
+])
+def test_is_chosung_query(query, expected):
+    assert is_chosung_query(query) is expected
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('ㄴㅁㅇㅇㅇ', ['눈물의 여왕']),
+    ('ㅂㅇ1', ['무빙2', 'Drama Special']),   # 배우1, 배우10
+    ('ㄱㄷ9', ['Drama Special']),
+    ('ㅁㅂ2', ['무빙2']),
+    ('눈무', ['눈물의 여왕']),               # 입력 중인 음절 (자모)
+    ('선재 업', ['선재 업고 튀어']),
+])
+def test_jamo_option(index, query, expected):
+    assert _titles(index.search(query, '초성/자모')) == expected
+
+
+def test_plain_search_is_literal_substring(index):
+    assert _titles(index.search('DRAMA', '장르')) == ['눈물의 여왕', 'Drama Special']
+    assert _titles(index.search('김지원', '배우')) == ['눈물의 여왕']
+    assert _titles(index.search('(', '전체')) == []
+    assert index.search('', '전체').all()
+
+
+def test_fuzzy_option_fields_are_in_the_literal():
+    from search_index import FUZZY_OPTION, SEARCH_FIELDS
+    assert list(SEARCH_FIELDS)[-2:] == ['초성/자모', FUZZY_OPTION]
+    assert SEARCH_FIELDS[FUZZY_OPTION] == ['title', 'cast', 'director']
+
+
+def test_fuzzy_finds_typos_and_names(index):
+    assert [m.text for m in index.fuzzy('눈믈의 여왕', k=1)] == ['눈물의 여왕']
+    assert [m.text for m in index.fuzzy('변우삭', k=1)] == ['변우석']
+    assert _titles(index.search('변우삭', '유사 검색'))[:1] == ['선재 업고 튀어']
+
+
+def test_fuzzy_keeps_substring_hit_in_long_title():
+    # trigram 유사도로는 비슷한 짧은 제목들이 앞서지만, 검색어가 그대로 들어 있는 긴 제목은 1.0점
+    long_title = '눈물의 여왕 스페셜 감독판 무삭제 확장판 합본'
+    near_misses = [f'여완{i}' for i in range(20)]
+    frame = pd.DataFrame({
+        'title': near_misses + [long_title],
+        'cast': [''] * 21, 'director': [''] * 21, 'genre': [''] * 21,
+    })
+    fuzzy = build_search_index(frame).fuzzy_index
+
+    matches = fuzzy.search('여왕', ['title'], k=3, candidates=5)
+
+    assert matches[0].text == long_title and matches[0].score == 1.0
@@ -0,0 +1,57 @@
+# tests/test_serving_dataset.py (서빙 데이터셋: OTT 행의 시각은 수집 시각 기준, 앱용 행 단위 표 + 제목별 표)
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from dataset_io import FINAL_SCHEMA, conform
+from serving_dataset import (KST, SERVING_DATASET, build_details, build_serving_frame, build_serving_frame_rowwise,
+                             compact_frame, format_broadcast_date, format_broadcast_time, read_detail,
+                             sample_final_frame, with_details, write_serving_dataset)
+
+NOW = KST.localize(datetime(2025, 11, 20, 15, 0))
+
+
+@pytest.mark.parametrize('build', [build_serving_frame, build_serving_frame_rowwise])
+def test_ott_rows_use_captured_at_and_fall_back_to_now(build):
+    df = pd.DataFrame({
+        'source': ['OTT', 'OTT'],
+        'platform': ['NETFLIX', 'TVING'],
+        'channel': ['', ''],
+        'broadcast_date': ['', ''],
+        'broadcast_time': ['', ''],
+        'title': ['수집 시각 있음', '수집 시각 없음'],
+        'captured_at': [pd.Timestamp('2025-11-17 23:30', tz='UTC'), pd.NaT],
+    })
+
+    serving = build(df, NOW).set_index('title')
+
+    # UTC 23:30 → KST 다음 날 08:30 (오전), 비어 있으면 생성 시각 15:00 (오후)
+    assert serving.loc['수집 시각 있음', 'full_time'] == '251118 0830'
+    assert serving.loc['수집 시각 있음', 'time_slot'] == '오전 (5시~11시)'
+    assert serving.loc['수집 시각 없음', 'full_time'] == '251120 1500'
+    assert serving.loc['수집 시각 없음', 'time_slot'] == '오후 (12시~17시)'
+
+
+def test_compact_frame_keeps_details_per_title(tmp_path):
+    path = str(tmp_path / SERVING_DATASET)
+    serving = write_serving_dataset(conform(sample_final_frame(400), FINAL_SCHEMA), path, NOW)
+    serving.loc[serving.index[0], 'cast'] = ''  # 같은 제목의 다른 행에는 값이 있음
+
+    compact = compact_frame(serving)
+    details = build_details(serving)
+
+    assert not {'plot', 'cast', 'full_time', 'broadcast_date', 'broadcast_time', 'broadcast_at'} & set(compact)
+    assert details.index.is_unique and set(details.index) == set(serving['title'])
+    rebuilt = with_details(compact, details)
+    expected = build_serving_frame(conform(sample_final_frame(400), FINAL_SCHEMA), NOW)
+    assert (rebuilt['cast'].to_numpy() == expected['cast'].to_numpy()).all()
+
+    tv = serving[serving['platform'] != 'OTT']
+    assert tv['datetime'].map(format_broadcast_date).tolist() == tv['datetime'].dt.strftime('%Y-%m-%d').tolist()
+    assert tv['datetime'].map(format_broadcast_time).tolist() == tv['datetime'].dt.strftime('%H:%M').tolist()
+
+    title = serving['title'].iloc[0]
+    assert read_detail(title, 'plot', path) == expected.loc[expected['title'] == title, 'plot'].iloc[0]
+    assert read_detail('없는 제목', 'plot', path) == ''
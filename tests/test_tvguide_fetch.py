@@ -0,0 +1,104 @@
+# tests/test_tvguide_fetch.py (RecordedPageServer로 HTTP 백엔드와 Selenium 대체 경로 확인)
+
+import os
+import shutil
+
+import pytest
+
+from conftest import FIXTURE_DIR
+from tvguide_fetch import AutoPageFetcher, HttpPageFetcher, RecordedPageServer
+from tvguide_parser import parse_schedule
+
+SCHEDULE_HTML = os.path.join(FIXTURE_DIR, 'tvguide_schedule.html')
+
+
+class FakeSeleniumFetcher:
+    """브라우저 없이 Selenium 대체 경로가 불렸는지만 기록"""
+
+    def __init__(self, html='<table id="main_channel"></table><table id="result_tbl"></table>'):
+        self.html = html
+        self.urls = []
+
+    def fetch(self, url):
+        self.urls.append(url)
+        return self.html
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    pages = tmp_path / 'pages'
+    pages.mkdir()
+    shutil.copy(SCHEDULE_HTML, pages / '253.html')
+    (pages / '999.html').write_text('<html><body>점검 중입니다</body></html>', encoding='utf-8')
+    with RecordedPageServer(str(pages)) as srv:
+        yield srv
+
+
+@pytest.fixture
+def http(tmp_path):
+    fetcher = HttpPageFetcher(cache_dir=str(tmp_path / 'http_cache'), limiter=None)
+    yield fetcher
+    fetcher.close()
+
+
+def test_http_fetch_then_not_modified(server, http):
+    url = f"{server.base_url}&c=253"
+
+    first = http.fetch(url)
+    second = http.fetch(url)
+
+    assert parse_schedule(first)[0] == '11.17'
+    assert second == first
+    assert (server.requests, http.requests, http.not_modified) == (2, 2, 1)
+
+
+def test_http_fetch_refetches_changed_page(server, http):
+    url = f"{server.base_url}&c=253"
+    http.fetch(url)
+
+    path = os.path.join(server.directory, '253.html')
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html.replace('KBS 뉴스광장 1부', '특집 생방송'))
+
+    assert ('05', '00', '특집 생방송') in parse_schedule(http.fetch(url))[2]
+    assert http.not_modified == 0
+
+
+def test_not_modified_without_cached_body_is_a_miss(server, http, monkeypatch):
+    url = f"{server.base_url}&c=253"
+    http.fetch(url)
+    meta, _ = http._load_cached(url)
+    # 메타만 남고 본문이 없는 상태 → 서버는 304를 보내지만 돌려줄 본문이 없음
+    monkeypatch.setattr(http, '_load_cached', lambda _url: (meta, None))
+
+    html = http.fetch(url)
+
+    assert parse_schedule(html)[0] == '11.17'
+    assert http.not_modified == 0
+    assert server.requests == 3  # 첫 요청 + 304 + 조건 없는 재요청
+
+
+def test_auto_fetcher_uses_http_when_schedule_present(server, http):
+    selenium = FakeSeleniumFetcher()
+    auto = AutoPageFetcher(http, lambda: selenium)
+
+    html = auto.fetch(f"{server.base_url}&c=253")
+
+    assert parse_schedule(html)[2]
+    assert auto.fallbacks == 0 and selenium.urls == []
+
+
+@pytest.mark.parametrize('code', ['999', '404'])
+def test_auto_fetcher_falls_back_to_selenium(server, http, code):
+    # 999: 편성표 없는 페이지, 404: 녹화 파일 없음 (HTTP 오류)
+    selenium = FakeSeleniumFetcher()
+    auto = AutoPageFetcher(http, lambda: selenium)
+    url = f"{server.base_url}&c={code}"
+
+    assert auto.fetch(url) == selenium.html
+    assert auto.fallbacks == 1 and selenium.urls == [url]
@@ -0,0 +1,55 @@
+# tests/test_tvguide_parser.py (저장된 편성표 HTML로 tvguide_parser 결과 확인)
+#
+# 기대값은 예전 XPath 방식(셀마다 find_element)으로 같은 페이지를 읽었을 때의 결과입니다.
+# - 오늘 열: main_channel 첫 행에서 today.jpg가 있는 열, 날짜는 첫 줄에서 '오늘'을 뺀 텍스트
+# - 시간대 행: 첫 칸이 숫자로 시작하는 행만, 시는 두 자리로
+# - 셀 안 table의 tr마다 (분, 제목), '광고'/'프로그램 정보가 없습니다.'는 제외
+
+import os
+from datetime import date
+
+from conftest import FIXTURE_DIR
+from tvguide_parser import parse_all_days, parse_schedule, resolve_column_date
+
+SCHEDULE_HTML = os.path.join(FIXTURE_DIR, 'tvguide_schedule.html')
+
+
+def _read_fixture():
+    with open(SCHEDULE_HTML, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_parse_schedule_today_column():
+    date_text, col_index, programs = parse_schedule(_read_fixture())
+
+    assert date_text == '11.17'
+    assert col_index == 2
+    assert programs == [
+        ('05', '00', 'KBS 뉴스광장 1부'),
+        ('06', '10', '인간극장 (재)'),
+        ('06', '50', '6시 내고향'),
+        ('21', '40', '눈물의 & 여왕'),
+    ]
+
+
+def test_parse_all_days_reads_every_column():
+    days = parse_all_days(_read_fixture())
+
+    assert [(i, date_text, is_today) for i, date_text, is_today, _ in days] == [
+        (1, '11.16', False),
+        (2, '11.17', True),
+        (3, '11.18', False),
+    ]
+    assert days[0][3] == [('05', '00', 'KBS 뉴스광장'), ('06', '10', '아침마당'), ('21', '00', 'KBS 뉴스9')]
+    assert days[2][3] == [('05', '00', 'KBS 뉴스광장'), ('21', '00', 'KBS 뉴스9')]
+
+
+def test_parse_schedule_without_today_marker():
+    html = _read_fixture().replace('today.jpg', 'day.jpg')
+    assert parse_schedule(html) == ('', -1, [])
+
+
+def test_resolve_column_date_picks_nearest_year():
+    assert resolve_column_date('11.17', reference=date(2025, 11, 20)) == '2025-11-17'
+    assert resolve_column_date('01/02(금)', reference=date(2025, 12, 30)) == '2026-01-02'
+    assert resolve_column_date('날짜 없음') == ''
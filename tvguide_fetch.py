@@ -0,0 +1,336 @@
+# tvguide_fetch.py (tvguide 편성표 페이지 가져오기: HTTP 우선, 필요할 때만 Selenium)
+#
+# 편성표 페이지는 서버에서 완성된 HTML로 내려오므로 Chrome 없이 HTTP로 받을 수 있습니다.
+# - HttpPageFetcher     : keep-alive 연결 풀 + 압축 + 조건부 요청(ETag/Last-Modified)
+# - SeleniumPageFetcher : BrowserPool 세션으로 로드 (기존 방식)
+# - AutoPageFetcher     : HTTP로 받은 페이지에 편성표가 없을 때만 Selenium으로 재시도
+# 모든 요청은 rate_limiter의 호스트별 제한을 거칩니다 (채널 사이 고정 대기 대신).
+#
+# 테스트용 로컬 서버 (녹화해 둔 페이지 제공, tests/test_tvguide_fetch.py에서도 사용)
+#   python tvguide_fetch.py record --out recorded_pages "http://.../index.php?main=cable&sub=cable0&c=253"
+#   python tvguide_fetch.py serve recorded_pages --port 8765
+#   python "1) TV_최종.py" --backend http --base-url "http://127.0.0.1:8765/tvguide/index.php?main=cable&sub=cable0"
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limiter import DEFAULT_LIMITER
+
+# =================================================================
+# 1. 기본 설정
+# =================================================================
+HTTP_CACHE_DIR = '.tvguide_http_cache'
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0 Safari/537.36")
+
+
+def page_has_schedule(html: str) -> bool:
+    """편성표 테이블(main_channel, result_tbl)이 HTML에 들어있는지 확인합니다."""
+    return bool(html) and 'main_channel' in html and 'result_tbl' in html
+
+
+def _decode(body: bytes, declared: str = None) -> str:
+    """헤더/메타 태그의 charset으로 디코딩합니다 (없으면 utf-8 → cp949 순서로 시도)."""
+    candidates = []
+    if declared:
+        candidates.append(declared)
+    meta = re.search(rb'charset=["\']?([A-Za-z0-9_\-]+)', body[:2048])
+    if meta:
+        candidates.append(meta.group(1).decode('ascii'))
+    candidates += ['utf-8', 'cp949']
+    for encoding in candidates:
+        # euc-kr로 표기돼도 실제로는 cp949 확장 문자가 섞여 있는 경우가 많음
+        if encoding.lower().replace('_', '-') in ('euc-kr', 'ks-c-5601-1987'):
+            encoding = 'cp949'
+        try:
+            return body.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return body.decode('utf-8', errors='replace')
+
+
+# =================================================================
+# 2. HTTP 백엔드
+# =================================================================
+class HttpPageFetcher:
+    """연결을 재사용하는 HTTP 클라이언트. 이전 실행의 응답을 디스크에 두고 조건부 요청을 보냅니다."""
+
+    def __init__(self, pool_size: int = 8, timeout: float = 15, cache_dir: str = HTTP_CACHE_DIR,
+                 limiter=DEFAULT_LIMITER):
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.limiter = limiter
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _cache_paths(self, url: str):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + '.json'), os.path.join(self.cache_dir, key + '.body')
+
+    def _load_cached(self, url: str):
+        if not self.cache_dir:
+            return None, None
+        meta_path, body_path = self._cache_paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                return meta, f.read()
+        except (OSError, json.JSONDecodeError):
+            return None, None
+
+    def _store_cached(self, url: str, response, body: bytes, encoding: str):
+        if not self.cache_dir:
+            return
+        meta = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'encoding': encoding,
+        }
+        if not (meta['etag'] or meta['last_modified']):
+            return
+        meta_path, body_path = self._cache_paths(url)
+        with open(body_path, 'wb') as f:
+            f.write(body)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    def _get(self, url: str, headers: dict):
+        if self.limiter is not None:
+            self.limiter.acquire(url)
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        with self._lock:
+            self.requests += 1
+        return response
+
+    def fetch(self, url: str) -> str:
+        meta, cached_body = self._load_cached(url)
+        headers = {}
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = self._get(url, headers)
+        if response.status_code == 304:
+            if cached_body is not None:
+                with self._lock:
+                    self.not_modified += 1
+                return _decode(cached_body, meta.get('encoding'))
+            # 저장된 본문 없이 304가 오면 캐시 미스로 보고 조건 없이 다시 요청
+            response = self._get(url, {})
+
+        response.raise_for_status()
+        body = response.content  # gzip/deflate는 requests가 자동으로 해제
+        declared = response.encoding if 'charset' in response.headers.get('Content-Type', '') else None
+        self._store_cached(url, response, body, declared)
+        return _decode(body, declared)
+
+    def close(self):
+        self.session.close()
+
+
+# =================================================================
+# 3. Selenium 백엔드 / 자동 선택
+# =================================================================
+class SeleniumPageFetcher:
+    """BrowserPool 세션으로 페이지를 로드합니다 (JS 렌더링이 필요한 경우용)."""
+
+    def __init__(self, pool, timeout: float = 15, limiter=DEFAULT_LIMITER):
+        self.pool = pool
+        self.timeout = timeout
+        self.limiter = limiter
+
+    def fetch(self, url: str) -> str:
+        # Chrome이 없는 환경에서도 HTTP 백엔드만 쓸 수 있도록 필요할 때 import
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self.pool.lease() as driver:
+            if self.limiter is not None:
+                self.limiter.acquire(url)
+            driver.get(url)
+            wait = WebDriverWait(driver, self.timeout)
+            wait.until(EC.presence_of_element_located((By.XPATH, "//table[@id='main_channel']/tbody/tr[1]")))
+            wait.until(EC.presence_of_element_located((By.ID, "result_tbl")))
+            return driver.page_source
+
+    def close(self):
+        pass
+
+
+class AutoPageFetcher:
+    """HTTP로 먼저 받고, 편성표가 없거나 요청이 실패한 경우에만 Selenium으로 다시 로드합니다."""
+
+    def __init__(self, http: HttpPageFetcher, selenium_factory):
+        self.http = http
+        self._selenium_factory = selenium_factory
+        self._selenium = None
+        self._lock = threading.Lock()
+        self.fallbacks = 0
+
+    def _get_selenium(self):
+        with self._lock:
+            if self._selenium is None:
+                self._selenium = self._selenium_factory()
+            self.fallbacks += 1
+            return self._selenium
+
+    def fetch(self, url: str) -> str:
+        try:
+            html = self.http.fetch(url)
+            if page_has_schedule(html):
+                return html
+        except requests.RequestException as e:
+            print(f"  -> HTTP 요청 실패, 브라우저로 재시도: {e}")
+        return self._get_selenium().fetch(url)
+
+    def close(self):
+        self.http.close()
+        if self._selenium is not None:
+            self._selenium.close()
+
+
+# =================================================================
+# 4. 테스트용 로컬 서버 (녹화된 페이지 제공)
+# =================================================================
+def _page_name(url_or_path: str) -> str:
+    """채널 코드(c=...)를 파일명으로 사용합니다."""
+    query = parse_qs(urlparse(url_or_path).query)
+    code = query.get('c', ['index'])[0]
+    return re.sub(r'[^0-9A-Za-z_\-]', '_', code) + '.html'
+
+
+class RecordedPageServer:
+    """
+    녹화해 둔 편성표 페이지를 제공하는 로컬 HTTP 서버.
+    ?c=253 요청에는 <directory>/253.html 을 돌려주며, keep-alive/gzip/ETag(304)를 지원합니다.
+    """
+
+    def __init__(self, directory: str, host: str = '127.0.0.1', port: int = 0):
+        self.directory = directory
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests += 1
+                path = os.path.join(server.directory, _page_name(self.path))
+                if not os.path.exists(path):
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                with open(path, 'rb') as f:
+                    body = f.read()
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('ETag', etag)
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    body = gzip.compress(body)
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/tvguide/index.php?main=cable&sub=cable0"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def record_pages(urls, out_dir: str, fetcher=None):
+    """실제 페이지를 받아 RecordedPageServer가 읽을 수 있는 형식(UTF-8)으로 저장합니다."""
+    os.makedirs(out_dir, exist_ok=True)
+    fetcher = fetcher or HttpPageFetcher(cache_dir=None)
+    for url in urls:
+        html = fetcher.fetch(url)
+        path = os.path.join(out_dir, _page_name(url))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        print(f"💾 {url} → {path} ({len(html)}자)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="tvguide 페이지 녹화/로컬 제공")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help="페이지를 받아 저장")
+    rec.add_argument('--out', required=True, help="저장 폴더")
+    rec.add_argument('urls', nargs='+', help="편성표 URL (c=채널코드 포함)")
+
+    serve = sub.add_parser('serve', help="저장한 페이지를 로컬 HTTP로 제공")
+    serve.add_argument('directory', help="녹화 폴더")
+    serve.add_argument('--port', type=int, default=8765)
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        record_pages(args.urls, args.out)
+    else:
+        srv = RecordedPageServer(args.directory, port=args.port)
+        print(f"🌐 녹화 페이지 제공 중: {srv.base_url}&c=<채널코드>  (Ctrl+C로 종료)")
+        try:
+            srv._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            srv._httpd.server_close()
@@ -0,0 +1,254 @@
+# tvguide_parser.py (tvguide 편성표 HTML 파서: page_source 한 번으로 전체 추출)
+#
+# WebDriver로 셀마다 XPath를 조회하던 방식 대신, 페이지 HTML을 한 번만 파싱해
+# 날짜 헤더(main_channel)와 시간대별 프로그램(result_tbl)을 추출합니다.
+# 표준 라이브러리(html.parser)만 사용합니다.
+#
+# 사용 예) 저장해 둔 페이지로 결과 확인
+#   python tvguide_parser.py saved_page.html
+
+import re
+import sys
+import time
+from datetime import date
+from html.parser import HTMLParser
+
+# 편성표 셀 중 프로그램이 아닌 항목
+SKIP_TITLES = ("프로그램 정보가 없습니다.", "광고", "")
+
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+              'link', 'meta', 'param', 'source', 'track', 'wbr'}
+# 텍스트 추출 시 줄바꿈으로 취급하는 태그
+_BLOCK_TAGS = {'br', 'div', 'p', 'tr', 'table', 'tbody', 'thead', 'li', 'ul', 'h1', 'h2', 'h3', 'h4', 'h5'}
+
+
+# =================================================================
+# 1. 최소 DOM 트리
+# =================================================================
+class Node:
+    __slots__ = ('tag', 'attrs', 'children', 'parent')
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.children = []
+        self.parent = parent
+
+    def child_elements(self, tag=None):
+        return [c for c in self.children if isinstance(c, Node) and (tag is None or c.tag == tag)]
+
+    def iter(self, tag=None):
+        """하위 요소를 문서 순서대로 순회합니다 (자기 자신 제외)."""
+        stack = list(reversed(self.child_elements()))
+        while stack:
+            node = stack.pop()
+            if tag is None or node.tag == tag:
+                yield node
+            stack.extend(reversed(node.child_elements()))
+
+    def find_by_id(self, element_id):
+        for node in self.iter():
+            if node.attrs.get('id') == element_id:
+                return node
+        return None
+
+    def text(self) -> str:
+        """Selenium의 .text처럼 공백을 정리하고, 블록 경계는 줄바꿈으로 만든 텍스트"""
+        parts = []
+
+        def walk(node):
+            for c in node.children:
+                if isinstance(c, str):
+                    parts.append(c)
+                else:
+                    if c.tag in _BLOCK_TAGS:
+                        parts.append('\n')
+                    walk(c)
+                    if c.tag in _BLOCK_TAGS:
+                        parts.append('\n')
+
+        walk(self)
+        lines = [re.sub(r'\s+', ' ', line).strip() for line in ''.join(parts).split('\n')]
+        return '\n'.join(line for line in lines if line)
+
+
+class _TreeBuilder(HTMLParser):
+    """닫는 태그가 빠진 td/tr 등도 받아주는 관대한 트리 빌더"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('#document')
+        self.stack = [self.root]
+
+    def _close_until(self, tags, boundary=('table',)):
+        for i in range(len(self.stack) - 1, 0, -1):
+            tag = self.stack[i].tag
+            if tag in tags:
+                del self.stack[i:]
+                return
+            if tag in boundary:
+                return
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('td', 'th'):
+            self._close_until(('td', 'th'), boundary=('tr', 'table'))
+        elif tag == 'tr':
+            self._close_until(('tr',))
+        elif tag in ('tbody', 'thead', 'tfoot'):
+            self._close_until(('tbody', 'thead', 'tfoot'))
+
+        node = Node(tag, attrs, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in _VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, attrs, self.stack[-1])
+        self.stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS:
+            return
+        boundary = ('table',) if tag in ('td', 'th', 'tr', 'tbody', 'thead', 'tfoot') else ()
+        self._close_until((tag,), boundary=boundary)
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+def parse_html(html: str) -> Node:
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def table_rows(table: Node):
+    """table/tbody/tr 경로의 행 목록 (tbody가 없는 원본 HTML도 지원)"""
+    tbody = table.child_elements('tbody')
+    if tbody:
+        return tbody[0].child_elements('tr')
+    return table.child_elements('tr')
+
+
+# =================================================================
+# 2. 편성표 추출
+# =================================================================
+def header_columns(doc: Node):
+    """
+    main_channel 첫 행의 날짜 열 목록을 반환합니다.
+    [(열 번호, 날짜 텍스트, 오늘 여부), ...]  (0번 열은 제목 열이라 제외)
+    """
+    table = doc.find_by_id('main_channel')
+    if table is None:
+        return []
+    rows = table_rows(table)
+    if not rows:
+        return []
+
+    columns = []
+    for i, col in enumerate(rows[0].child_elements('td')):
+        if i == 0:
+            continue
+        is_today = any('today.jpg' in img.attrs.get('src', '') for img in col.iter('img'))
+        lines = col.text().split('\n')
+        date_text = lines[0].replace('오늘', '').strip() if lines else ''
+        columns.append((i, date_text, is_today))
+    return columns
+
+
+def find_today_column(doc: Node):
+    """오늘 열 번호와 날짜 텍스트를 반환합니다. 찾지 못하면 (-1, '')."""
+    for i, date_text, is_today in header_columns(doc):
+        if is_today:
+            return i, date_text
+    return -1, ''
+
+
+def parse_column_programs(doc: Node, col_index: int):
+    """result_tbl에서 col_index 열의 (시, 분, 제목) 목록을 추출합니다."""
+    table = doc.find_by_id('result_tbl')
+    if table is None or col_index < 0:
+        return []
+
+    programs = []
+    for row in table_rows(table)[:24]:
+        tds = row.child_elements('td')
+        if not tds:
+            continue
+        hour_match = re.search(r'^\d+', tds[0].text().strip())
+        if not hour_match or col_index >= len(tds):
+            continue
+        hour = hour_match.group(0).zfill(2)
+
+        # 셀 안의 tr은 모두 내부 table 소속 (= .//table//tr)
+        for pr in tds[col_index].iter('tr'):
+            cells = list(pr.iter('td'))
+            if len(cells) < 2:
+                continue
+            minute = cells[0].text().strip().zfill(2)
+            title = cells[1].text().strip()
+            if minute and title and title not in SKIP_TITLES:
+                programs.append((hour, minute, title))
+    return programs
+
+
+def parse_schedule(html: str):
+    """
+    편성표 페이지 HTML에서 오늘 열을 찾아 프로그램을 추출합니다.
+    반환값: (오늘 날짜 텍스트, 오늘 열 번호, [(시, 분, 제목), ...])
+    """
+    doc = parse_html(html)
+    col_index, date_text = find_today_column(doc)
+    return date_text, col_index, parse_column_programs(doc, col_index)
+
+
+def parse_all_days(html: str):
+    """
+    페이지에 있는 모든 날짜 열의 프로그램을 한 번에 추출합니다.
+    반환값: [(열 번호, 날짜 텍스트, 오늘 여부, [(시, 분, 제목), ...]), ...]
+    """
+    doc = parse_html(html)
+    return [(i, date_text, is_today, parse_column_programs(doc, i))
+            for i, date_text, is_today in header_columns(doc)]
+
+
+def resolve_column_date(date_text: str, reference: date = None) -> str:
+    """
+    '11.17', '11/17(월)' 같은 헤더 날짜를 'YYYY-MM-DD'로 바꿉니다.
+    연도는 reference(기본값: 오늘)와 가장 가까운 날짜가 되도록 정합니다 (연말/연초 대비).
+    해석할 수 없으면 빈 문자열을 반환합니다.
+    """
+    m = re.search(r'(\d{1,2})\s*[./월-]\s*(\d{1,2})', date_text or '')
+    if not m:
+        return ''
+    reference = reference or date.today()
+    month, day = int(m.group(1)), int(m.group(2))
+    candidates = []
+    for year in (reference.year - 1, reference.year, reference.year + 1):
+        try:
+            candidates.append(date(year, month, day))
+        except ValueError:
+            continue
+    if not candidates:
+        return ''
+    return min(candidates, key=lambda d: abs((d - reference).days)).isoformat()
+
+
+# =================================================================
+# 3. 저장된 HTML로 확인 (CLI)
+# =================================================================
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python tvguide_parser.py <저장된 편성표 HTML> [...]")
+        sys.exit(1)
+
+    for path in sys.argv[1:]:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            html = f.read()
+        started = time.perf_counter()
+        date_text, col_index, programs = parse_schedule(html)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"📄 {path}: 날짜 '{date_text}' (열 {col_index}), 프로그램 {len(programs)}개, {elapsed:.1f}ms")
+        for hour, minute, title in programs:
+            print(f"  {hour}:{minute}  {title}")
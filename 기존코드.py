@@ -1,5 +1,6 @@
 # final_streamlit.py
 import streamlit as st
+import numpy as np
 import pandas as pd
 import json
 import os
@@ -23,140 +24,99 @@ except ImportError:
         print(f"[Dummy Notifier] 알림 전송 요청: {df_row.get('title')}")
         return False
 
+# 📈 OTT 랭킹 이력 (크롤러가 실행마다 누적하는 SQLite)
+from rank_history import HISTORY_FILE as RANK_HISTORY_FILE, RankHistory
+# 📦 서빙 데이터셋 (합본 단계에서 화면용 컬럼까지 만들어 둔 Parquet)
+from dataset_io import FINAL_DATASET, dataset_exists
+from serving_dataset import (SERVING_DATASET, build_sort_orders, compact_frame, format_broadcast_date,
+                             format_broadcast_time, format_full_time, load_details, load_serving_or_rebuild,
+                             read_detail, with_details)
+# 🔄 파일이 바뀌면 백그라운드에서 다시 읽는 데이터셋 캐시
+from dataset_cache import DatasetCache
+# 🔎 홈 화면 검색 색인 (데이터셋을 읽을 때 함께 생성)
+from search_index import build_search_index
+
 # 파일 경로 설정
-DATA_FILE = 'final_crawling.csv'
+DATA_FILE = SERVING_DATASET
 RESERVATION_FILE = 'reservations.json'
 FAVORITE_FILE = 'favorites.json'
 CONFIG_FILE = 'config.json'
 
 
 # =================================================================
-# 1. 데이터 로드 (수정 없음)
+# 1. 데이터 로드 (합본 단계에서 만든 서빙 데이터셋을 그대로 읽음)
 # =================================================================
-@st.cache_data
-def load_data():
-    if not os.path.exists(DATA_FILE):
+def read_serving_data():
+    # 플랫폼/장르 정규화, 날짜 결합, 시간대, 정렬은 serving_dataset.py가 합본 시점에 끝내 둠
+    # (서빙 데이터셋이 없거나 버전이 다르면 합본 데이터셋에서 바로 변환)
+    if not dataset_exists(DATA_FILE) and not dataset_exists(FINAL_DATASET):
         return pd.DataFrame()
+    # 프로세스마다 한 벌씩 들고 있으므로 category/문자열 공유 형태로
+    # (full_time/방송 날짜·시간은 datetime에서 계산, 출연진은 제목별 표, 줄거리는 상세보기를 열 때 읽음)
+    return compact_frame(load_serving_or_rebuild(DATA_FILE, FINAL_DATASET))
 
-    try:
-        df = pd.read_csv(DATA_FILE, encoding='utf-8-sig')
-    except Exception as e:
-        st.error(f"데이터 파일 읽기 오류: {e}")
-        return pd.DataFrame()
 
-    df = df.fillna('')
+def read_cast_table(df):
+    # 제목 → 출연진 (행마다 반복하지 않고 제목당 한 번)
+    return load_details(['cast'], DATA_FILE, FINAL_DATASET)
 
-    # [핵심] 명시적인 OTT 플랫폼 리스트 정의
-    OTT_NAMES = {'NETFLIX', 'COUPANG PLAY', 'BOXOFFICE', 'TVING', 'WATCHA', 'WAVVE', 'DISNEY+'}
 
-    # [수정] OTT/TV 구분 정규화 로직
-    def normalize_platform_channel(row):
-        source = str(row.get('source', '')).strip().upper()
-        raw_platform = str(row.get('platform', '')).strip()
-        raw_channel = str(row.get('channel', '')).strip()
+def build_app_search_index(df):
+    # 출연진은 제목별 표에 있으므로 색인을 만드는 동안만 행마다 붙임
+    return build_search_index(with_details(df, read_cast_table(df)))
 
-        p_upper = raw_platform.upper()
-        c_upper = raw_channel.upper()
-
-        # 1. source가 OTT이거나, platform/channel에 명시된 OTT 이름이 있는 경우
-        is_explicitly_ott = source == 'OTT' or p_upper in OTT_NAMES or c_upper in OTT_NAMES
-
-        if is_explicitly_ott:
-            # 실제 OTT 이름 (예: Netflix)을 찾아서 채널명으로 설정
-            ott_name = ""
-            if p_upper in OTT_NAMES:
-                ott_name = raw_platform
-            elif c_upper in OTT_NAMES:
-                ott_name = raw_channel
-            elif source == 'OTT' and raw_platform:
-                ott_name = raw_platform
-            elif raw_channel and raw_channel.upper() != 'OTT':
-                ott_name = raw_channel
-            else:
-                ott_name = 'OTT'
-
-            # 결과: platform='OTT' (구분), channel=OTT_NAME (채널명)
-            return 'OTT', ott_name
-
-        # 2. TV/Cable인 경우 (source='TV'이거나 platform이 'Cable')
-        if source == 'TV' or p_upper == 'CABLE':
-            # platform='Cable/TV'로 통일하여 화면에 표시
-            return 'Cable/TV', raw_channel
-
-            # 3. 기타 (기존 값 유지)
-        return raw_platform, raw_channel
-
-    if 'platform' in df.columns and 'channel' in df.columns:
-        new_cols = df.apply(normalize_platform_channel, axis=1, result_type='expand')
-        df['platform'] = new_cols[0]
-        df['channel'] = new_cols[1]
-
-    # 장르 정규화 (기존 로직 유지)
-    def normalize_text(text_str):
-        if not isinstance(text_str, str) or not text_str.strip():
-            return str(text_str)
-        text_map = {
-            'DRAMA': '드라마', 'MOVIE': '영화', 'ACTION': '액션',
-            'COMEDY': '코미디', 'ROMANCE': '로맨스', 'DOCUMENTARY': '다큐멘터리'
-        }
-        upper_text = text_str.upper()
-        return text_map.get(upper_text, text_str.title())
-
-    if 'genre' in df.columns:
-        df['genre'] = df['genre'].apply(normalize_text)
-    else:
-        df['genre'] = ''
 
-    # 날짜/시간 결합 로직 (OTT 데이터 보존 로직 유지)
-    def clean_date_and_combine(row):
-        p_str = str(row.get('platform', '')).strip().upper()
+@st.cache_resource
+def get_dataset_cache():
+    # 모든 세션이 공유: 파이프라인이 새 파일을 쓰면 몇 초 안에 백그라운드에서 다시 읽어 교체
+    cache = DatasetCache([DATA_FILE, FINAL_DATASET], read_serving_data)
+    cache.register('cast', read_cast_table)
+    cache.register('search', build_app_search_index)
+    cache.register('sort_orders', build_sort_orders)
+    cache.start_watcher()
+    return cache
 
-        # 정규화된 platform 컬럼이 'OTT'인 경우 현재 시간을 부여해 dropna 방지
-        if p_str == 'OTT':
-            return datetime.now(KST).strftime('%y%m%d %H%M')
 
-        # TV 프로그램 처리 (기존 로직 유지)
-        date_part = str(row.get('broadcast_date', '')).split(' ')[0]
-        time_part = str(row.get('broadcast_time', '')).replace(':', '').strip().zfill(4)
-        current_year = str(datetime.now().year)[2:]
-        ymd_part = ""
+def get_artifact(df, name, builder):
+    """df와 짝이 맞는 파생 데이터 (이번 실행 도중 데이터가 교체됐다면 df로 바로 생성)"""
+    frame, artifacts = get_dataset_cache().snapshot()
+    if frame is df and name in artifacts:
+        return artifacts[name]
+    return builder(df)
 
-        if date_part:
-            try:
-                dt_obj = pd.to_datetime(date_part, errors='raise').strftime('%y%m%d')
-                ymd_part = dt_obj
-            except:
-                pass
 
-        if not ymd_part and '.' in date_part:
-            try:
-                month, day = date_part.split('.')
-                ymd_part = f"{current_year}{month.zfill(2)}{day.zfill(2)}"
-            except:
-                pass
+def get_search_index(df):
+    return get_artifact(df, 'search', build_app_search_index)
 
-        if not ymd_part:
-            ymd_part = datetime.now().strftime('%y%m%d')
 
-        if not time_part or time_part == '0000':
-            return f"{ymd_part} 0000"
+def get_cast(df, title):
+    """제목의 출연진 (제목별 표에서 조회)"""
+    return get_artifact(df, 'cast', read_cast_table)['cast'].get(title, '')
 
-        return f"{ymd_part} {time_part}"
 
-    df['full_time'] = df.apply(clean_date_and_combine, axis=1)
-    df['datetime'] = pd.to_datetime(df['full_time'], format='%y%m%d %H%M', errors='coerce')
-    df.dropna(subset=['datetime'], inplace=True)
-    df['datetime'] = df['datetime'].dt.tz_localize(KST)
+def load_data():
+    cache = get_dataset_cache()
+    df = cache.get()
+    stats = cache.stats()
+    if stats['last_error']:
+        st.warning(f"데이터 파일 읽기 오류 (이전 데이터 사용 중): {stats['last_error']}")
+
+    # 이 세션이 보고 있던 데이터보다 새 버전이면 알려줌
+    seen = st.session_state.get('data_version')
+    if seen is not None and seen != cache.version:
+        st.toast(f"🔄 새 데이터를 불러왔습니다 ({len(df)}건)")
+    st.session_state['data_version'] = cache.version
+    return df
 
-    def get_time_slot(hour):
-        if 5 <= hour < 12: return '오전 (5시~11시)'
-        if 12 <= hour < 18: return '오후 (12시~17시)'
-        if 18 <= hour < 22: return '저녁 (18시~21시)'
-        return '심야/새벽 (22시~4시)'
 
-    df['time_slot'] = df['datetime'].dt.hour.apply(get_time_slot)
-    df.sort_values(by='datetime', ascending=True, inplace=True)
-    return df
+def render_data_status():
+    """사이드바: 데이터셋 캐시 상태 (다시 읽은 횟수/시간)"""
+    stats = get_dataset_cache().stats()
+    loaded_at = (datetime.fromtimestamp(stats['last_loaded_at'], KST).strftime('%m/%d %H:%M:%S')
+                 if stats['last_loaded_at'] else '-')
+    st.caption(f"데이터: {os.path.basename(stats['path']) or '-'} {stats['rows']}건 | 로드 {loaded_at}")
+    st.caption(f"다시 읽기 {stats['reloads']}회 (마지막 {stats['last_reload_seconds']:.2f}초, "
+               f"변경 없음 {stats['skipped']}회, 실패 {stats['errors']}회)")
 
 
 # =================================================================
@@ -359,7 +319,7 @@ def check_and_send_notifications_set_compat(df, reservations_set, config):
 
     for index, row in df_reserved.iterrows():
         title = row['title']
-        full_time_str = row.get('full_time', '')
+        full_time_str = format_full_time(row.get('datetime', None))
         notification_key = f"{title}_{full_time_str}_{minutes_before}"
 
         if notification_key in sent_reservations:
@@ -376,6 +336,8 @@ def check_and_send_notifications_set_compat(df, reservations_set, config):
 
             if now >= target_time and now < target_time + timedelta(seconds=30):
                 df_row_dict = row.to_dict()
+                # 알림 문구의 방송 시간 (서빙 데이터에는 datetime만 있음)
+                df_row_dict['broadcast_time'] = format_broadcast_time(broadcast_dt)
                 options = reservation_data.get('options', [])
 
                 external_options = [opt for opt in options if opt != 'web']
@@ -415,7 +377,10 @@ def render_home_screen(df, reservations, favorites):
     # 상단 검색바/필터바 (기존 유지)
     col1, col2 = st.columns([1, 2])
     with col1:
-        search_option = st.selectbox('🔍 검색 기준', ['전체', '제목', '배우', '감독', '장르' ], key='search_opt')
+        search_option = st.selectbox('🔍 검색 기준', ['전체', '제목', '배우', '감독', '장르', '초성/자모', '유사 검색'],
+                                     key='search_opt',
+                                     help="초성/자모: 'ㄴㅁㅇㅇㅇ'처럼 초성만, 또는 '눈무'처럼 입력 중인 글자로 제목/배우/감독 검색\n\n"
+                                          "유사 검색: 한두 글자 틀려도 비슷한 제목/배우/감독을 순위대로 찾음")
     with col2:
         search_query = st.text_input('검색어 입력 (엔터키를 누르세요)', '', key='search_q').strip().lower()
 
@@ -431,41 +396,29 @@ def render_home_screen(df, reservations, favorites):
 
     st.markdown("---")
 
-    # 데이터 필터링/정렬 (기존 유지)
-    df_filtered = df.copy()
+    # 데이터 필터링/정렬: 조건마다 bool 배열(행 위치 기준)을 만들고,
+    # 로드할 때 미리 정렬해 둔 순서에서 골라냄 (전체 복사/정렬 없음)
+    mask = np.ones(len(df), dtype=bool)
 
-    # 검색 필터링 로직 (기존 유지)
+    # 검색 필터링 (미리 만든 색인으로: 제목/배우/감독/장르/전체 모두 부분 문자열 일치)
     if search_query:
-        def contains_safe(col):
-            if col in df_filtered.columns:
-                return df_filtered[col].astype(str).str.lower().str.contains(search_query, na=False)
-            return pd.Series([False] * len(df_filtered), index=df_filtered.index)
-
-        if search_option == '제목':
-            df_filtered = df_filtered[contains_safe('title')]
-        elif search_option == '배우':
-            df_filtered = df_filtered[contains_safe('cast')]
-        elif search_option == '감독':
-            df_filtered = df_filtered[contains_safe('director')]
-        elif search_option == '장르':
-            df_filtered = df_filtered[contains_safe('genre')]
+        search_index = get_search_index(df)
+        if search_option == '유사 검색':
+            matches = search_index.fuzzy(search_query)
+            mask &= search_index.rows_of_matches(matches)
+            if matches:
+                st.caption("🔎 비슷한 검색 결과: " + ", ".join(f"{m.text} ({m.score:.0%})" for m in matches))
         else:
-            mask = (contains_safe('title') | contains_safe('cast') | contains_safe('director') | contains_safe('genre'))
-            df_filtered = df_filtered[mask]
+            mask &= search_index.search(search_query, search_option)
 
-    if time_slot_filter != '전체' and 'time_slot' in df_filtered.columns:
-        df_filtered = df_filtered[df_filtered['time_slot'] == time_slot_filter]
+    if time_slot_filter != '전체' and 'time_slot' in df.columns:
+        mask &= (df['time_slot'] == time_slot_filter).to_numpy()
 
     if show_reservations_only:
-        df_filtered = df_filtered[df_filtered['title'].isin(reservations)]
+        mask &= df['title'].isin(reservations).to_numpy()
 
-    if sort_option == '시간 순':
-        df_filtered.sort_values(by='datetime', ascending=True, inplace=True)
-    elif sort_option == '제목 순':
-        df_filtered.sort_values(by='title', ascending=True, inplace=True)
-    elif sort_option == '채널 순':
-        cols = [c for c in ['platform', 'channel'] if c in df_filtered.columns]
-        if cols: df_filtered.sort_values(by=cols, ascending=True, inplace=True)
+    order = get_artifact(df, 'sort_orders', build_sort_orders)[sort_option]
+    df_filtered = df.iloc[order[mask[order]]]
 
     # -------------------------------------------------------------
     # [화면 구성] 리스트 생성 (수정: 랭킹 정보를 제목에 통합)
@@ -534,7 +487,7 @@ def render_home_screen(df, reservations, favorites):
         else:
             p_type = 'Cable/TV'
             c_name = raw_channel  # 채널명: CHING, MBC 드라마넷 등
-            disp_time = row.get('broadcast_time', '')
+            disp_time = format_broadcast_time(row.get('datetime', None))
 
         is_reserved = program_title_raw in reservations
         is_favorite = program_title_raw in favorites
@@ -573,7 +526,7 @@ def render_home_screen(df, reservations, favorites):
             '시간': disp_time,
             '제목': display_title,  # ✨ 랭킹 정보가 통합된 제목
             '장르': row.get('genre', ''),
-            '출연진': row.get('cast', ''),
+            '출연진': get_cast(df, program_title_raw),
             '감독': row.get('director', ''),
             '⭐ 즐겨찾기': bool(is_favorite),
             '예약': bool(reservation_value),
@@ -581,16 +534,15 @@ def render_home_screen(df, reservations, favorites):
 
             # 숨겨진 데이터 (로직용) - 기존 유지
             'channel': raw_channel,
-            'broadcast_date': row.get('broadcast_date', ''),
-            'broadcast_time': row.get('broadcast_time', ''),
+            'broadcast_date': '' if is_ott else format_broadcast_date(row.get('datetime', None)),
+            'broadcast_time': '' if is_ott else format_broadcast_time(row.get('datetime', None)),
             'title': program_title_raw,  # 순수 제목 (로직용)
-            '_full_time_hidden': row.get('full_time', ''),
+            '_full_time_hidden': format_full_time(row.get('datetime', None)),
             'platform_type': p_type,
             'channel_name': c_name,
             'datetime': row.get('datetime', None),
             'detail_title': program_title_raw,  # 순수 제목 (엑스팬더 제목용)
             'detail_poster': row.get('poster_url', ''),
-            'detail_story': row.get('plot', ''),
             'detail_age': row.get('age_rating', ''),
             'detail_runtime': row.get('runtime', ''),
             'detail_rank': row.get('rank', ''),
@@ -599,6 +551,11 @@ def render_home_screen(df, reservations, favorites):
 
     if not display_list:
         st.warning("⚠️ 검색 결과가 없습니다.")
+        if search_query and search_option != '유사 검색':
+            suggestions = get_search_index(df).fuzzy(search_query, k=3)
+            if suggestions:
+                st.info("혹시 이것을 찾으셨나요? " + ", ".join(m.text for m in suggestions)
+                        + " ('🔍 검색 기준'을 '유사 검색'으로 바꿔 보세요)")
         return
 
     df_display = pd.DataFrame(display_list)
@@ -698,7 +655,8 @@ def render_home_screen(df, reservations, favorites):
 
             st.markdown("---")
             st.markdown("### 📘 줄거리")
-            st.write(row['detail_story'] or "줄거리 정보 없음")
+            # 줄거리는 메모리에 들고 있지 않고, 상세보기를 연 제목만 파일에서 읽음
+            st.write(read_detail(row['detail_title'], 'plot', DATA_FILE, FINAL_DATASET) or "줄거리 정보 없음")
 
     st.markdown("---")
     st.caption("💡 '예약불가사유'가 **OTT** 또는 **시간지남**인 항목은 예약(알림) 설정이 불가능합니다.")
@@ -739,7 +697,7 @@ def render_reservation_page(df_all, reservations):
             first_row = group.iloc[0]
             with col_info:
                 st.markdown(f"**장르:** {first_row.get('genre', '정보 없음')}")
-                st.markdown(f"**출연:** {first_row.get('cast', '정보 없음')}")
+                st.markdown(f"**출연:** {get_cast(df_all, title) or '정보 없음'}")
                 st.markdown(f"**감독:** {first_row.get('director', '정보 없음')}")
                 st.markdown("---")
                 st.markdown("**📺 방영 채널 및 시간**")
@@ -750,7 +708,7 @@ def render_reservation_page(df_all, reservations):
                     is_ott = str(row.get('platform', '')).upper() == 'OTT'
                     p_type = 'OTT' if is_ott else 'Cable/TV'
                     c_name = row.get('channel', '')
-                    time_display, date_display = format_reservation_datetime_display(row.get('full_time', ''))
+                    time_display, date_display = format_reservation_datetime_display(format_full_time(row.get('datetime', None)))
 
                     is_ended = False
                     if not is_ott and row.get('datetime') is not None and row.get('datetime') < now:
@@ -790,7 +748,7 @@ def render_favorite_page(df_all, favorites):
 
         if not match_row.empty:
             genre = match_row.iloc[0].get('genre', '정보 없음')
-            cast = match_row.iloc[0].get('cast', '정보 없음')
+            cast = get_cast(df_all, title) or '정보 없음'
             director = match_row.iloc[0].get('director', '정보 없음')
 
         # st.container에는 border 인자가 없을 수 있으므로 단순화
@@ -900,12 +858,12 @@ def render_detail_page(df, title):
     # 기본 정보 가져오기
     # 합본 파일의 컬럼명에 맞게 수정
     poster = row.get("poster_url", "")
-    story = row.get("plot", "줄거리 정보 없음")
+    story = read_detail(title, 'plot', DATA_FILE, FINAL_DATASET) or "줄거리 정보 없음"
     age = row.get("age_rating", "정보 없음")
     runtime = row.get("runtime", "정보 없음")
     rank = row.get("rank", "정보 없음")
     change = row.get("rank_change", "정보 없음")
-    cast = row.get("cast", "정보 없음")
+    cast = get_cast(df, title) or "정보 없음"
     director = row.get("director", "정보 없음")
 
     # 레이아웃 구성
@@ -922,7 +880,7 @@ def render_detail_page(df, title):
         st.write(f"**연령 등급:** {age}")
         st.write(f"**회차/러닝타임:** {runtime}")
         # 랭킹 정보는 OTT에만 있으므로, 있을 경우에만 표시
-        if rank:
+        if pd.notna(rank) and rank != '':
             st.write(f"**랭킹:** {rank}")
         if change:
             st.write(f"**랭킹 변화:** {change}")
@@ -934,6 +892,31 @@ def render_detail_page(df, title):
     st.subheader("📘 줄거리")
     st.write(story)
 
+    render_rank_history(title)
+
+
+def render_rank_history(title, days=7):
+    """랭킹 이력 DB에서 해당 제목의 기록만 조회해 최고 순위/TOP 10 일수/최근 추이를 보여줍니다."""
+    if not os.path.exists(RANK_HISTORY_FILE):
+        return
+    with RankHistory(RANK_HISTORY_FILE) as history:
+        peak = history.peak_rank(title)
+        if peak is None:
+            return
+        top10_days = history.days_in_top(title, 10)
+        trend = history.trend(title, days)
+
+    st.markdown("---")
+    st.subheader("📈 랭킹 추이")
+    col1, col2 = st.columns(2)
+    col1.metric("최고 순위", f"{peak['rank']}위")
+    col1.caption(f"{peak['platform']} · {peak['captured_date']}")
+    col2.metric("TOP 10 진입", f"{top10_days}일")
+    if trend:
+        chart = pd.DataFrame(trend).pivot_table(index='captured_date', columns='platform', values='rank')
+        st.caption(f"최근 {days}일 순위 (낮을수록 상위)")
+        st.line_chart(chart)
+
 
 # =================================================================
 # 7. 메인 실행부 (수정 없음)
@@ -1073,6 +1056,7 @@ def main():
         )
         st.divider()
         st.caption(f"예약: {len(reservations)}개 | 즐겨찾기: {len(favorites)}개")
+        render_data_status()
 
     if menu == "🏠 홈 화면":
         render_home_screen(df, reservations, favorites)